@@ -1,49 +1,162 @@
-from bs4 import BeautifulSoup
 import os
-import numpy as np
 import openai
-from transformers import GPT2TokenizerFast
 import json
-from fastapi import FastAPI, Body, HTTPException, Header, Depends
+from fastapi import FastAPI, Body, HTTPException, Header, Depends, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from typing import List
-from weaviate import Client as WeaviateClient
-from openai import OpenAI
+import asyncio
+from contextlib import asynccontextmanager
+from flast.clients import Backends, BackendSettings
+from flast.active_class import DEFAULT_CLASS_FILE, LEGACY_PROPERTIES, ActiveClass, ClassProperties, select_properties
+from flast.answer_cache import AnswerCache
+from flast.citations import CitationIndex, citation_key, find_citations, route
+from flast.context import build_context
+from flast.embedding_cache import DEFAULT_CACHE_PATH, EmbeddingCache, decode_embeddings
+from flast import tracing
+from flast.filters import FilterError, SearchFilters
+from flast.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, Registry, TOKEN_BUCKETS, cost_usd, server_timing
+from flast.prompts import PromptRegistry
+from flast.search_params import SearchParamError, SearchParams
+from flast.rerank import RERANK_ADDITIONAL, RERANK_PROPERTIES, RerankWeights, rerank
+from flast.sse import sse_event
+from flast.timing import StageTimer
+from flast.tracing import TracingMiddleware
+from flast.tokens import counter_for_model, get_counter
+from flast.weaviate_graphql import batch_hybrid_search, hybrid_search
 
 # ---------------------------- All cofig ----------------------------
 load_dotenv()  # Load the environment variables
 openai.api_key = os.getenv("OPENAI_API_KEY")
 WEAVIATE_API = os.getenv("WEAVIATE_API")
 API_AUTH_TOKEN = os.getenv("API_AUTH_TOKEN")  # Information: Read auth token from environment
-EMBEDDING_MODEL = "text-embedding-ada-002"
-tokenizer = GPT2TokenizerFast.from_pretrained("gpt2")
+EMBEDDING_MODEL = "text-embedding-3-small"  # Information: Matches the schema vectorizer
 model = "gpt-4o"
+# Information: How answer + reasoning are generated (see generate_answer_and_reasoning)
+GENERATION_MODES = ("sequential", "fused", "parallel")
+GENERATION_MODE = os.getenv("GENERATION_MODE", "sequential")
+WEAVIATE_URL = "http://localhost:8080"  # test1
+READY_TIMEOUT = float(os.getenv("READY_TIMEOUT", "2"))  # Information: Seconds /readyz waits for Weaviate
+# WEAVIATE_URL = WEAVIATE_API  # test2
 
-# Information: Using weaviate-client v3 API (compatible with Weaviate 1.18.2)
-client = WeaviateClient(
-    url="http://localhost:8080",  # test1
-    # url=WEAVIATE_API,  # test2
+# Information: Class the API queries; scripts/migrate_schema.py --switch rewrites the class file and workers follow without a restart
+active_class = ActiveClass(
+    os.getenv("WEAVIATE_CLASS_FILE", DEFAULT_CLASS_FILE),
+    default=os.getenv("WEAVIATE_CLASS", "AI_v1"),
+    check_interval=float(os.getenv("WEAVIATE_CLASS_CHECK_INTERVAL", "2.0")),
 )
+# Information: Property names per class, so queries to a legacy class skip the properties it lacks
+class_properties = ClassProperties()
 
-prompts_folder = os.path.join(os.getcwd(), "prompts")
+# Information: Top-k hits packed into the prompt context, and the token budget they must fit
+RETURN_PROPERTIES = ["data", "case_name", "chunk_index", "citation", "court"]
+CONTEXT_TOP_K = int(os.getenv("CONTEXT_TOP_K", "5"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+# Information: Hybrid alpha / fusion type / BM25 properties (HYBRID_* env, see scripts/tune_hybrid.py); requests may override
+SEARCH_DEFAULTS = SearchParams.from_env()
+
+# Information: Optional local re-ranking: fetch RERANK_CANDIDATES hits with their vectors, fuse signals, keep CONTEXT_TOP_K
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "50"))
+RERANK_WEIGHTS = RerankWeights.from_env()
+
+# Information: Optional in-process index (scripts/build_local_index.py): "failover" when Weaviate errors, "primary" to serve reads
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH")
+LOCAL_INDEX_MODE = os.getenv("LOCAL_INDEX_MODE", "failover")
+LOCAL_INDEX_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", "16"))
+local_index = None  # Information: Opened in the lifespan, so numpy only loads when an index is configured
+
+# Information: Questions citing a judgment ("[2024] FamCA 123") skip vector search; the citation -> chunk id index is
+# rebuilt every CITATION_INDEX_REFRESH seconds (0: no index, filter on the citation property instead)
+CITATION_ROUTING = os.getenv("CITATION_ROUTING", "true").lower() == "true"
+CITATION_INDEX_REFRESH = float(os.getenv("CITATION_INDEX_REFRESH", "900"))
+citation_index = CitationIndex()
 
-meta = client.schema.get()
-print(meta)
+# Information: Batch endpoint limits (questions per request, aliased searches per GraphQL call, LLM fan-out)
+BATCH_MAX_QUESTIONS = int(os.getenv("BATCH_MAX_QUESTIONS", "5000"))
+BATCH_QUERY_SIZE = int(os.getenv("BATCH_QUERY_SIZE", "50"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Information: Pooled Weaviate and OpenAI clients, created in the app lifespan and shared by all requests
+backends = Backends(BackendSettings.from_env(WEAVIATE_URL))
+
+prompts_folder = os.path.join(os.getcwd(), "prompts")
+# Information: Prompts are loaded once and hot-reloaded when the files change (no per-request file I/O)
+prompt_registry = PromptRegistry(
+    prompts_folder,
+    {"answer": "prompt.txt", "reasoning": "reasoning_prompt.txt"},
+    check_interval=float(os.getenv("PROMPT_CHECK_INTERVAL", "2.0")),
+)
 
 class Query(BaseModel):
     user_question: str
     user_model: str
     user_auth: str
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Information: Semantic answer cache keyed on question embeddings (SQLite tier when ANSWER_CACHE_SQLITE_PATH is set)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+answer_cache = AnswerCache(
+    threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95")),
+    max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "86400")),
+    sqlite_path=os.getenv("ANSWER_CACHE_SQLITE_PATH") or None,
+    sqlite_max_entries=int(os.getenv("ANSWER_CACHE_SQLITE_MAX_ENTRIES", "10000")),
+) if ANSWER_CACHE_ENABLED else None
+
+# Information: Query embeddings by model + text hash; Weaviate gets the vector instead of re-vectorizing the question
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+embedding_cache = EmbeddingCache(
+    path=os.getenv("EMBEDDING_CACHE_PATH") or DEFAULT_CACHE_PATH,
+    memory_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "1024")),
+) if EMBEDDING_CACHE_ENABLED else None
+
+# Information: Prometheus metrics at GET /metrics; SERVER_TIMING adds the stage timings as a Server-Timing header
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "false").lower() == "true"
+metrics = Registry()
+stage_seconds = metrics.histogram(
+    "flast_stage_seconds", "Duration of pipeline stages (retrieval, prompt_build, answer, reasoning, ...) and total",
+    ("endpoint", "stage"),
+)
+http_requests = metrics.counter("flast_http_requests_total", "HTTP requests by route", ("path", "method", "status"))
+http_seconds = metrics.histogram("flast_http_request_seconds", "HTTP request duration by route", ("path",))
+llm_tokens = metrics.counter("flast_llm_tokens_total", "OpenAI tokens used", ("model", "kind", "stage"))
+llm_cost = metrics.counter("flast_llm_cost_usd_total", "Estimated OpenAI cost in USD (see OPENAI_PRICES)", ("model",))
+context_tokens = metrics.histogram("flast_context_tokens", "Tokens of retrieved context packed into the prompt",
+                                   buckets=TOKEN_BUCKETS)
+cache_lookups = metrics.counter("flast_answer_cache_lookups_total", "Answer cache lookups", ("result",))
+errors = metrics.counter("flast_errors_total", "Errors handled by falling back or returning an error", ("where",))
 
 # ---------------------------- All functions ----------------------------
 
-def process_answer(model, messages):
+def report_error(where, e, suffix=""):
+    print(f"Error in {where}: {str(e)}{suffix}")
+    errors.inc(where=where)
+
+def record_usage(model, stage, usage):
+    """Count the tokens of one OpenAI call (``usage`` from the SDK or a raw response) and their cost."""
+    if usage is None:
+        return
+    get = usage.get if isinstance(usage, dict) else lambda name: getattr(usage, name, None)
+    prompt_tokens, completion_tokens = get("prompt_tokens") or 0, get("completion_tokens") or 0
+    llm_tokens.inc(prompt_tokens, model=model, kind="prompt", stage=stage)
+    if completion_tokens:
+        llm_tokens.inc(completion_tokens, model=model, kind="completion", stage=stage)
+    llm_cost.inc(cost_usd(model, prompt_tokens, completion_tokens), model=model)
+
+def record_timings(endpoint, timer):
+    """Observe a finished request's stages, total, context size and cache outcome."""
+    for stage, seconds in list(timer.stages.items()) + [("total", timer.total())]:
+        stage_seconds.observe(seconds, endpoint=endpoint, stage=stage)
+    if "context_tokens" in timer.info:
+        context_tokens.observe(timer.info["context_tokens"])
+    if "cache_hit" in timer.info:
+        cache_lookups.inc(result="hit" if timer.info["cache_hit"] else "miss")
+
+async def process_answer(model, messages):
     try:
-        response = openai_client.chat.completions.create(
+        response = await backends.openai.chat.completions.create(
             model=model,
             messages=messages,
             temperature=0.7,
@@ -51,14 +164,15 @@ def process_answer(model, messages):
             frequency_penalty=0.3,
             presence_penalty=0.3,
         )
+        record_usage(model, "answer", response.usage)
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"Error in process_answer: {str(e)}")
+        report_error("process_answer", e)
         return "Error generating answer"
 
-def process_reasoning(model, reasoning):
+async def process_reasoning(model, reasoning):
     try:
-        response = openai_client.chat.completions.create(
+        response = await backends.openai.chat.completions.create(
             model=model,
             messages=reasoning,
             temperature=0.7,
@@ -66,106 +180,666 @@ def process_reasoning(model, reasoning):
             frequency_penalty=0.3,
             presence_penalty=0.3,
         )
+        record_usage(model, "reasoning", response.usage)
         return response.choices[0].message.content.strip()
     except Exception as e:
-        print(f"Error in process_reasoning: {str(e)}")
+        report_error("process_reasoning", e)
         return "Error generating reasoning"
 
-def return_answer_and_context_for_queries(user_question, model):
+FUSED_INSTRUCTIONS = (
+    'Respond with a JSON object with exactly two string fields: "answer", written following the answer '
+    'instructions above, and "reasoning", written following the reasoning instructions above about that answer.'
+)
+
+async def process_fused(model, messages):
+    """Generate answer and reasoning in one JSON-mode completion, returning (answer, reasoning)."""
     try:
-        filtered_user_question = user_question.replace('"', "'")
-
-        # Information: Query Weaviate with v3 API
-        result = (
-            client.query
-            .get("AI_v1", [
-                "data", 
-                "case_name",
-                "_additional {score}"
-            ])
-            .with_hybrid(filtered_user_question)
-            .with_limit(5)
-            .do()
+        response = await backends.openai.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.7,
+            top_p=0.9,
+            frequency_penalty=0.3,
+            presence_penalty=0.3,
+            response_format={"type": "json_object"},
         )
+        record_usage(model, "fused", response.usage)
+        content = response.choices[0].message.content.strip()
+    except Exception as e:
+        report_error("process_fused", e)
+        return "Error generating answer", "Error generating reasoning"
+    try:
+        result = json.loads(content)
+        return str(result.get("answer", "")).strip(), str(result.get("reasoning", "")).strip()
+    except (json.JSONDecodeError, AttributeError):
+        # Information: Model ignored the JSON format - keep its text as the answer
+        return content, "Error generating reasoning"
 
-        if 'data' not in result or 'Get' not in result['data'] or 'AI_v1' not in result['data']['Get']:
-            raise ValueError("Unexpected response structure from Weaviate")
-
-        ai_v1 = result['data']['Get']['AI_v1']
-
-        if not ai_v1:
-            return "No relevant information found", "", "No reasoning available", "No case name"
-
-        # Information: Get highest scoring result
-        highest_score = max(ai_v1, key=lambda x: float(x['_additional']['score']))
-        case_name = highest_score.get('case_name', 'Unknown Case')
-        data = highest_score.get('data', '')
-        
-        # Note: citation, court, etc. not in old schema - will add later
-        citation = ''
-        court = ''
-        jurisdiction = ''
-        decision_date = ''
-        
-        # Information: Build enriched case reference for LLM context
-        case_reference = f"{case_name}"
-        if citation:
-            case_reference += f" {citation}"
-        if court:
-            case_reference += f" ({court})"
-
-        with open(os.path.join(prompts_folder, 'prompt.txt'), 'r') as f:
-            API_prompt_text = f.read()
-        with open(os.path.join(prompts_folder, 'reasoning_prompt.txt'), 'r') as f:
-            API_reasoning_prompt_text = f.read()
-
-        ans_header = API_prompt_text
-        reasoning_header = API_reasoning_prompt_text
-
-        # Information: Include case reference in prompt for proper citation
-        data_clean = data.replace('\n', ' ')
-        ans_prompt = f"Questions: {user_question}\n\nCase: {case_reference}\n\nContext: {data_clean}"
-
-        messages = [
-            {"role": "system", "content": ans_header if ans_header else "You are a helpful assistant"},
-            {"role": "user", "content": ans_prompt}
-        ]
+async def stream_completion(model, messages, stage="answer"):
+    """Yield content tokens of a streamed chat completion; its token usage is counted under ``stage``."""
+    response = await backends.openai.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=0.7,
+        top_p=0.9,
+        frequency_penalty=0.3,
+        presence_penalty=0.3,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in response:
+        if chunk.usage is not None:
+            record_usage(model, stage, chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def build_answer_messages(user_question, case_reference, data_clean, ans_header):
+    # Information: Include case reference in prompt for proper citation
+    ans_prompt = f"Questions: {user_question}\n\nCase: {case_reference}\n\nContext: {data_clean}"
+    return [
+        {"role": "system", "content": ans_header if ans_header else "You are a helpful assistant"},
+        {"role": "user", "content": ans_prompt}
+    ]
 
-        answer = process_answer(model, messages)
+def build_reasoning_messages(user_question, case_reference, answer, data_clean, reasoning_header):
+    # Information: Include case reference in reasoning prompt as well
+    answer_clean = answer.replace('\n', ' ')
+    reasoning_prompt = f"Questions: {user_question}\n\nCase: {case_reference}\n\nAnswer: {answer_clean}\n\nContext: {data_clean}"
+    return [
+        {"role": "system", "content": reasoning_header if reasoning_header else "You are a helpful assistant"},
+        {"role": "user", "content": reasoning_prompt}
+    ]
 
-        # Information: Include case reference in reasoning prompt as well
-        answer_clean = answer.replace('\n', ' ')
-        reasoning_prompt = f"Questions: {user_question}\n\nCase: {case_reference}\n\nAnswer: {answer_clean}\n\nContext: {data_clean}"
+async def generate_answer_and_reasoning(model, user_question, case_reference, data_clean,
+                                        ans_header, reasoning_header, generation_mode, timer):
+    """
+    Produce (answer, reasoning) for one question and its retrieved context.
 
+    Modes:
+        sequential: answer, then reasoning over the answer (two round-trips back to back)
+        fused: one JSON completion carrying both answer and reasoning
+        parallel: answer and reasoning started together; reasoning works from the
+            retrieved context only, since the answer is not available yet
+    """
+    messages = build_answer_messages(user_question, case_reference, data_clean, ans_header)
+
+    if generation_mode == "fused":
+        fused_header = "\n\n".join(header for header in (ans_header, reasoning_header) if header)
+        fused_messages = [
+            {"role": "system", "content": f"{fused_header}\n\n{FUSED_INSTRUCTIONS}"},
+            messages[1]
+        ]
+        with timer.stage("generation"):
+            return await process_fused(model, fused_messages)
+
+    if generation_mode == "parallel":
+        # Information: Speculative reasoning over the context, run alongside the answer
         reasoning_messages = [
             {"role": "system", "content": reasoning_header if reasoning_header else "You are a helpful assistant"},
-            {"role": "user", "content": reasoning_prompt}
+            messages[1]
         ]
 
-        reasoning = process_reasoning(model, reasoning_messages)
+        async def timed(stage, coroutine):
+            with timer.stage(stage):
+                return await coroutine
 
-        return answer, data, reasoning, case_name
+        with timer.stage("generation"):
+            return await asyncio.gather(
+                timed("answer", process_answer(model, messages)),
+                timed("reasoning", process_reasoning(model, reasoning_messages)),
+            )
 
-    except openai.Error as e:
-        return "An error occurred: " + str(e), "error", "error", "error"
+    with timer.stage("generation"):
+        with timer.stage("answer"):
+            answer = await process_answer(model, messages)
+
+        reasoning_messages = build_reasoning_messages(
+            user_question, case_reference, answer, data_clean, reasoning_header
+        )
+
+        with timer.stage("reasoning"):
+            reasoning = await process_reasoning(model, reasoning_messages)
+
+    return answer, reasoning
+
+def top_k(params=None):
+    """Hits packed into the context: the request's ``limit``, else CONTEXT_TOP_K."""
+    return (params or SEARCH_DEFAULTS).limit or CONTEXT_TOP_K
+
+def retrieval_fields(params=None, available=None):
+    """
+    Hybrid query ``properties``, ``limit`` and ``additional`` fields; re-ranking needs more candidates and their vectors.
+    ``available`` (from ``available_properties``) drops the properties the queried class does not define.
+    """
+    properties = RETURN_PROPERTIES
+    if RERANK_ENABLED:
+        properties = RETURN_PROPERTIES + [p for p in RERANK_PROPERTIES if p not in RETURN_PROPERTIES]
+    if available is not None:
+        properties = select_properties(properties, available)
+    if RERANK_ENABLED:
+        return {"properties": properties, "limit": max(RERANK_CANDIDATES, top_k(params)), "additional": RERANK_ADDITIONAL}
+    return {"properties": properties, "limit": top_k(params)}
 
+def hybrid_fields(params=None, available=None):
+    """``retrieval_fields`` plus the hybrid ``alpha``, ``fusion_type`` and ``query_properties``."""
+    return {**retrieval_fields(params, available), **(params or SEARCH_DEFAULTS).hybrid_arguments()}
 
+async def available_properties(class_name):
+    """Properties ``class_name`` defines (read once per class); the legacy ones while its schema cannot be read."""
+    try:
+        return await class_properties.get(backends.weaviate_http, class_name)
     except Exception as e:
-        print(f"Error in return_answer_and_context_for_queries: {str(e)}")
-        return str(e), "", "", ""
+        report_error("available_properties", e, "; requesting data and case_name only")
+        return LEGACY_PROPERTIES
 
+def open_local_index():
+    """Open the index at LOCAL_INDEX_PATH; on failure retrieval keeps using Weaviate only."""
+    global local_index
+    try:
+        from flast.local_index import LocalIndex
+        local_index = LocalIndex(LOCAL_INDEX_PATH, nprobe=LOCAL_INDEX_NPROBE)
     except Exception as e:
-        print(f"Error in return_answer_and_context_for_queries: {str(e)}")
+        report_error("open_local_index", e)
+
+def search_local_index(queries, vectors, filters=None, params=None):
+    """Local hybrid hits per query, or the exception that query failed with (runs in a worker thread)."""
+    # Information: The local index fuses relative scores over its own candidates; only alpha carries over
+    alpha = (params or SEARCH_DEFAULTS).alpha
+    options = {"alpha": alpha} if alpha is not None else {}
+    results = []
+    for query, vector in zip(queries, vectors):
+        try:
+            results.append(local_index.search(query, vector, **retrieval_fields(params), filters=filters, **options))
+        except Exception as e:
+            results.append(e)
+    return results
+
+async def route_citation(query, filters=None, params=None):
+    """Chunks of the judgment(s) ``query`` cites (flast/citations.py), or None to run hybrid search."""
+    class_name = active_class.get()
+    available = await available_properties(class_name)
+    try:
+        return await route(
+            backends.weaviate_http,
+            class_name,
+            query,
+            citation_index,
+            **retrieval_fields(params, available),
+            where=filters.where() if filters else None,
+            available=available,
+        )
+    except Exception as e:
+        report_error("route_citation", e)
+        return None
+
+async def refresh_citation_index():
+    """Rebuild the citation index every CITATION_INDEX_REFRESH seconds, and within seconds of a class switch."""
+    loop = asyncio.get_running_loop()
+    while True:
+        class_name = active_class.get()
+        try:
+            # Information: One trace per rebuild instead of a root span per page read
+            with tracing.span("citation_index_refresh", **{"flast.class": class_name}):
+                await citation_index.refresh(
+                    backends.weaviate_http, class_name, available=await available_properties(class_name)
+                )
+        except Exception as e:
+            report_error("refresh_citation_index", e)
+        deadline = loop.time() + CITATION_INDEX_REFRESH
+        while loop.time() < deadline and active_class.get() == class_name:
+            await asyncio.sleep(min(5.0, CITATION_INDEX_REFRESH))
+
+async def search_ai_v1(query, timer, question_vector=None, filters=None, params=None):
+    """
+    Hybrid hits for one question from Weaviate, or from the local index when it is the primary
+    source or Weaviate fails. The local index needs the question vector. ``filters`` (a
+    SearchFilters) become the query's ``where`` clause, so only matching chunks are ranked.
+    A question citing a known judgment is answered from its chunks without vector search.
+    ``params`` (a SearchParams) set the hybrid alpha, fusion type, limit and BM25 properties.
+    """
+    use_local = local_index is not None and question_vector is not None
+    if not use_local or LOCAL_INDEX_MODE != "primary":
+        if CITATION_ROUTING and find_citations(query):
+            with timer.stage("citation_lookup"):
+                hits = await route_citation(query, filters, params)
+            if hits is not None:
+                timer.info["route"] = "citation"
+                return hits
+        class_name = active_class.get()
+        try:
+            with timer.stage("retrieval"):
+                return await hybrid_search(
+                    backends.weaviate_http,
+                    class_name,
+                    query,
+                    **hybrid_fields(params, await available_properties(class_name)),
+                    vector=question_vector,
+                    where=filters.where() if filters else None,
+                )
+        except Exception as e:
+            if not use_local:
+                raise
+            report_error("search_ai_v1", e, "; using the local index")
+    with timer.stage("local_retrieval"):
+        found = (await asyncio.to_thread(search_local_index, [query], [question_vector], filters, params))[0]
+    if isinstance(found, Exception):
+        raise found
+    return found
+
+async def retrieve_context(user_question, timer, hits=None, model=model, question_vector=None, filters=None,
+                           params=None):
+    """
+    Return (context, case_name, case_reference) packed from the top-k hits, or None if nothing matched.
+
+    ``hits`` lets batch callers pass results already fetched in a combined query; the token
+    budget is counted with ``model``'s own encoding. ``question_vector`` is sent with the
+    hybrid query so Weaviate does not embed the question again, and lets the local index
+    answer when Weaviate cannot. ``filters`` restrict the search to matching chunks and ``params``
+    tune it.
+    """
+    filtered_user_question = user_question.replace('"', "'")
+
+    # Information: Query Weaviate over async GraphQL (same hybrid query as the v3 query builder)
+    if hits is not None:
+        ai_v1 = hits
+    else:
+        ai_v1 = await search_ai_v1(filtered_user_question, timer, question_vector, filters, params)
+
+    if not ai_v1:
+        return None
+
+    if RERANK_ENABLED:
+        if question_vector is not None:
+            with timer.stage("rerank"):
+                ai_v1 = rerank(ai_v1, question_vector, RERANK_WEIGHTS)
+        ai_v1 = ai_v1[:top_k(params)]
+
+    # Information: Pack the top-k chunks (deduplicated, adjacent chunks merged) into the token budget
+    with timer.stage("prompt_build"):
+        packed = build_context(ai_v1, CONTEXT_TOKEN_BUDGET, counter_for_model(model).count)
+    timer.info["context_tokens"] = packed.tokens
+    case_name = packed.passages[0].case_name
+    data = packed.text
+
+    # Information: Citation and court come from the top case's chunks (empty for chunks ingested without metadata)
+    top_hit = next((hit for hit in ai_v1 if hit.get('case_name') == case_name), {})
+    citation = top_hit.get('citation') or ''
+    court = top_hit.get('court') or ''
+
+    # Information: Build enriched case reference for LLM context; case names usually already hold the citation
+    case_reference = f"{case_name}"
+    if citation and citation not in case_name:
+        case_reference += f" {citation}"
+    if court:
+        case_reference += f" ({court})"
+    if len(packed.case_names) > 1:
+        case_reference += "; " + "; ".join(packed.case_names[1:])
+
+    return data, case_name, case_reference
+
+def load_prompts(timer=None):
+    """Return the (answer, reasoning, version) system prompts from the prompt registry."""
+    prompts, version = prompt_registry.snapshot()
+    if timer is not None:
+        timer.info["prompt_version"] = version
+    return prompts["answer"], prompts["reasoning"], version
+
+def cache_namespace(model, generation_mode, prompts_version, filters=None, params=None, question=""):
+    # Information: Cached answers are only reused when everything that shapes them matches
+    namespace = f"{model}|{generation_mode}|{prompts_version}|{EMBEDDING_MODEL}|{active_class.get()}"
+    # Information: Questions differing only in the cited judgment embed far above the threshold; key on the citations
+    citations = sorted({citation_key(c) for c in find_citations(question)})
+    if citations:
+        namespace += f"|{','.join(citations)}"
+    if filters:
+        namespace += f"|{filters.key()}"
+    if params is not None and params != SearchParams():
+        namespace += f"|{params.key()}"
+    return namespace
+
+async def request_embeddings(texts):
+    response = await backends.openai.embeddings.with_raw_response.create(
+        model=EMBEDDING_MODEL, input=texts, encoding_format="base64"
+    )
+    body = json.loads(response.text)
+    record_usage(EMBEDDING_MODEL, "embedding", body.get("usage"))
+    return decode_embeddings(body)
+
+async def embed_questions(questions):
+    """Embeddings for ``questions`` in order; repeated questions come from the embedding cache."""
+    if embedding_cache is None:
+        return await request_embeddings(list(questions))
+    return await embedding_cache.aembed(EMBEDDING_MODEL, questions, request_embeddings)
+
+async def embed_question(user_question, timer):
+    """Question embedding, or None if it could not be computed (Weaviate then vectorizes the query itself)."""
+    try:
+        with timer.stage("embedding"):
+            return (await embed_questions([user_question]))[0]
+    except Exception as e:
+        report_error("embed_question", e)
+        return None
+
+async def lookup_answer_cache(user_question, namespace, timer, question_vector=None):
+    """Return (question_vector, cached answer tuple or None); the vector is None when embedding failed."""
+    if question_vector is None:
+        question_vector = await embed_question(user_question, timer)
+    if answer_cache is None or question_vector is None:
+        return question_vector, None
+    try:
+        with timer.stage("cache"):
+            # Information: The SQLite tier does blocking I/O, keep it off the event loop
+            cached = await asyncio.to_thread(answer_cache.get, question_vector, namespace)
+    except Exception as e:
+        report_error("lookup_answer_cache", e)
+        return question_vector, None
+    timer.info["cache_hit"] = cached is not None
+    return question_vector, cached
+
+async def store_answer_cache(question_vector, namespace, result):
+    answer, _, reasoning, _ = result
+    if answer_cache is None or question_vector is None:
+        return
+    # Information: Never cache failed generations
+    if answer.startswith("Error generating") or reasoning.startswith("Error generating"):
+        return
+    try:
+        await asyncio.to_thread(answer_cache.put, question_vector, namespace, result)
+    except Exception as e:
+        report_error("store_answer_cache", e)
+
+async def answer_question(user_question, model, generation_mode, timer, hits=None, question_vector=None,
+                          filters=None, params=None):
+    """Answer one question, returning (answer, context, reasoning, case_name); backend errors propagate."""
+    params = params or SEARCH_DEFAULTS
+    ans_header, reasoning_header, prompts_version = load_prompts(timer)
+    namespace = cache_namespace(model, generation_mode, prompts_version, filters, params, user_question)
+
+    question_vector, cached = await lookup_answer_cache(user_question, namespace, timer, question_vector)
+    if cached is not None:
+        return cached
+
+    retrieved = await retrieve_context(
+        user_question, timer, hits=hits, model=model, question_vector=question_vector, filters=filters,
+        params=params
+    )
+    if retrieved is None:
+        return "No relevant information found", "", "No reasoning available", "No case name"
+    data, case_name, case_reference = retrieved
+
+    # Information: Passages are already flattened; keep the blank lines that separate them
+    data_clean = data
+    answer, reasoning = await generate_answer_and_reasoning(
+        model, user_question, case_reference, data_clean,
+        ans_header, reasoning_header, generation_mode, timer
+    )
+
+    result = (answer, data, reasoning, case_name)
+    await store_answer_cache(question_vector, namespace, result)
+    return result
+
+async def return_answer_and_context_for_queries(user_question, model, generation_mode=None, timer=None,
+                                                filters=None, params=None):
+    # Information: Callers pass a StageTimer to read back per-stage latency
+    timer = timer if timer is not None else StageTimer()
+    generation_mode = generation_mode or GENERATION_MODE
+    try:
+        return await answer_question(user_question, model, generation_mode, timer, filters=filters, params=params)
+
+    except openai.OpenAIError as e:
+        return "An error occurred: " + str(e), "error", "error", "error"
+
+    except Exception as e:
+        report_error("return_answer_and_context_for_queries", e)
         return str(e), "", "", ""
 
+async def answer_questions_batch(questions, model, generation_mode, concurrency, filters=None, params=None):
+    """
+    Answer many questions: one batched Weaviate round-trip per BATCH_QUERY_SIZE questions,
+    then LLM calls fanned out with at most ``concurrency`` questions in flight. ``filters``
+    and ``params`` apply to every question.
+
+    Returns:
+        (results in input order, batch timings); each result holds either the answer
+        fields or an ``error`` for that question alone.
+    """
+    timer = StageTimer()
+    valid = [i for i, q in enumerate(questions) if isinstance(q, str) and q.strip()]
+
+    # Information: One embeddings request for every uncached question; on failure Weaviate vectorizes them
+    vectors = None
+    try:
+        with timer.stage("embedding"):
+            vectors = await embed_questions([questions[i] for i in valid]) if valid else []
+    except Exception as e:
+        report_error("answer_questions_batch", e)
+    vectors_by_index = dict(zip(valid, vectors or []))
+
+    queries = [questions[i].replace('"', "'") for i in valid]
+    use_local = local_index is not None and vectors is not None
+    hits = [None] * len(valid)
+    if not use_local or LOCAL_INDEX_MODE != "primary":
+        # Information: Questions citing a known judgment skip the hybrid batch
+        cited = [i for i, query in enumerate(queries) if find_citations(query)] if CITATION_ROUTING else []
+        if cited:
+            semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+            async def routed(query):
+                async with semaphore:
+                    return await route_citation(query, filters, params)
+
+            with timer.stage("citation_lookup"):
+                for i, found in zip(cited, await asyncio.gather(*(routed(queries[i]) for i in cited))):
+                    hits[i] = found
+        rest = [i for i, found in enumerate(hits) if found is None]
+        if rest:
+            class_name = active_class.get()
+            with timer.stage("retrieval"):
+                searched = await batch_hybrid_search(
+                    backends.weaviate_http,
+                    class_name,
+                    [queries[i] for i in rest],
+                    **hybrid_fields(params, await available_properties(class_name)),
+                    batch_size=BATCH_QUERY_SIZE,
+                    vectors=[vectors[i] for i in rest] if vectors is not None else None,
+                    where=filters.where() if filters else None,
+                )
+            for i, found in zip(rest, searched):
+                hits[i] = found
+    # Information: Questions Weaviate did not answer (all of them when the local index is primary) go to the local index
+    pending = [i for i, found in enumerate(hits) if found is None or isinstance(found, Exception)] if use_local else []
+    if pending:
+        with timer.stage("local_retrieval"):
+            local_hits = await asyncio.to_thread(
+                search_local_index, [queries[i] for i in pending], [vectors[i] for i in pending], filters, params
+            )
+        for i, found in zip(pending, local_hits):
+            hits[i] = found
+    hits_by_index = dict(zip(valid, hits))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index, question):
+        if index not in hits_by_index:
+            return {"index": index, "question": question, "error": "Question should be a non-empty string."}
+        if isinstance(hits_by_index[index], Exception):
+            return {"index": index, "question": question, "error": str(hits_by_index[index])}
+        item_timer = StageTimer()
+        async with semaphore:
+            try:
+                ans, context, reasoning, case_name = await answer_question(
+                    question, model, generation_mode, item_timer, hits=hits_by_index[index],
+                    question_vector=vectors_by_index.get(index), filters=filters, params=params
+                )
+            except Exception as e:
+                report_error("answer_questions_batch", e)
+                return {"index": index, "question": question, "error": str(e)}
+        record_timings("batch_item", item_timer)
+        return {
+            "index": index,
+            "question": question,
+            "answer": ans,
+            "context": context,
+            "reasoning": reasoning,
+            "case_name": case_name,
+            "cache_hit": item_timer.info.get("cache_hit", False),
+            "timings": item_timer.as_ms()
+        }
+
+    with timer.stage("generation"):
+        results = await asyncio.gather(*(one(i, q) for i, q in enumerate(questions)))
+    record_timings("batch", timer)
+    return results, timer.as_ms()
+
+async def stream_answer_events(user_question, model, filters=None, params=None):
+    """
+    Yield server-sent events for one question.
+
+    Events, in order: ``context`` ({context, case_name}), ``answer`` ({token})*,
+    ``reasoning`` ({token})*, then ``done`` ({timings}); ``error`` ({detail}) replaces
+    the remaining events if a backend call fails.
+    """
+    timer = StageTimer()
+    try:
+        ans_header, reasoning_header, prompts_version = load_prompts(timer)
+        params = params or SEARCH_DEFAULTS
+        namespace = cache_namespace(model, "sequential", prompts_version, filters, params, user_question)
+
+        question_vector, cached = await lookup_answer_cache(user_question, namespace, timer)
+        if cached is not None:
+            answer, data, reasoning, case_name = cached
+            yield sse_event("context", {"context": data, "case_name": case_name})
+            yield sse_event("answer", {"token": answer})
+            yield sse_event("reasoning", {"token": reasoning})
+            yield sse_event("done", {"timings": timer.as_ms(), "cache_hit": True, "prompt_version": prompts_version})
+            return
+
+        retrieved = await retrieve_context(
+            user_question, timer, model=model, question_vector=question_vector, filters=filters, params=params
+        )
+        if retrieved is None:
+            yield sse_event("context", {"context": "", "case_name": "No case name"})
+            yield sse_event("answer", {"token": "No relevant information found"})
+            yield sse_event("reasoning", {"token": "No reasoning available"})
+            yield sse_event("done", {"timings": timer.as_ms(), "cache_hit": False, "prompt_version": prompts_version})
+            return
+        data, case_name, case_reference = retrieved
+
+        # Information: Context goes out before any LLM call so the client can render it immediately
+        yield sse_event("context", {"context": data, "case_name": case_name})
+
+        # Information: Passages are already flattened; keep the blank lines that separate them
+        data_clean = data
+
+        answer_parts = []
+        with timer.stage("answer"):
+            async for token in stream_completion(
+                model, build_answer_messages(user_question, case_reference, data_clean, ans_header)
+            ):
+                if not answer_parts:
+                    timer.mark("first_token")
+                answer_parts.append(token)
+                yield sse_event("answer", {"token": token})
+
+        answer = "".join(answer_parts).strip()
+        reasoning_messages = build_reasoning_messages(
+            user_question, case_reference, answer, data_clean, reasoning_header
+        )
+        reasoning_parts = []
+        with timer.stage("reasoning"):
+            async for token in stream_completion(model, reasoning_messages, stage="reasoning"):
+                reasoning_parts.append(token)
+                yield sse_event("reasoning", {"token": token})
+
+        # Information: Cache before "done"; a client that disconnects on it closes this generator at the yield
+        await store_answer_cache(
+            question_vector, namespace, (answer, data, "".join(reasoning_parts).strip(), case_name)
+        )
+        yield sse_event("done", {"timings": timer.as_ms(), "cache_hit": False, "prompt_version": prompts_version})
+
+    except Exception as e:
+        report_error("stream_answer_events", e)
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        record_timings("stream", timer)
+        tracing.annotate(timer.info)
+
 # ---------------------------- All routes ----------------------------
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Information: TRACING_EXPORTER turns tracing on; OpenTelemetry is only imported then
+    tracing.configure("flast-api")
+    # Information: Open the connection pools before the first request and drain them on shutdown
+    backends.start()
+    # Information: Load the default model's BPE vocabulary off the event loop; startup and /healthz do not wait for it
+    warmup = asyncio.create_task(asyncio.to_thread(counter_for_model, model))
+    # Information: Until the local index is open, retrieval uses Weaviate only
+    index_load = asyncio.create_task(asyncio.to_thread(open_local_index)) if LOCAL_INDEX_PATH else None
+    # Information: Until the citation index is built, cited questions filter on the citation property
+    citation_refresh = (
+        asyncio.create_task(refresh_citation_index()) if CITATION_ROUTING and CITATION_INDEX_REFRESH > 0 else None
+    )
+    yield
+    for task in (warmup, index_load, citation_refresh):
+        if task is not None and not task.done():
+            task.cancel()
+    await backends.close()
+    tracing.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, requests=http_requests, seconds=http_seconds)
+# Information: Added last so it is outermost: the server span covers the whole request, a no-op unless tracing is on
+app.add_middleware(TracingMiddleware)
 
 @app.get("/")
 def read_root():
     return {"message": "This is v1 on weaviate API"}
 
+# Information: Liveness; never touches a backend, so a Weaviate outage does not get the process restarted
+@app.get("/healthz")
+def healthz():
+    return {"status": "ok"}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics (text exposition format) of this worker process."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=false).")
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness: Weaviate answers its ready probe (or a local index is open to fail over to)
+    and the prompt templates are loaded.
+
+    Returns 200 with per-check results when ready, 503 otherwise.
+    """
+    checks = {}
+    try:
+        response = await backends.weaviate_http.get("/v1/.well-known/ready", timeout=READY_TIMEOUT)
+        checks["weaviate"] = "ok" if response.status_code == 200 else f"status {response.status_code}"
+    except Exception as e:
+        checks["weaviate"] = f"unreachable: {type(e).__name__}"
+    prompts, _ = prompt_registry.snapshot()
+    checks["prompts"] = "ok" if all(prompts.values()) else "missing"
+    ready = all(value == "ok" for name, value in checks.items() if name != "weaviate")
+    ready = ready and (checks["weaviate"] == "ok" or local_index is not None)
+    if LOCAL_INDEX_PATH:
+        checks["local_index"] = f"{local_index.kind}, {len(local_index)} rows" if local_index is not None else "pending"
+    # Information: Informational only; the token counter loads on demand if the warm-up has not finished
+    checks["tokenizer"] = counter_for_model(model).name if get_counter.cache_info().currsize else "pending"
+    checks["class"] = active_class.get()
+    if CITATION_ROUTING and CITATION_INDEX_REFRESH > 0:
+        checks["citation_index"] = (
+            f"{len(citation_index)} citations" if citation_index.covers(checks["class"]) else "pending"
+        )
+    return JSONResponse(
+        {"status": "ready" if ready else "not ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
 # Information: Auth validation function
 def validate_auth(x_api_key: str = None, payload_auth: str = None) -> bool:
     """
@@ -213,18 +887,8 @@ def validate_auth(x_api_key: str = None, payload_auth: str = None) -> bool:
     )
 
 
-@app.post("/generate_answers/")
-async def generate_answers(
-    payload: dict,
-    x_api_key: str = Header(None, alias="X-API-Key")
-):
-    """
-    THis API is used to generate answers for the user question.
-    args:
-        * payload: The payload is a dictionary containing the user question.search
-        ** user_question: The user question is a string, which is the question asked by the user.
-        ** user_auth: The user auth is a string, which is the auth code to access the API.
-    """
+# Information: Shared payload checks for the answer endpoints
+def validate_question_payload(payload: dict):
     if 'user_question' not in payload:
         raise HTTPException(
             status_code=400,
@@ -253,8 +917,54 @@ async def generate_answers(
     elif len(payload['user_model']) == 0:
         raise HTTPException(
             status_code=400,
-            detail="Parameter 'user_question' should not be empty."
+            detail="Parameter 'user_model' should not be empty."
+        )
+
+
+# Information: Optional per-request generation mode, falling back to GENERATION_MODE
+def validate_generation_mode(payload: dict) -> str:
+    generation_mode = payload.get('generation_mode') or GENERATION_MODE
+    if generation_mode not in GENERATION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Parameter 'generation_mode' should be one of: {', '.join(GENERATION_MODES)}."
         )
+    return generation_mode
+
+
+# Information: Optional metadata filters (flast/filters.py), pushed down to Weaviate as a where clause
+def validate_filters(payload: dict):
+    try:
+        return SearchFilters.parse(payload.get('filters'))
+    except FilterError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# Information: Optional per-request hybrid alpha / fusion_type / limit / query_properties over SEARCH_DEFAULTS
+def validate_search_params(payload: dict):
+    try:
+        return SEARCH_DEFAULTS.merge(payload)
+    except SearchParamError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/generate_answers/")
+async def generate_answers(
+    payload: dict,
+    response: Response,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """
+    THis API is used to generate answers for the user question.
+    args:
+        * payload: The payload is a dictionary containing the user question.search
+        ** user_question: The user question is a string, which is the question asked by the user.
+        ** user_auth: The user auth is a string, which is the auth code to access the API.
+        ** generation_mode: Optional, one of sequential | fused | parallel (default: GENERATION_MODE).
+        ** filters: Optional {court, jurisdiction, citation, legal_topics, decision_date_from, decision_date_to}.
+        ** alpha, fusion_type, limit, query_properties: Optional hybrid search parameters (flast/search_params.py).
+    """
+    validate_question_payload(payload)
     
     # Information: Validate API key (supports both header and payload auth)
     payload_auth = payload.get('user_auth', None)
@@ -263,17 +973,135 @@ async def generate_answers(
     # Set the user question
     user_question = payload['user_question']
     model = payload['user_model']
+    generation_mode = validate_generation_mode(payload)
+    filters = validate_filters(payload)
+    params = validate_search_params(payload)
+    timer = StageTimer()
     
     try:
-        ans, context, reasoning, case_name = return_answer_and_context_for_queries(
+        ans, context, reasoning, case_name = await return_answer_and_context_for_queries(
             user_question,
-            model
+            model,
+            generation_mode=generation_mode,
+            timer=timer,
+            filters=filters,
+            params=params
         )
+        record_timings("generate_answers", timer)
+        tracing.annotate(timer.info)
+        timings = timer.as_ms()
+        if SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = server_timing(timings)
         return {
             "answer": ans,
             "context": context,
             "reasoning": reasoning,
-            "case_name": case_name
+            "case_name": case_name,
+            "generation_mode": generation_mode,
+            "cache_hit": timer.info.get("cache_hit", False),
+            "prompt_version": timer.info.get("prompt_version", prompt_registry.version),
+            "timings": timings
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/generate_answers/batch")
+async def generate_answers_batch(
+    payload: dict,
+    response: Response,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """
+    Answer a list of questions in one call (e.g. nightly evaluation jobs).
+    args:
+        * payload: The payload is a dictionary containing the questions.
+        ** questions: List of question strings (at most BATCH_MAX_QUESTIONS).
+        ** user_model: The model used for every question.
+        ** user_auth: Optional payload auth (X-API-Key header preferred).
+        ** generation_mode: Optional, one of sequential | fused | parallel (default: GENERATION_MODE).
+        ** concurrency: Optional questions in flight, capped at BATCH_CONCURRENCY.
+        ** filters: Optional metadata filters applied to every question (see /generate_answers/).
+        ** alpha, fusion_type, limit, query_properties: Optional hybrid search parameters for every question.
+    returns:
+        results in input order; a failed question carries `error` instead of answer fields.
+    """
+    questions = payload.get('questions')
+    if not isinstance(questions, list) or len(questions) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Parameter 'questions' should be a non-empty list."
+        )
+    elif len(questions) > BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Parameter 'questions' should have at most {BATCH_MAX_QUESTIONS} items."
+        )
+    elif not isinstance(payload.get('user_model'), str) or len(payload['user_model']) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Parameter 'user_model' should be a non-empty string."
+        )
+
+    # Information: Validate API key once for the whole batch
+    payload_auth = payload.get('user_auth', None)
+    validate_auth(x_api_key=x_api_key, payload_auth=payload_auth)
+
+    generation_mode = validate_generation_mode(payload)
+    filters = validate_filters(payload)
+    params = validate_search_params(payload)
+    try:
+        concurrency = max(1, min(int(payload.get('concurrency') or BATCH_CONCURRENCY), BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Parameter 'concurrency' should be an integer.")
+
+    results, timings = await answer_questions_batch(
+        questions, payload['user_model'], generation_mode, concurrency, filters, params
+    )
+    if SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = server_timing(timings)
+    return {
+        "results": results,
+        "generation_mode": generation_mode,
+        "prompt_version": prompt_registry.version,
+        "timings": timings
+    }
+
+
+@app.get("/cache/stats")
+def cache_stats(x_api_key: str = Header(None, alias="X-API-Key")):
+    """Answer cache hit/miss counters, plus the query embedding cache under ``embeddings``."""
+    validate_auth(x_api_key=x_api_key)
+    embeddings = {"enabled": True, **embedding_cache.stats()} if embedding_cache is not None else {"enabled": False}
+    if answer_cache is None:
+        return {"enabled": False, "embeddings": embeddings}
+    return {"enabled": True, **answer_cache.stats(), "embeddings": embeddings}
+
+
+@app.post("/generate_answers/stream")
+async def generate_answers_stream(
+    payload: dict,
+    x_api_key: str = Header(None, alias="X-API-Key")
+):
+    """
+    Streaming variant of /generate_answers/ using server-sent events.
+    args:
+        * payload: Same fields as /generate_answers/ (generation_mode is not used;
+          reasoning always streams after the answer it assesses).
+    events:
+        context -> answer tokens -> reasoning tokens -> done (or error)
+    """
+    validate_question_payload(payload)
+
+    # Information: Validate API key (supports both header and payload auth)
+    payload_auth = payload.get('user_auth', None)
+    validate_auth(x_api_key=x_api_key, payload_auth=payload_auth)
+    filters = validate_filters(payload)
+    params = validate_search_params(payload)
+
+    return StreamingResponse(
+        stream_answer_events(payload['user_question'], payload['user_model'], filters, params),
+        media_type="text/event-stream",
+        # Information: Stop proxies (e.g. Apache/nginx) from buffering the event stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
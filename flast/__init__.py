@@ -0,0 +1,3 @@
+"""
+Shared building blocks for the FLAST-AI v1-Weaviate API, UI and scripts.
+"""
@@ -0,0 +1,96 @@
+"""
+The Weaviate class the app reads from and writes to, switchable at runtime.
+
+``scripts/migrate_schema.py --switch`` writes the new class name to the class
+file (atomically). Processes watch that file the way prompt templates are
+watched (flast/prompts.py), so running API workers move to the new class
+within ``check_interval`` seconds, without a restart. Without the file, or
+with an invalid name in it, the default class is used.
+
+Classes created before a schema version lack newer properties (the legacy
+``AI_v1`` stores only ``data`` and ``case_name``) and Weaviate rejects a query
+for a field its class does not have. ``ClassProperties`` reads each class's
+property names once so queries only ask for what the class defines.
+"""
+
+import os
+import re
+from typing import Dict, FrozenSet, List, Sequence
+
+import httpx
+
+from flast.prompts import WatchedFile
+
+DEFAULT_CLASS = "AI_v1"
+DEFAULT_CLASS_FILE = "weaviate_class.txt"
+# Information: Weaviate class names; also keeps the name safe to splice into GraphQL
+CLASS_NAME = re.compile(r"^[A-Z][_0-9A-Za-z]*$")
+
+
+class ActiveClass:
+    """
+    Current class name from a watched file.
+
+    Args:
+        path: Class file holding one class name
+        default: Class used while the file is missing or invalid
+        check_interval: Minimum seconds between ``stat`` calls
+    """
+
+    def __init__(self, path: str = DEFAULT_CLASS_FILE, default: str = DEFAULT_CLASS, check_interval: float = 2.0):
+        self.default = default
+        self._file = WatchedFile(path, check_interval)
+
+    @property
+    def path(self) -> str:
+        return self._file.path
+
+    def get(self) -> str:
+        name = self._file.get().strip()
+        return name if CLASS_NAME.match(name) else self.default
+
+
+# Information: What every version of the class stores; assumed while the schema cannot be read
+LEGACY_PROPERTIES = frozenset({"data", "case_name"})
+
+
+class ClassProperties:
+    """Property names of each class, read once per class from ``GET /v1/schema/<class>``."""
+
+    def __init__(self):
+        self._known: Dict[str, FrozenSet[str]] = {}
+
+    async def get(self, http: httpx.AsyncClient, class_name: str) -> FrozenSet[str]:
+        """
+        Property names of ``class_name``; only successful reads are remembered.
+
+        Raises:
+            httpx.HTTPError: If the schema could not be read
+        """
+        known = self._known.get(class_name)
+        if known is None:
+            response = await http.get(f"/v1/schema/{class_name}")
+            response.raise_for_status()
+            known = frozenset(prop["name"] for prop in response.json().get("properties") or [])
+            self._known[class_name] = known
+        return known
+
+
+def select_properties(wanted: Sequence[str], available: FrozenSet[str]) -> List[str]:
+    """``wanted`` in order, without the properties the class does not define."""
+    return [name for name in wanted if name in available]
+
+
+def write_active_class(path: str, class_name: str):
+    """
+    Point every process watching ``path`` at ``class_name``.
+
+    Raises:
+        ValueError: If ``class_name`` is not a valid Weaviate class name
+    """
+    if not CLASS_NAME.match(class_name):
+        raise ValueError(f"Invalid class name: {class_name!r}")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(class_name + "\n")
+    os.replace(path + ".tmp", path)
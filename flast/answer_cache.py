@@ -0,0 +1,228 @@
+"""
+Semantic answer cache keyed on question embeddings.
+
+A cached ``(answer, context, reasoning, case_name)`` tuple is returned when a
+new question's embedding has cosine similarity >= ``threshold`` with a cached
+question in the same namespace. The namespace carries everything that changes
+the generated answer (chat model, prompt version, generation mode, embedding
+model), so a prompt edit or model switch never serves stale entries.
+
+Tiers:
+    memory: fixed-size LRU with TTL; lookups are one matrix-vector product
+    sqlite: optional on-disk tier that survives restarts and is shared by workers;
+            capped at ``max_rows`` (oldest pruned), so lookups stay bounded
+
+numpy is imported on first use so importing the API stays fast.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CachedAnswer = Tuple[str, str, str, str]
+
+
+def normalize(vector) -> np.ndarray:
+    """Return ``vector`` as a unit-length float32 array."""
+    import numpy as np
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+class SQLiteAnswerStore:
+    """On-disk tier of the answer cache, keeping at most the newest ``max_rows`` answers."""
+
+    def __init__(self, path: str, max_rows: int = 10000):
+        self.path = path
+        self.max_rows = max_rows
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    answer TEXT, context TEXT, reasoning TEXT, case_name TEXT,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS answers_namespace ON answers (namespace, expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Information: sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, vector: np.ndarray, namespace: str, threshold: float) -> Optional[CachedAnswer]:
+        """Return the most similar unexpired answer at or above ``threshold`` among the newest ``max_rows``."""
+        # Information: The LIMIT bounds the scan even while other workers insert between prunes
+        rows = self._connection().execute(
+            "SELECT vector, answer, context, reasoning, case_name FROM answers "
+            "WHERE namespace = ? AND expires_at > ? ORDER BY id DESC LIMIT ?",
+            (namespace, time.time(), self.max_rows),
+        ).fetchall()
+        rows = [row for row in rows if len(row[0]) == vector.nbytes]
+        if not rows:
+            return None
+        import numpy as np
+        matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        return tuple(rows[best][1:])
+
+    def put(self, vector: np.ndarray, namespace: str, value: CachedAnswer, expires_at: float):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM answers WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "INSERT INTO answers (namespace, vector, answer, context, reasoning, case_name, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (namespace, vector.tobytes(), *value, expires_at),
+            )
+            conn.execute(
+                "DELETE FROM answers WHERE id <= (SELECT id FROM answers ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows,),
+            )
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM answers")
+
+
+class AnswerCache:
+    """
+    In-process semantic LRU cache with TTL and an optional SQLite tier.
+
+    Args:
+        threshold: Minimum cosine similarity for a hit (0-1)
+        max_entries: Memory tier capacity; least recently used entries are evicted
+        ttl_seconds: Entry lifetime in both tiers
+        sqlite_path: Enables the on-disk tier when set
+        sqlite_max_entries: On-disk tier capacity; the oldest rows are pruned
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 1024,
+                 ttl_seconds: float = 86400, sqlite_path: Optional[str] = None,
+                 sqlite_max_entries: int = 10000):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk = SQLiteAnswerStore(sqlite_path, sqlite_max_entries) if sqlite_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # Information: One row per slot; allocated on first put once the embedding size is known
+        self._vectors: Optional[np.ndarray] = None
+        self._namespaces: List[Optional[str]] = [None] * max_entries
+        self._values: List[Optional[CachedAnswer]] = [None] * max_entries
+        self._expires: List[float] = [0.0] * max_entries
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._free = list(range(max_entries - 1, -1, -1))
+
+    def get(self, vector, namespace: str) -> Optional[CachedAnswer]:
+        """Return a cached answer for a question embedding, or None on a miss."""
+        query = normalize(vector)
+        with self._lock:
+            slot = self._best_slot(query, namespace)
+            if slot is not None:
+                self._lru.move_to_end(slot)
+                self.hits += 1
+                return self._values[slot]
+
+        if self.disk is not None:
+            value = self.disk.lookup(query, namespace, self.threshold)
+            if value is not None:
+                # Information: Promote disk hits so repeats are served from memory
+                self._put_memory(query, namespace, value, time.time() + self.ttl_seconds)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, vector, namespace: str, value: CachedAnswer):
+        """Store ``value`` for a question embedding in every tier."""
+        query = normalize(vector)
+        expires_at = time.time() + self.ttl_seconds
+        self._put_memory(query, namespace, value, expires_at)
+        if self.disk is not None:
+            self.disk.put(query, namespace, value, expires_at)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory tier size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self.disk.path if self.disk is not None else None,
+                "disk_max_entries": self.disk.max_rows if self.disk is not None else None,
+            }
+
+    def clear(self):
+        with self._lock:
+            for slot in list(self._lru):
+                self._release(slot)
+        if self.disk is not None:
+            self.disk.clear()
+
+    def _best_slot(self, query: np.ndarray, namespace: str) -> Optional[int]:
+        if self._vectors is None or not self._lru or self._vectors.shape[1] != query.shape[0]:
+            return None
+        now = time.time()
+        for slot in [s for s in self._lru if self._expires[s] <= now]:
+            self._release(slot)
+        slots = [s for s in self._lru if self._namespaces[s] == namespace]
+        if not slots:
+            return None
+        # Information: Score every slot in one product (no row copies), then pick among this namespace
+        scores = (self._vectors @ query)[slots]
+        best = int(scores.argmax())
+        return slots[best] if scores[best] >= self.threshold else None
+
+    def _put_memory(self, query: np.ndarray, namespace: str, value: CachedAnswer, expires_at: float):
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                import numpy as np
+                self._vectors = np.zeros((self.max_entries, query.shape[0]), dtype=np.float32)
+                for slot in list(self._lru):
+                    self._release(slot)
+            if not self._free:
+                self._release(next(iter(self._lru)))
+            slot = self._free.pop()
+            self._vectors[slot] = query
+            self._namespaces[slot] = namespace
+            self._values[slot] = value
+            self._expires[slot] = expires_at
+            self._lru[slot] = None
+
+    def _release(self, slot: int):
+        self._lru.pop(slot, None)
+        self._namespaces[slot] = None
+        self._values[slot] = None
+        self._free.append(slot)
@@ -0,0 +1,105 @@
+"""
+Deterministic chunk IDs and a local index of what is already in Weaviate.
+
+A chunk's UUID is derived from its content hash (case name, chunk index and
+text), so writing the same chunk twice overwrites one object instead of
+adding a duplicate. The SQLite index remembers the IDs written per case,
+which lets ingestion skip unchanged chunks before they are sent (and
+re-vectorized). Stale chunks of a re-ingested case are also looked up in
+Weaviate by case name (``flast.ingestion.stored_case_ids``), since the index
+cannot know about chunks written without it.
+
+The index only reflects writes made through it; after restoring or wiping
+the Weaviate class, delete the index file so every chunk is sent again.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+from typing import Iterable, List, Set, Tuple
+
+# Information: Fixed namespace so IDs are stable across machines and runs
+CHUNK_NAMESPACE = uuid.UUID("6f1c7f8e-2d4b-5a0e-9b6e-3c1a4f5d7e21")
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache_dir", "chunk_hashes.sqlite"
+)
+
+
+def content_hash(case_name: str, chunk_index: int, text: str) -> str:
+    return hashlib.sha256(f"{case_name}\0{chunk_index}\0{text}".encode("utf-8")).hexdigest()
+
+
+def chunk_uuid(case_name: str, chunk_index: int, text: str) -> str:
+    """Weaviate object ID for one chunk; identical content always maps to the same ID."""
+    return str(uuid.uuid5(CHUNK_NAMESPACE, content_hash(case_name, chunk_index, text)))
+
+
+class ChunkHashIndex:
+    """
+    IDs of chunks known to be stored in Weaviate, grouped by class and case.
+
+    Args:
+        path: SQLite file; created (with its directory) if missing
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunks (
+                    class_name TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    case_name TEXT NOT NULL,
+                    PRIMARY KEY (class_name, id)
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS chunks_case ON chunks (class_name, case_name)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Information: sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def case_ids(self, class_name: str, case_name: str) -> Set[str]:
+        rows = self._connection().execute(
+            "SELECT id FROM chunks WHERE class_name = ? AND case_name = ?", (class_name, case_name)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def diff(self, class_name: str, case_name: str, ids: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Return (ids not stored yet, stored ids of this case that are no longer present)."""
+        ids = set(ids)
+        stored = self.case_ids(class_name, case_name)
+        return ids - stored, stored - ids
+
+    def replace_case(self, class_name: str, case_name: str, ids: List[str]):
+        """Record ``ids`` as the complete set of chunks stored for a case."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM chunks WHERE class_name = ? AND case_name = ?", (class_name, case_name))
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunks (class_name, id, case_name) VALUES (?, ?, ?)",
+                [(class_name, chunk_id, case_name) for chunk_id in ids],
+            )
+
+    def add(self, class_name: str, case_name: str, ids: List[str]):
+        """Record ``ids`` as stored for a case, keeping what is already recorded."""
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunks (class_name, id, case_name) VALUES (?, ?, ?)",
+                [(class_name, chunk_id, case_name) for chunk_id in ids],
+            )
+
+    def clear(self, class_name: str = None):
+        with self._connection() as conn:
+            if class_name is None:
+                conn.execute("DELETE FROM chunks")
+            else:
+                conn.execute("DELETE FROM chunks WHERE class_name = ?", (class_name,))
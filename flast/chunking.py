@@ -0,0 +1,108 @@
+"""
+Paragraph-aware chunking with overlap.
+
+Judgments number their paragraphs ``[1]``, ``[2]``, ... Chunks end on a
+paragraph boundary whenever one fits the token budget, consecutive chunks
+share up to ``overlap_tokens`` tokens (whole trailing paragraphs when they
+fit), and a paragraph longer than the budget is split on token boundaries.
+
+Token positions come from one encoding pass (``TokenCounter.offsets``), so chunk
+text is a plain slice of the input: nothing is re-tokenized or decoded.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import List, Sequence, Tuple
+
+PARAGRAPH_MARKER = re.compile(r'\[(\d{1,4})\]')
+# Information: Paragraph numbers may skip a few (OCR loss); citation years like [2024] never continue the sequence
+MAX_PARAGRAPH_GAP = 3
+# Information: Cutting at a paragraph boundary must still fill this share of the budget, else split mid-paragraph
+MIN_FILL = 0.5
+
+Offsets = Sequence[Tuple[int, int]]
+
+
+@dataclass
+class Chunk:
+    """One chunk: a slice ``text[start:end]`` of the normalized document."""
+    text: str
+    start: int
+    end: int
+    tokens: int
+    paragraph_refs: List[str] = field(default_factory=list)
+
+
+def paragraph_starts(text: str) -> List[Tuple[int, str]]:
+    """(character offset, ``"[n]"``) of each paragraph marker, keeping only markers that continue the numbering."""
+    starts, last = [], 0
+    for match in PARAGRAPH_MARKER.finditer(text):
+        number = int(match.group(1))
+        if last < number <= last + MAX_PARAGRAPH_GAP:
+            starts.append((match.start(), match.group(0)))
+            last = number
+    return starts
+
+
+def chunk_document(text: str, offsets: Offsets, target_tokens: int,
+                   overlap_tokens: int = 0) -> List[Chunk]:
+    """
+    Split ``text`` into chunks of at most ``target_tokens`` tokens.
+
+    Args:
+        text: Normalized document text
+        offsets: ``(start, end)`` character span of every token of ``text``, in order
+        target_tokens: Maximum tokens per chunk
+        overlap_tokens: Tokens shared by consecutive chunks (must be < target_tokens)
+    """
+    if overlap_tokens >= target_tokens:
+        raise ValueError("overlap_tokens must be smaller than target_tokens")
+    count = len(offsets)
+    if not count:
+        return []
+
+    markers = paragraph_starts(text)
+    marker_chars = [position for position, _ in markers]
+    token_starts = [start for start, _ in offsets]
+    # Information: Token containing each paragraph marker (BPE merges the leading space into " ["); 0 is always a boundary
+    boundaries = sorted({0, *(bisect_right(token_starts, position) - 1 for position in marker_chars)})
+
+    chunks, start = [], 0
+    while start < count:
+        limit = min(start + target_tokens, count)
+        end = limit
+        if limit < count:
+            # Information: Last paragraph boundary that fits, else a hard split at the budget
+            i = bisect_right(boundaries, limit) - 1
+            if boundaries[i] >= start + max(1, int(target_tokens * MIN_FILL)):
+                end = boundaries[i]
+        chunks.append(_make_chunk(text, offsets, start, end, markers, marker_chars))
+        if end >= count:
+            break
+        start = _next_start(boundaries, start, end, overlap_tokens)
+    return chunks
+
+
+def _next_start(boundaries: List[int], start: int, end: int, overlap_tokens: int) -> int:
+    if not overlap_tokens:
+        return end
+    # Information: Prefer overlapping by whole paragraphs; fall back to a plain token overlap
+    i = bisect_left(boundaries, end - overlap_tokens)
+    if i < len(boundaries) and start < boundaries[i] < end:
+        return boundaries[i]
+    return end - overlap_tokens if end - overlap_tokens > start else end
+
+
+def _make_chunk(text: str, offsets: Offsets, start: int, end: int,
+                markers: List[Tuple[int, str]], marker_chars: List[int]) -> Chunk:
+    char_start, char_end = offsets[start][0], offsets[end - 1][1]
+    # Information: A boundary token starts with the space before "[n]"; chunks start at the marker itself
+    while char_start < char_end and text[char_start].isspace():
+        char_start += 1
+    # Information: The paragraph the chunk starts in, plus every paragraph that begins inside it
+    first = bisect_right(marker_chars, char_start) - 1
+    last = bisect_left(marker_chars, char_end)
+    refs = [ref for _, ref in markers[max(first, 0):last]]
+    return Chunk(text[char_start:char_end], char_start, char_end, end - start, refs)
+
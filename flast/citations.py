@@ -0,0 +1,124 @@
+"""
+Exact citation lookup ahead of hybrid search.
+
+A question that names a judgment by its citation (``[2024] FamCA 123``) is
+answered from that judgment's chunks. ``CitationIndex`` maps each citation
+to the ids of its chunks. ``route`` fetches those chunks with an ``id``
+filter, ranked by BM25 on the question, instead of running a vector search
+over the whole class.
+
+The index is rebuilt from Weaviate (``refresh``) by paging through
+``case_name`` and ``citation``. Citations are matched with the pattern
+``extract_metadata`` uses, so chunks stored before ``citation`` was
+populated are still found through their case name. Until the index is
+loaded for the active class, ``route`` filters on the ``citation`` property
+instead. Classes without ``citation`` (the legacy ``AI_v1``) are indexed from
+``case_name`` alone and, until then, go straight to hybrid search.
+"""
+
+import re
+import time
+from typing import AbstractSet, Dict, List, Optional, Sequence
+
+import httpx
+
+from flast.active_class import select_properties
+from flast.weaviate_graphql import filtered_search, graphql_string, iter_objects
+
+# Information: Medium neutral citation, e.g. [2024] FamCA 123 (flast/ingestion.extract_metadata)
+CITATION = re.compile(r'\[(\d{4})\]\s+([A-Z][a-zA-Z]+)\s+(\d+)')
+# Information: Questions may not keep the court abbreviation's case ("[2024] famca 123")
+QUESTION_CITATION = re.compile(CITATION.pattern, re.IGNORECASE)
+MAX_CITATIONS = 5
+INDEX_PROPERTIES = ("case_name", "citation")
+
+
+def find_citations(text: str, pattern: re.Pattern = QUESTION_CITATION) -> List[str]:
+    """Citations in ``text``, whitespace normalized, first occurrence order, at most MAX_CITATIONS."""
+    found = dict.fromkeys(f"[{year}] {court} {number}" for year, court, number in pattern.findall(text))
+    return list(found)[:MAX_CITATIONS]
+
+
+def citation_key(citation: str) -> str:
+    """Index key: citations match whatever the case of the court abbreviation."""
+    return citation.lower()
+
+
+def citation_where(citations: Sequence[str]) -> str:
+    """``where`` value matching chunks whose ``citation`` property is one of ``citations``."""
+    operands = [f'{{path: ["citation"], operator: Equal, valueText: {graphql_string(c)}}}' for c in citations]
+    return operands[0] if len(operands) == 1 else f"{{operator: Or, operands: [{', '.join(operands)}]}}"
+
+
+def ids_where(ids: Sequence[str]) -> str:
+    """``where`` value matching the objects with these ids (``ContainsAny`` needs Weaviate 1.21+)."""
+    return f'{{path: ["id"], operator: ContainsAny, valueText: [{", ".join(graphql_string(i) for i in ids)}]}}'
+
+
+class CitationIndex:
+    """In-memory citation -> chunk ids of one class, replaced as a whole on each ``refresh``."""
+
+    def __init__(self):
+        self.class_name: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self._ids: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def covers(self, class_name: str) -> bool:
+        """Whether the index was built from ``class_name`` (a class switch makes it stale)."""
+        return self.refreshed_at is not None and self.class_name == class_name
+
+    def lookup(self, citations: Sequence[str]) -> List[str]:
+        """Chunk ids of every known citation among ``citations``."""
+        return [chunk_id for c in citations for chunk_id in self._ids.get(citation_key(c), ())]
+
+    async def refresh(self, http: httpx.AsyncClient, class_name: str, page_size: int = 1000,
+                      available: Optional[AbstractSet[str]] = None) -> int:
+        """
+        Rebuild from every object of ``class_name``; returns the number of citations indexed.
+        ``available`` (the class's property names) leaves out ``citation`` when the class lacks it.
+        """
+        properties = select_properties(INDEX_PROPERTIES, available) if available is not None else list(INDEX_PROPERTIES)
+        ids: Dict[str, List[str]] = {}
+        async for page in iter_objects(http, class_name, properties, page_size, additional=("id",)):
+            for obj in page:
+                text = f"{obj.get('citation') or ''} {obj.get('case_name') or ''}"
+                for citation in find_citations(text, CITATION):
+                    ids.setdefault(citation_key(citation), []).append(obj["_additional"]["id"])
+        self._ids, self.class_name, self.refreshed_at = ids, class_name, time.time()
+        return len(ids)
+
+
+async def route(http: httpx.AsyncClient, class_name: str, question: str, index: CitationIndex,
+                properties: List[str], limit: int, additional: Sequence[str] = ("score",),
+                where: Optional[str] = None,
+                available: Optional[AbstractSet[str]] = None) -> Optional[List[dict]]:
+    """
+    Hits for a question that cites a judgment, or None to fall back to hybrid search.
+
+    Returns None when the question has no citation, when the loaded index does not
+    know any of its citations (no query is sent) or when nothing matched. ``where``
+    (e.g. from ``SearchFilters.where``) further restricts the chunks. ``available``
+    (the class's property names) avoids filtering or sorting on properties it lacks.
+    """
+    citations = find_citations(question)
+    if not citations:
+        return None
+    if index.covers(class_name):
+        ids = index.lookup(citations)
+        if not ids:
+            return None
+        condition = ids_where(ids)
+    elif available is not None and "citation" not in available:
+        return None
+    else:
+        condition = citation_where(citations)
+    if where:
+        condition = f"{{operator: And, operands: [{condition}, {where}]}}"
+    hits = await filtered_search(http, class_name, properties, condition, limit, question, additional)
+    if not hits and (available is None or "chunk_index" in available):
+        # Information: BM25 only returns chunks sharing a term with the question; take the judgment's opening chunks
+        hits = await filtered_search(http, class_name, properties, condition, limit, None, additional, sort="chunk_index")
+    return hits or None
@@ -0,0 +1,164 @@
+"""
+Shared, pooled backend clients for the API.
+
+One ``Backends`` instance per worker owns the Weaviate HTTP client and the
+OpenAI client. Both keep connections alive in a bounded pool, so requests
+stop paying TCP/TLS setup, and both have per-backend timeouts. Weaviate
+calls are retried on connection errors and gateway/overload responses with
+exponential backoff and full jitter; the OpenAI SDK applies its own jittered
+retries (``max_retries``). Every HTTP attempt gets a client span when tracing
+is on (flast/tracing.py).
+"""
+
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from flast.tracing import TracingTransport
+
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+@dataclass
+class BackendSettings:
+    """Connection pool, timeout and retry settings (seconds unless noted)."""
+    weaviate_url: str = "http://localhost:8080"
+    weaviate_connect_timeout: float = 5.0
+    weaviate_timeout: float = 30.0
+    weaviate_retries: int = 2
+    openai_api_key: Optional[str] = None
+    openai_timeout: float = 120.0
+    openai_max_retries: int = 2
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    retry_backoff: float = 0.25
+
+    @classmethod
+    def from_env(cls, weaviate_url: str) -> "BackendSettings":
+        return cls(
+            weaviate_url=weaviate_url,
+            weaviate_connect_timeout=float(os.getenv("WEAVIATE_CONNECT_TIMEOUT", "5")),
+            weaviate_timeout=float(os.getenv("WEAVIATE_TIMEOUT", "30")),
+            weaviate_retries=int(os.getenv("WEAVIATE_RETRIES", "2")),
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            openai_timeout=float(os.getenv("OPENAI_TIMEOUT", "120")),
+            openai_max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+            retry_backoff=float(os.getenv("HTTP_RETRY_BACKOFF", "0.25")),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 5.0) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Retry transport errors and retryable statuses with jittered backoff.
+
+    Only wrap backends whose requests are safe to repeat (Weaviate GraphQL
+    reads and readiness checks).
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, retries: int, backoff: float):
+        self._transport = transport
+        self.retries = retries
+        self.backoff = backoff
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(backoff_delay(attempt, self.backoff))
+        raise RuntimeError("unreachable")
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class Backends:
+    """
+    Lazily created, shared backend clients.
+
+    ``start()`` is called from the FastAPI lifespan so clients exist before
+    the first request; ``close()`` drains the pools on shutdown. Accessing a
+    client before ``start()`` creates it on demand.
+    """
+
+    def __init__(self, settings: BackendSettings):
+        self.settings = settings
+        self._weaviate_http: Optional[httpx.AsyncClient] = None
+        self._openai: Optional[AsyncOpenAI] = None
+
+    @property
+    def weaviate_http(self) -> httpx.AsyncClient:
+        if self._weaviate_http is None:
+            s = self.settings
+            self._weaviate_http = httpx.AsyncClient(
+                base_url=s.weaviate_url,
+                timeout=httpx.Timeout(s.weaviate_timeout, connect=s.weaviate_connect_timeout),
+                transport=RetryTransport(
+                    TracingTransport(httpx.AsyncHTTPTransport(limits=s.limits()), "weaviate"),
+                    s.weaviate_retries,
+                    s.retry_backoff,
+                ),
+            )
+        return self._weaviate_http
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        if self._openai is None:
+            s = self.settings
+            self._openai = AsyncOpenAI(
+                api_key=s.openai_api_key,
+                timeout=s.openai_timeout,
+                max_retries=s.openai_max_retries,
+                http_client=httpx.AsyncClient(
+                    timeout=s.openai_timeout,
+                    transport=TracingTransport(httpx.AsyncHTTPTransport(limits=s.limits()), "openai"),
+                ),
+            )
+        return self._openai
+
+    def install(self, weaviate_http: Optional[httpx.AsyncClient] = None, openai: Optional[AsyncOpenAI] = None):
+        """Use pre-built clients (e.g. benchmark stubs) instead of creating them."""
+        if weaviate_http is not None:
+            self._weaviate_http = weaviate_http
+        if openai is not None:
+            self._openai = openai
+
+    def start(self):
+        """Create both clients up front."""
+        self.weaviate_http
+        self.openai
+
+    async def close(self):
+        if self._weaviate_http is not None:
+            await self._weaviate_http.aclose()
+            self._weaviate_http = None
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
@@ -0,0 +1,147 @@
+"""
+Context assembly for the answer prompt.
+
+Turns the top-k Weaviate hits into one context string that fits a token
+budget: hits are grouped by case, duplicate chunks dropped, chunks with
+adjacent ``chunk_index`` merged into one passage, and passages packed
+greedily in score order.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+CountTokens = Callable[[str], int]
+
+
+@dataclass
+class Passage:
+    """One or more consecutive chunks of the same case."""
+    case_name: str
+    text: str
+    score: float
+    chunk_indexes: List[int] = field(default_factory=list)
+
+
+@dataclass
+class PackedContext:
+    """Result of packing passages into a token budget."""
+    text: str
+    passages: List[Passage]
+    tokens: int
+
+    @property
+    def case_names(self) -> List[str]:
+        """Distinct case names in the packed context, best first."""
+        return list(dict.fromkeys(p.case_name for p in self.passages))
+
+
+def hit_score(hit: dict) -> float:
+    """Hybrid score of a Weaviate hit (returned as a string)."""
+    try:
+        return float((hit.get('_additional') or {}).get('score') or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def join_overlapping(left: str, right: str, min_overlap: int = 16) -> str:
+    """Append ``right`` to ``left``, dropping the prefix of ``right`` that repeats the end of ``left``."""
+    # Information: Longest suffix of left that is a prefix of right, via the KMP prefix function
+    probe = right + "\0" + left[-len(right):]
+    prefix = [0] * len(probe)
+    for i in range(1, len(probe)):
+        k = prefix[i - 1]
+        while k and probe[i] != probe[k]:
+            k = prefix[k - 1]
+        if probe[i] == probe[k]:
+            k += 1
+        prefix[i] = k
+    overlap = prefix[-1]
+    if overlap and overlap >= min(min_overlap, len(right)):
+        return left + right[overlap:]
+    return left + " " + right
+
+
+def assemble_passages(hits: List[dict]) -> List[Passage]:
+    """
+    Group hits into passages ordered by best score.
+
+    Hits without ``chunk_index`` (legacy schema) become one passage each;
+    within a case, chunks sharing a ``chunk_index`` or identical text are
+    kept once, and runs of consecutive indexes are merged (text shared by
+    overlapping chunks appears once).
+    """
+    by_case = {}
+    for hit in hits:
+        by_case.setdefault(hit.get('case_name') or 'Unknown Case', []).append(hit)
+
+    passages = []
+    for case_name, case_hits in by_case.items():
+        seen_text, seen_index = set(), set()
+        unique = []
+        for hit in sorted(case_hits, key=hit_score, reverse=True):
+            text = (hit.get('data') or '').replace('\n', ' ').strip()
+            index = hit.get('chunk_index')
+            if not text or text in seen_text or (index is not None and index in seen_index):
+                continue
+            seen_text.add(text)
+            if index is not None:
+                seen_index.add(index)
+            unique.append((index, text, hit_score(hit)))
+
+        # Information: Merge runs of adjacent chunk indexes, in document order
+        indexed = sorted((u for u in unique if u[0] is not None), key=lambda u: u[0])
+        current: Optional[Passage] = None
+        for index, text, score in indexed:
+            if current is not None and index == current.chunk_indexes[-1] + 1:
+                current.text = join_overlapping(current.text, text)
+                current.score = max(current.score, score)
+                current.chunk_indexes.append(index)
+            else:
+                current = Passage(case_name, text, score, [index])
+                passages.append(current)
+        passages.extend(Passage(case_name, text, score) for index, text, score in unique if index is None)
+
+    passages.sort(key=lambda p: p.score, reverse=True)
+    return passages
+
+
+def truncate_to_budget(text: str, budget: int, count_tokens: CountTokens) -> str:
+    """Cut ``text`` on a word boundary so it fits ``budget`` tokens."""
+    tokens = count_tokens(text)
+    while tokens > budget and text:
+        # Information: Proportional cut, then re-count; converges in one or two passes
+        keep = max(1, int(len(text) * budget / tokens * 0.95))
+        text = text[:keep].rsplit(' ', 1)[0] if ' ' in text[:keep] else text[:keep]
+        tokens = count_tokens(text)
+    return text
+
+
+def pack_context(passages: List[Passage], token_budget: int, count_tokens: CountTokens,
+                 separator: str = "\n\n") -> PackedContext:
+    """
+    Greedily pack passages (already in priority order) into ``token_budget`` tokens.
+
+    Passages that do not fit are skipped so smaller, lower-ranked ones can
+    still be used. If even the best passage is too large it is truncated,
+    so the context is never empty when there are hits.
+    """
+    separator_tokens = count_tokens(separator)
+    packed, parts, used = [], [], 0
+    for passage in passages:
+        block = f"[{passage.case_name}] {passage.text}"
+        cost = count_tokens(block) + (separator_tokens if parts else 0)
+        if used + cost <= token_budget:
+            packed.append(passage)
+            parts.append(block)
+            used += cost
+        elif not parts:
+            block = truncate_to_budget(block, token_budget, count_tokens)
+            packed.append(passage)
+            parts.append(block)
+            used = count_tokens(block)
+    return PackedContext(separator.join(parts), packed, used)
+
+
+def build_context(hits: List[dict], token_budget: int, count_tokens: CountTokens) -> PackedContext:
+    """Assemble and pack Weaviate hits into a budgeted context."""
+    return pack_context(assemble_passages(hits), token_budget, count_tokens)
@@ -0,0 +1,192 @@
+"""
+Content-addressed cache of OpenAI embeddings.
+
+Vectors are stored as float32 blobs in SQLite keyed by ``(model, sha256(text))``
+and fronted by a small in-memory LRU for hot query vectors. Ingestion and the
+API look texts up here first and only send the misses (deduplicated, in
+batches) to the embedding API, then hand the vectors to Weaviate (batch
+``vector=``, hybrid ``vector:``) so Weaviate does not vectorize them again.
+
+Keying on the model name means switching models never serves a vector from
+the old one. The file can be shared by the API workers and ingestion runs.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache_dir", "embeddings.sqlite"
+)
+# Information: OpenAI accepts up to 2048 inputs per embeddings request
+EMBED_BATCH_SIZE = 256
+
+Vector = List[float]
+EmbedFn = Callable[[List[str]], List[Vector]]
+AsyncEmbedFn = Callable[[List[str]], Awaitable[List[Vector]]]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+
+def unpack_vector(blob: bytes) -> Vector:
+    values = array('f')
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def decode_embeddings(payload: dict) -> List[Vector]:
+    """
+    Vectors from a raw OpenAI embeddings response body, in input order.
+
+    Handles ``encoding_format="base64"`` (little-endian float32) and plain float
+    lists. Parsing the JSON directly skips the SDK's per-float model
+    validation, which costs more CPU than the request itself.
+    """
+    vectors = []
+    for item in sorted(payload["data"], key=lambda item: item["index"]):
+        embedding = item["embedding"]
+        vectors.append(unpack_vector(base64.b64decode(embedding)) if isinstance(embedding, str) else embedding)
+    return vectors
+
+
+class EmbeddingCache:
+    """
+    Embeddings by model and text hash.
+
+    Args:
+        path: SQLite file; created (with its directory) if missing
+        memory_entries: Vectors kept in the in-process LRU
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, memory_entries: int = 1024):
+        self.path = path
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[tuple, Vector]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID"""
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Information: sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[Vector]]:
+        """Cached vector for each text, or None where there is none."""
+        keys = [text_hash(text) for text in texts]
+        found: Dict[str, Vector] = {}
+        with self._memory_lock:
+            for key in keys:
+                vector = self._memory.get((model, key))
+                if vector is not None:
+                    self._memory.move_to_end((model, key))
+                    found[key] = vector
+        missing = list({key for key in keys if key not in found})
+        conn = self._connection()
+        # Information: Stay under SQLite's bound-parameter limit
+        for start in range(0, len(missing), 500):
+            part = missing[start:start + 500]
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(part))})",
+                [model, *part],
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = unpack_vector(blob)
+                self._remember(model, key, found[key])
+        vectors = [found.get(key) for key in keys]
+        hits = sum(vector is not None for vector in vectors)
+        self.hits += hits
+        self.misses += len(vectors) - hits
+        return vectors
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        rows = [(model, text_hash(text), pack_vector(vector)) for text, vector in zip(texts, vectors)]
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)", rows)
+        for (_, key, _), vector in zip(rows, vectors):
+            self._remember(model, key, list(vector))
+
+    def embed(self, model: str, texts: Sequence[str], embed_fn: EmbedFn,
+              batch_size: int = EMBED_BATCH_SIZE) -> List[Vector]:
+        """
+        Vectors for ``texts``, calling ``embed_fn`` only for texts not cached yet.
+
+        ``embed_fn`` takes a list of at most ``batch_size`` distinct texts and
+        returns their vectors in order; its errors propagate.
+        """
+        vectors = self.get_many(model, texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        computed: Dict[str, Vector] = {}
+        for start in range(0, len(missing), batch_size):
+            part = missing[start:start + batch_size]
+            part_vectors = embed_fn(part)
+            self.put_many(model, part, part_vectors)
+            computed.update(zip(part, part_vectors))
+        return [vector if vector is not None else computed[text] for text, vector in zip(texts, vectors)]
+
+    async def aembed(self, model: str, texts: Sequence[str], embed_fn: AsyncEmbedFn,
+                     batch_size: int = EMBED_BATCH_SIZE) -> List[Vector]:
+        """Async ``embed``: SQLite work runs in a thread, missing batches are embedded concurrently."""
+        vectors = await asyncio.to_thread(self.get_many, model, texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        parts = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+        computed: Dict[str, Vector] = {}
+        for part, part_vectors in zip(parts, await asyncio.gather(*(embed_fn(part) for part in parts))):
+            computed.update(zip(part, part_vectors))
+        if computed:
+            await asyncio.to_thread(self.put_many, model, list(computed), list(computed.values()))
+        return [vector if vector is not None else computed[text] for text, vector in zip(texts, vectors)]
+
+    def stats(self) -> dict:
+        conn = self._connection()
+        return {
+            "entries": conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0],
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self, model: str = None):
+        with self._connection() as conn:
+            if model is None:
+                conn.execute("DELETE FROM embeddings")
+            else:
+                conn.execute("DELETE FROM embeddings WHERE model = ?", (model,))
+        with self._memory_lock:
+            self._memory.clear()
+
+    def _remember(self, model: str, key: str, vector: Vector):
+        if not self.memory_entries:
+            return
+        with self._memory_lock:
+            self._memory[(model, key)] = vector
+            self._memory.move_to_end((model, key))
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,132 @@
+"""
+Metadata filters for retrieval.
+
+The answer endpoints accept an optional ``filters`` object. ``SearchFilters.parse``
+validates it; ``where`` renders it as a Weaviate ``where`` clause so the hybrid
+search only ranks matching chunks, and ``matches`` applies the same test to
+local index rows.
+
+    court, jurisdiction, citation   string or list of strings; a chunk matches any of them
+    legal_topics                    string or list of strings; a chunk matches if it has any of them
+    decision_date_from/_to          YYYY-MM-DD or RFC 3339, inclusive
+
+Values are compared exactly (the schema indexes these properties with
+``field`` tokenization).
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from flast.weaviate_graphql import graphql_string
+
+TEXT_FIELDS = ("court", "jurisdiction", "citation", "legal_topics")
+DATE_FIELDS = ("decision_date_from", "decision_date_to")
+MAX_VALUES = 50
+
+
+class FilterError(ValueError):
+    """Invalid ``filters`` payload."""
+
+
+def rfc3339(value: str) -> str:
+    """Normalize a date or datetime to the RFC 3339 UTC form Weaviate stores (``2024-03-12T00:00:00Z``)."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    court: Tuple[str, ...] = ()
+    jurisdiction: Tuple[str, ...] = ()
+    citation: Tuple[str, ...] = ()
+    legal_topics: Tuple[str, ...] = ()
+    decision_date_from: Optional[str] = None
+    decision_date_to: Optional[str] = None
+
+    @classmethod
+    def parse(cls, value) -> Optional["SearchFilters"]:
+        """
+        Validate a ``filters`` payload; None or an empty object means no filtering.
+
+        Raises:
+            FilterError: On unknown keys, wrong types, empty value lists or unparseable dates
+        """
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise FilterError("Parameter 'filters' should be an object.")
+        unknown = sorted(set(value) - set(TEXT_FIELDS) - set(DATE_FIELDS))
+        if unknown:
+            raise FilterError(f"Unknown filter(s): {', '.join(unknown)}. Allowed: {', '.join(TEXT_FIELDS + DATE_FIELDS)}.")
+        fields = {}
+        for name in TEXT_FIELDS:
+            values = value.get(name)
+            if values is None:
+                continue
+            values = [values] if isinstance(values, str) else values
+            # Information: An empty list would render an And/Or without operands, which Weaviate rejects
+            if (not isinstance(values, list) or not values or len(values) > MAX_VALUES
+                    or not all(isinstance(v, str) and v.strip() for v in values)):
+                raise FilterError(
+                    f"Filter '{name}' should be a non-empty string or a list of 1 to {MAX_VALUES} non-empty strings."
+                )
+            fields[name] = tuple(dict.fromkeys(v.strip() for v in values))
+        for name in DATE_FIELDS:
+            if value.get(name) is None:
+                continue
+            try:
+                fields[name] = rfc3339(str(value[name]))
+            except ValueError:
+                raise FilterError(f"Filter '{name}' should be a date (YYYY-MM-DD) or RFC 3339 timestamp.")
+        filters = cls(**fields)
+        if filters.decision_date_from and filters.decision_date_to and filters.decision_date_from > filters.decision_date_to:
+            raise FilterError("Filter 'decision_date_from' is after 'decision_date_to'.")
+        return filters if fields else None
+
+    def key(self) -> str:
+        """Stable text form, for cache namespaces."""
+        return json.dumps({name: getattr(self, name) for name in TEXT_FIELDS + DATE_FIELDS if getattr(self, name)},
+                          sort_keys=True)
+
+    def where(self) -> str:
+        """The filters as a GraphQL ``where`` argument value."""
+        operands = []
+        for name in TEXT_FIELDS:
+            values = [
+                f'{{path: ["{name}"], operator: Equal, valueText: {graphql_string(v)}}}' for v in getattr(self, name)
+            ]
+            if len(values) == 1:
+                operands.append(values[0])
+            elif values:
+                operands.append(f"{{operator: Or, operands: [{', '.join(values)}]}}")
+        for name, operator in (("decision_date_from", "GreaterThanEqual"), ("decision_date_to", "LessThanEqual")):
+            if getattr(self, name):
+                operands.append(f'{{path: ["decision_date"], operator: {operator}, valueDate: "{getattr(self, name)}"}}')
+        if len(operands) == 1:
+            return operands[0]
+        return f"{{operator: And, operands: [{', '.join(operands)}]}}"
+
+    def matches(self, properties: dict) -> bool:
+        """Whether a chunk with these properties passes, with the semantics of ``where``."""
+        for name in TEXT_FIELDS:
+            wanted = getattr(self, name)
+            if not wanted:
+                continue
+            value = properties.get(name)
+            values = value if isinstance(value, list) else [value]
+            if not any(v in wanted for v in values):
+                return False
+        if self.decision_date_from or self.decision_date_to:
+            try:
+                decided = rfc3339(properties.get("decision_date") or "")
+            except ValueError:
+                return False
+            if self.decision_date_from and decided < self.decision_date_from:
+                return False
+            if self.decision_date_to and decided > self.decision_date_to:
+                return False
+        return True
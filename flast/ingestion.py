@@ -0,0 +1,224 @@
+"""
+Cleaning, chunking and metadata extraction for judgment text files.
+
+Shared by the Streamlit upload page and ``scripts/ingest.py`` so both write
+identical chunks to Weaviate. Everything except ``stored_case_ids``,
+``delete_chunks`` and ``chunk_vectors`` is pure and picklable, so it can run
+inside a process pool.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Set, Tuple
+
+from flast.chunk_hashes import chunk_uuid
+from flast.chunking import Chunk, chunk_document
+from flast.citations import CITATION
+from flast.embedding_cache import EmbedFn, EmbeddingCache, Vector, decode_embeddings
+from flast.normalize import first_line, normalize_judgment
+from flast.tokens import counter_for_model
+
+# Information: Judgment exports carry a fixed-length cover sheet and a certification footer
+HEADER_LINES = 56
+FOOTER_MARKER = "I certify"
+DEFAULT_TOKEN_LIMIT = 500
+DEFAULT_OVERLAP_TOKENS = 50
+# Information: Chunks are sized in the embedding model's tokens (cl100k_base)
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Information: Cover sheet lines such as "DATE OF DELIVERY: 12 March 2024" or "Judgment date: 12/03/2024"
+DATE_LINE = re.compile(
+    r'^\s*(?:date of (?:delivery|judgment|decision|orders?|hearing)|judgment date|delivered)\s*:?\s*(.+)$',
+    re.IGNORECASE | re.MULTILINE,
+)
+DATE_FORMATS = ("%d %B %Y", "%d %b %Y", "%d/%m/%Y", "%Y-%m-%d", "%B %d, %Y")
+# Information: legal_topics values (schema/README.md), matched against the cover sheet (catchwords)
+LEGAL_TOPICS = {
+    "parenting": r"\bparenting\b|\bparental responsibility\b",
+    "property_settlement": r"\bproperty settlement\b|\bproperty adjustment\b|\bs\s?79\b",
+    "s60CC_factors": r"\bs\s?60CC\b|\bbest interests? of the child",
+    "relocation": r"\brelocat",
+    "child_support": r"\bchild support\b",
+    "spousal_maintenance": r"\bspousal maintenance\b|\bs\s?74\b",
+    "consent_orders": r"\bconsent orders?\b",
+    "contravention": r"\bcontravention\b",
+    "family_violence": r"\bfamily violence\b",
+    "interim_orders": r"\binterim (?:parenting |property )?(?:orders?|hearing)\b",
+}
+_TOPIC_PATTERNS = {topic: re.compile(pattern, re.IGNORECASE) for topic, pattern in LEGAL_TOPICS.items()}
+
+
+def parse_decision_date(header: str) -> Optional[str]:
+    """The first parseable date on a cover sheet date line, as RFC 3339 UTC midnight."""
+    for match in DATE_LINE.finditer(header):
+        value = re.sub(r'(\d)(st|nd|rd|th)\b', r'\1', match.group(1).strip().rstrip('.'))
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).strftime("%Y-%m-%dT00:00:00Z")
+            except ValueError:
+                continue
+    return None
+
+
+def extract_metadata(raw_text: str) -> dict:
+    """Extract case metadata from raw text."""
+    # Information: Extract case name from first line
+    case_name = first_line(raw_text) if raw_text else "Unknown Case"
+    header = "\n".join(raw_text.splitlines()[:HEADER_LINES])
+
+    # Information: Extract citation using regex (e.g., [2024] FamCA 123)
+    citation_match = CITATION.search(case_name)
+    citation = citation_match.group(0) if citation_match else ""
+
+    # Information: Extract court from citation
+    court = ""
+    if "FamCA" in case_name:
+        court = "Family Court of Australia"
+    elif "FCFCA" in case_name or "FedCFamC" in case_name:
+        court = "Federal Circuit and Family Court"
+    elif "FCCA" in case_name:
+        court = "Federal Circuit Court"
+
+    # Information: Extract jurisdiction (default to Federal for family law)
+    jurisdiction = "Federal"
+    for state in ["NSW", "VIC", "QLD", "SA", "WA", "TAS", "NT", "ACT"]:
+        if state in case_name:
+            jurisdiction = state
+            break
+
+    # Information: Decision date from the cover sheet, else Jan 1 of the citation year; RFC 3339 as the schema's date type requires
+    decision_date = parse_decision_date(header) or ""
+    if not decision_date and citation_match:
+        decision_date = f"{citation_match.group(1)}-01-01T00:00:00Z"
+
+    legal_topics = [topic for topic, pattern in _TOPIC_PATTERNS.items() if pattern.search(header)]
+
+    return {
+        "case_name": case_name,
+        "citation": citation,
+        "court": court,
+        "jurisdiction": jurisdiction,
+        "decision_date": decision_date,
+        "legal_topics": legal_topics,
+    }
+
+
+def chunk_text(text: str, token_limit: int = DEFAULT_TOKEN_LIMIT,
+               overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> List[Chunk]:
+    """Split ``text`` on paragraph boundaries into chunks of at most ``token_limit`` embedding-model tokens."""
+    return chunk_document(text, counter_for_model(EMBEDDING_MODEL).offsets(text), token_limit, overlap_tokens)
+
+
+def prepare_document(raw_text: str, token_limit: int = DEFAULT_TOKEN_LIMIT,
+                     overlap_tokens: int = DEFAULT_OVERLAP_TOKENS, source_uri: str = "") -> Tuple[dict, List[Chunk]]:
+    """
+    Turn one raw judgment into (metadata, chunks).
+
+    Args:
+        raw_text: Full file contents; the first line is the case name
+        token_limit: Maximum embedding-model tokens per chunk
+        overlap_tokens: Tokens shared by consecutive chunks
+        source_uri: Where the file came from (URL or path), stored with every chunk
+    """
+    metadata = extract_metadata(raw_text)
+    metadata["source_uri"] = source_uri
+    metadata["ingestion_date"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    text = normalize_judgment(raw_text, HEADER_LINES, FOOTER_MARKER)
+    return metadata, chunk_text(text, token_limit, overlap_tokens)
+
+
+def chunk_properties(metadata: dict, chunks: List[Chunk]) -> List[dict]:
+    """Weaviate properties for each chunk of one document."""
+    # Information: Every chunk carries the document metadata so retrieval can filter on it; empty values stay unset
+    shared = {
+        name: metadata[name]
+        for name in ("citation", "court", "jurisdiction", "decision_date", "legal_topics", "source_uri", "ingestion_date")
+        if metadata.get(name)
+    }
+    return [
+        {
+            "case_name": metadata["case_name"],
+            **shared,
+            "data": chunk.text,
+            "paragraph_refs": chunk.paragraph_refs,
+            "chunk_index": i,
+            "total_chunks": len(chunks),
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def chunk_objects(metadata: dict, chunks: List[Chunk]) -> List[Tuple[str, dict]]:
+    """(content-hash UUID, properties) for each chunk of one document."""
+    return [
+        (chunk_uuid(properties["case_name"], properties["chunk_index"], properties["data"]), properties)
+        for properties in chunk_properties(metadata, chunks)
+    ]
+
+
+def vectorization_text(properties: dict) -> str:
+    """The text the schema's text2vec-openai module embeds for a chunk: its non-skipped properties, by name."""
+    return f"{properties['case_name']} {properties['data']}"
+
+
+def openai_embedder(client, model: str = EMBEDDING_MODEL) -> EmbedFn:
+    """Embedding function over a sync ``openai.OpenAI`` client, for ``EmbeddingCache.embed``."""
+    def embed(texts: List[str]) -> List[Vector]:
+        response = client.embeddings.with_raw_response.create(model=model, input=texts, encoding_format="base64")
+        return decode_embeddings(json.loads(response.text))
+    return embed
+
+
+def chunk_vectors(cache: EmbeddingCache, embed_fn: EmbedFn, objects: List[Tuple[str, dict]]) -> List[Vector]:
+    """
+    Vector for each chunk object, from the cache or ``embed_fn`` for chunks never embedded before.
+
+    Pass them to the batch as ``vector=`` so Weaviate stores them instead of calling OpenAI again.
+    """
+    return cache.embed(EMBEDDING_MODEL, [vectorization_text(properties) for _, properties in objects], embed_fn)
+
+
+# Information: Upper bound on the objects one case lookup returns (Weaviate's default QUERY_MAXIMUM_RESULTS)
+MAX_CASE_OBJECTS = 10000
+
+
+def stored_case_ids(client, class_name: str, case_name: str) -> Set[str]:
+    """
+    IDs of every object stored for ``case_name`` with a weaviate-client v3 ``client``, whoever wrote
+    them (older random-UUID chunks, other machines, runs with another hash index).
+
+    ``case_name`` is word-tokenized, so ``Equal`` also matches names sharing its words; those objects
+    are dropped by comparing the stored name exactly.
+    """
+    result = (
+        client.query.get(class_name, ["case_name"])
+        .with_where({"path": ["case_name"], "operator": "Equal", "valueText": case_name})
+        .with_additional(["id"])
+        .with_limit(MAX_CASE_OBJECTS)
+        .do()
+    )
+    if result.get("errors"):
+        raise RuntimeError(result["errors"][0].get("message", str(result["errors"][0])))
+    objects = ((result.get("data") or {}).get("Get") or {}).get(class_name) or []
+    return {obj["_additional"]["id"] for obj in objects if obj.get("case_name") == case_name}
+
+
+def delete_chunks(client, class_name: str, ids: Iterable[str]) -> Set[str]:
+    """
+    Delete chunk objects by ID with a weaviate-client v3 ``client``.
+
+    Returns:
+        The IDs that are gone afterwards (deleted now or already missing)
+    """
+    deleted = set()
+    for chunk_id in ids:
+        try:
+            client.data_object.delete(uuid=chunk_id, class_name=class_name)
+        except Exception as e:
+            # Information: 404 means someone else removed it, which is the state we want
+            if getattr(e, "status_code", None) != 404:
+                print(f"Could not delete stale chunk {chunk_id}: {e}")
+                continue
+        deleted.add(chunk_id)
+    return deleted
@@ -0,0 +1,247 @@
+"""
+In-process retrieval over an export of the AI_v1 class.
+
+A local index is a vector store directory (flast/vector_store.py) written by
+``scripts/build_local_index.py`` -- chunk text as ``data``, the remaining
+properties and the Weaviate ``id`` per row -- plus two files built from it:
+
+    ann.npz      vector norms and, for large corpora, an IVF index: spherical
+                 k-means centroids and the rows of each list
+    terms.json   BM25 statistics (document count, average length, document
+                 frequency per term)
+
+Vectors stay memory-mapped, so opening an index reads only the index lines
+and these two files. ``search`` mirrors ``hybrid_search``: vector candidates
+(a brute-force scan below IVF_MIN_ROWS rows, otherwise the ``nprobe`` nearest
+IVF lists) are re-scored with BM25 on their text and fused like Weaviate's
+relative score fusion, ``alpha * vector + (1 - alpha) * keyword`` over
+min-max scaled scores. Keyword matches outside the vector candidates are not
+found, so results approximate Weaviate's hybrid search rather than equal it.
+Metadata filters (flast/filters.py) are applied to the vector candidates.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from flast.filters import SearchFilters
+from flast.rerank import min_max
+from flast.vector_store import VectorStore
+
+ANN_FILE = "ann.npz"
+TERMS_FILE = "terms.json"
+
+# Information: Below this many rows a full scan is exact and about as fast as probing IVF lists
+IVF_MIN_ROWS = 20000
+DEFAULT_NPROBE = 16
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+# Information: Vector candidates re-scored with BM25 before fusion (at least, or 20x the limit)
+MIN_CANDIDATES = 100
+# Information: Filters are applied to the candidates, so filtered searches start from more of them
+FILTER_CANDIDATE_FACTOR = 10
+# Information: Weaviate's hybrid and BM25 defaults
+DEFAULT_ALPHA = 0.75
+BM25_K1 = 1.2
+BM25_B = 0.75
+SCAN_BLOCK_ROWS = 8192
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, as Weaviate's ``word`` tokenization splits them."""
+    return _WORD.findall(text.lower())
+
+
+def _safe(norms: np.ndarray) -> np.ndarray:
+    return np.where(norms > 0, norms, 1.0).astype(np.float32)
+
+
+def train_centroids(vectors: np.ndarray, norms: np.ndarray, nlist: int, rng: np.random.Generator,
+                    iterations: int = KMEANS_ITERATIONS) -> np.ndarray:
+    """Spherical k-means on a sample of unit-length rows; returns ``(nlist, dim)`` unit centroids."""
+    size = min(len(norms), nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = np.sort(rng.choice(len(norms), size=size, replace=False))
+    data = np.asarray(vectors[sample], dtype=np.float32) / _safe(norms[sample])[:, None]
+    centroids = data[rng.choice(size, size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(nlist + 1))
+        filled = np.flatnonzero(bounds[1:] > bounds[:-1])
+        # Information: Empty lists have zero length, so reducing over the filled starts alone sums each list
+        centroids[filled] = np.add.reduceat(data[order], bounds[filled], axis=0)
+        empty = np.setdiff1d(np.arange(nlist), filled)
+        centroids[empty] = data[rng.choice(size, size=len(empty), replace=False)]
+        centroids /= _safe(np.linalg.norm(centroids, axis=1))[:, None]
+    return centroids
+
+
+def build(directory: str, nlist: Optional[int] = None, seed: int = 0) -> dict:
+    """
+    Build ``ann.npz`` and ``terms.json`` for the vector store in ``directory``.
+
+    Args:
+        nlist: IVF lists; ``None`` picks ``sqrt(rows)`` at IVF_MIN_ROWS rows or more, 0 means brute force only
+
+    Returns:
+        dict: ``rows``, ``nlist`` and ``terms``
+    """
+    store = VectorStore(directory)
+    vectors = store.vectors()
+    rows = len(store)
+    norms = np.empty(rows, dtype=np.float32)
+    for start in range(0, rows, SCAN_BLOCK_ROWS):
+        norms[start:start + SCAN_BLOCK_ROWS] = np.linalg.norm(vectors[start:start + SCAN_BLOCK_ROWS], axis=1)
+
+    if nlist is None:
+        nlist = int(math.sqrt(rows)) if rows >= IVF_MIN_ROWS else 0
+    nlist = min(nlist, rows)
+    arrays = {"norms": norms}
+    if nlist:
+        centroids = train_centroids(vectors, norms, nlist, np.random.default_rng(seed))
+        assignments = np.empty(rows, dtype=np.int32)
+        for start in range(0, rows, SCAN_BLOCK_ROWS):
+            block = vectors[start:start + SCAN_BLOCK_ROWS] / _safe(norms[start:start + SCAN_BLOCK_ROWS])[:, None]
+            assignments[start:start + SCAN_BLOCK_ROWS] = np.argmax(block @ centroids.T, axis=1)
+        list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        arrays.update(
+            centroids=centroids,
+            list_rows=list_rows,
+            list_offsets=np.searchsorted(assignments[list_rows], np.arange(nlist + 1)),
+        )
+    path = os.path.join(directory, ANN_FILE)
+    with open(path + ".tmp", 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(path + ".tmp", path)
+
+    document_frequency, total_length = Counter(), 0
+    for entry in store:
+        terms = tokenize(entry["text"])
+        total_length += len(terms)
+        document_frequency.update(set(terms))
+    path = os.path.join(directory, TERMS_FILE)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({"documents": rows, "average_length": total_length / max(rows, 1),
+                   "document_frequency": document_frequency}, f)
+    os.replace(path + ".tmp", path)
+    return {"rows": rows, "nlist": nlist, "terms": len(document_frequency)}
+
+
+class LocalIndex:
+    """
+    Read-only hybrid search over a built local index.
+
+    Args:
+        directory: Directory written by ``scripts/build_local_index.py``
+        nprobe: IVF lists scanned per query
+        exact: Scan every vector even when an IVF index exists
+
+    Raises:
+        FileNotFoundError: If the index has not been built
+        ValueError: If rows were appended after the last build
+    """
+
+    def __init__(self, directory: str, nprobe: int = DEFAULT_NPROBE, exact: bool = False):
+        self.store = VectorStore(directory)
+        self.vectors = self.store.vectors()
+        with np.load(os.path.join(directory, ANN_FILE)) as ann:
+            arrays = {name: ann[name] for name in ann.files}
+        with open(os.path.join(directory, TERMS_FILE), 'r', encoding='utf-8') as f:
+            terms = json.load(f)
+        if len(arrays["norms"]) != len(self.store) or terms["documents"] != len(self.store):
+            raise ValueError(f"{directory} changed since it was built; run scripts/build_local_index.py --skip-export")
+        self.norms = _safe(arrays["norms"])
+        self.centroids = None if exact else arrays.get("centroids")
+        self.list_rows = arrays.get("list_rows")
+        self.list_offsets = arrays.get("list_offsets")
+        self.nprobe = nprobe
+        self.documents = terms["documents"]
+        self.average_length = terms["average_length"] or 1.0
+        self.document_frequency = terms["document_frequency"]
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @property
+    def kind(self) -> str:
+        return "flat" if self.centroids is None else f"ivf{len(self.centroids)}"
+
+    def vector_candidates(self, vector: Sequence[float], count: int):
+        """``(rows, cosine similarities)`` of the ``count`` nearest rows found, best first."""
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        if self.centroids is None:
+            rows = None
+            similarities = (self.vectors @ query) / self.norms
+        else:
+            lists = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            # Information: Sorted rows turn the gather from the memory map into a forward scan
+            rows = np.sort(np.concatenate([
+                self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists
+            ]))
+            similarities = (self.vectors[rows] @ query) / self.norms[rows]
+        count = min(count, len(similarities))
+        if count == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        best = np.argpartition(-similarities, count - 1)[:count]
+        best = best[np.argsort(-similarities[best], kind="stable")]
+        return (best if rows is None else rows[best]), similarities[best]
+
+    def keyword_scores(self, query: str, texts: Sequence[str]) -> np.ndarray:
+        """BM25 of ``query`` against each text, with corpus-wide term statistics."""
+        weights = {}
+        for term in set(tokenize(query)):
+            frequency = self.document_frequency.get(term, 0)
+            weights[term] = math.log(1 + (self.documents - frequency + 0.5) / (frequency + 0.5))
+        scores = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            terms = tokenize(text)
+            counts = Counter(terms)
+            length_norm = BM25_K1 * (1 - BM25_B + BM25_B * len(terms) / self.average_length)
+            scores[i] = sum(
+                weight * counts[term] * (BM25_K1 + 1) / (counts[term] + length_norm)
+                for term, weight in weights.items() if counts[term]
+            )
+        return scores
+
+    def search(self, query: str, vector: Sequence[float], properties: List[str], limit: int = 5,
+               additional: Sequence[str] = ("score",), alpha: float = DEFAULT_ALPHA,
+               filters: Optional[SearchFilters] = None) -> List[dict]:
+        """
+        Hybrid hits shaped like ``hybrid_search`` results: the requested properties plus
+        ``_additional`` (``score`` as a string, ``vector`` and ``id`` when requested).
+        With ``filters``, only candidates that match them are ranked.
+        """
+        count = max(MIN_CANDIDATES, 20 * limit)
+        rows, similarities = self.vector_candidates(vector, count * FILTER_CANDIDATE_FACTOR if filters else count)
+        if filters is not None:
+            keep = np.array([filters.matches(self.store.properties(row)) for row in rows.tolist()], dtype=bool)
+            rows, similarities = rows[keep][:count], similarities[keep][:count]
+        if len(rows) == 0:
+            return []
+        entries = self.store.entries(rows.tolist())
+        keyword = self.keyword_scores(query, [entry["text"] for entry in entries])
+        fused = alpha * min_max(similarities.astype(np.float64)) + (1 - alpha) * min_max(keyword)
+
+        hits = []
+        for position in np.argsort(-fused, kind="stable")[:limit]:
+            entry = entries[position]
+            values = {**entry["properties"], "data": entry["text"], "case_name": entry["case_name"]}
+            hit = {name: values.get(name) for name in properties}
+            extra = {}
+            if "score" in additional:
+                extra["score"] = str(float(fused[position]))
+            if "vector" in additional:
+                extra["vector"] = self.vectors[rows[position]].tolist()
+            if "id" in additional:
+                extra["id"] = values.get("id")
+            hit["_additional"] = extra
+            hits.append(hit)
+        return hits
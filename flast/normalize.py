@@ -0,0 +1,79 @@
+"""
+Fast text normalization for judgments, shared by the text and PDF paths.
+
+Replaces the chains of ``re.sub`` passes (and ``splitlines``/``join``
+round-trips) that used to copy multi-megabyte judgments five or six times.
+Patterns are compiled once, the rarely present ``(cid:N)`` pattern is only
+run when the text contains one, and literal deletions use ``str.replace``
+(much faster than regex or ``str.translate`` on large strings). Output is
+byte-identical to the old chains, so chunk content hashes (and therefore
+chunk IDs) do not change; see ``scripts/benchmark_normalize.py``.
+"""
+
+import re
+
+CID_PATTERN = re.compile(r'\(cid:[0-9]+\)')
+# Information: Exactly the line boundaries str.splitlines() recognises
+LINE_BREAK = re.compile(r'\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+# Information: Old text chain removed every '.', and joined lines with '\n' that it then removed
+_TEXT_DELETE = ('.', '\n', '\r', '\x0b', '\x0c', '\x1c', '\x1d', '\x1e', '\x85', '\u2028', '\u2029')
+# Information: Only runs that actually change; single spaces and newlines are left alone
+_SPACE_RUN = re.compile(r' {2,}')
+_NEWLINE_RUN = re.compile(r'\n{2,}')
+
+
+def remove_cid(text: str) -> str:
+    """Drop ``(cid:N)`` glyph placeholders left by PDF-to-text conversion."""
+    return CID_PATTERN.sub('', text) if '(cid:' in text else text
+
+
+def first_line(text: str) -> str:
+    """Same as ``text.splitlines()[0]`` (empty string for empty text) without splitting the whole text."""
+    match = LINE_BREAK.search(text)
+    return text[:match.start()] if match else text
+
+
+def skip_lines(text: str, count: int) -> str:
+    """Same as ``"\\n".join(text.splitlines()[count:])`` up to line-boundary characters, which are kept as is."""
+    position = 0
+    for _ in range(count):
+        match = LINE_BREAK.search(text, position)
+        if match is None:
+            return ''
+        position = match.end()
+    return text[position:]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse text into one line: drop ``(cid:N)``, periods and line breaks,
+    collapse all other whitespace runs to one space and strip.
+    """
+    text = remove_cid(text)
+    for char in _TEXT_DELETE:
+        if char in text:
+            text = text.replace(char, '')
+    # Information: split()/join() collapses the same (Unicode) whitespace as \\s+ and also strips
+    return ' '.join(text.split())
+
+
+def normalize_judgment(raw_text: str, header_lines: int, footer_marker: str) -> str:
+    """
+    Body of a judgment export as one clean line.
+
+    Skips ``header_lines`` lines, cuts at the first ``footer_marker`` and
+    normalizes what is left with ``normalize_text``.
+    """
+    body = skip_lines(raw_text, header_lines)
+    end = body.find(footer_marker)
+    return normalize_text(body if end < 0 else body[:end])
+
+
+def normalize_pdf_text(text: str) -> str:
+    """
+    Clean extracted PDF text but keep its line structure: drop ``(cid:N)``,
+    collapse space runs, remove spaces before newlines, collapse blank lines
+    and strip.
+    """
+    text = _SPACE_RUN.sub(' ', remove_cid(text)).replace(' \n', '\n')
+    return _NEWLINE_RUN.sub('\n', text).strip()
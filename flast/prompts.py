@@ -0,0 +1,104 @@
+"""
+Prompt template registry with change detection.
+
+Templates are read once at startup and re-read only when a file's mtime or
+size changes. Change checks are throttled to one ``stat`` per file every
+``check_interval`` seconds, so the request path does no file I/O at all in
+the steady state. Every load is versioned with a content hash that caches
+and benchmarks can key on.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class WatchedFile:
+    """
+    A text file cached in memory and reloaded when it changes on disk.
+
+    Args:
+        path: File to watch
+        check_interval: Minimum seconds between ``stat`` calls
+    """
+
+    def __init__(self, path: str, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.text = ""
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Re-read the file if its mtime/size changed; return True when the contents were reloaded."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                # Information: Keep serving the last good text if the file is replaced non-atomically
+                return False
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.text = f.read()
+            self._signature = signature
+            return True
+
+    def get(self) -> str:
+        """Return the current text, checking for changes at most once per ``check_interval``."""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self.text
+
+
+class PromptRegistry:
+    """
+    Named prompt templates loaded from a folder.
+
+    Args:
+        folder: Directory holding the template files
+        files: Mapping of prompt name to file name (e.g. ``{"answer": "prompt.txt"}``)
+        check_interval: Minimum seconds between change checks per file
+    """
+
+    def __init__(self, folder: str, files: Dict[str, str], check_interval: float = 2.0):
+        self.folder = folder
+        self._files = {
+            name: WatchedFile(os.path.join(folder, file_name), check_interval)
+            for name, file_name in files.items()
+        }
+        self._version_key: Optional[Tuple[str, ...]] = None
+        self._version = ""
+
+    def get(self, name: str) -> str:
+        """Return the current text of prompt ``name``."""
+        return self._files[name].get()
+
+    def snapshot(self) -> Tuple[Dict[str, str], str]:
+        """Return (prompts by name, version) read consistently for one request."""
+        prompts = {name: watched.get() for name, watched in self._files.items()}
+        return prompts, self._version_for(prompts)
+
+    @property
+    def version(self) -> str:
+        """Short content hash of all templates."""
+        return self.snapshot()[1]
+
+    def reload(self) -> bool:
+        """Force a change check on every file; return True if anything changed."""
+        changed = [watched.reload() for watched in self._files.values()]
+        return any(changed)
+
+    def _version_for(self, prompts: Dict[str, str]) -> str:
+        key = tuple(prompts[name] for name in sorted(prompts))
+        # Information: Hash only when the text changed, not on every request
+        if key != self._version_key:
+            self._version = hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()[:12]
+            self._version_key = key
+        return self._version
@@ -0,0 +1,137 @@
+"""
+Local re-ranking of Weaviate candidates.
+
+Weaviate returns the top-N hybrid hits with their stored vectors; ``rerank``
+scores all of them against the query vector in one matrix-vector product
+and fuses four signals into the final order:
+
+    vector    cosine similarity to the query (min-max scaled over the candidates)
+    keyword   Weaviate's hybrid/BM25 ``score`` (min-max scaled)
+    recency   exponential decay of ``decision_date`` with a configurable half-life
+    court     weight of the deciding court (appellate courts rank higher)
+
+Each signal is in [0, 1]; the fused score is their weighted sum and replaces
+``_additional.score`` so context packing follows the new order (the original
+is kept as ``_additional.hybrid_score``).
+
+numpy is imported on first use so importing the API stays fast.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Information: Court names as written by flast/ingestion.extract_metadata; unknown courts get DEFAULT_COURT_WEIGHT
+COURT_WEIGHTS: Dict[str, float] = {
+    "Federal Circuit and Family Court": 1.0,
+    "Family Court of Australia": 0.9,
+    "Federal Circuit Court": 0.6,
+}
+DEFAULT_COURT_WEIGHT = 0.5
+# Information: Hits without a usable decision_date are treated as neither old nor new
+UNDATED_RECENCY = 0.5
+
+# Information: Properties and _additional fields the candidates must carry
+RERANK_PROPERTIES = ["court", "decision_date"]
+RERANK_ADDITIONAL = ["score", "vector"]
+
+
+@dataclass(frozen=True)
+class RerankWeights:
+    """Signal weights and the recency half-life."""
+    vector: float = 0.55
+    keyword: float = 0.25
+    recency: float = 0.1
+    court: float = 0.1
+    half_life_years: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "RerankWeights":
+        defaults = cls()
+        return cls(
+            vector=float(os.getenv("RERANK_WEIGHT_VECTOR", defaults.vector)),
+            keyword=float(os.getenv("RERANK_WEIGHT_KEYWORD", defaults.keyword)),
+            recency=float(os.getenv("RERANK_WEIGHT_RECENCY", defaults.recency)),
+            court=float(os.getenv("RERANK_WEIGHT_COURT", defaults.court)),
+            half_life_years=float(os.getenv("RERANK_HALF_LIFE_YEARS", defaults.half_life_years)),
+        )
+
+
+def min_max(values: np.ndarray) -> np.ndarray:
+    """Scale to [0, 1]; a constant signal becomes all ones so it neither helps nor hurts."""
+    import numpy as np
+    low, high = values.min(), values.max()
+    if high - low <= 1e-12:
+        return np.ones_like(values)
+    return (values - low) / (high - low)
+
+
+def cosine_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row of ``matrix`` with ``query`` in one product."""
+    import numpy as np
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+    return (matrix @ query) / np.where(norms > 0, norms, 1.0)
+
+
+def recency_scores(dates: Sequence[Optional[str]], half_life_years: float, today: Optional[date] = None) -> np.ndarray:
+    """``0.5 ** (age / half_life)`` per decision date (``YYYY-MM-DD`` or RFC 3339); undated hits get UNDATED_RECENCY."""
+    import numpy as np
+    days = np.array([(value or "")[:10] or "NaT" for value in dates], dtype="datetime64[D]")
+    age_years = (np.datetime64(today or date.today(), "D") - days).astype(np.float64) / 365.25
+    scores = np.exp2(-np.clip(age_years, 0.0, None) / half_life_years)
+    return np.where(np.isnat(days), UNDATED_RECENCY, scores)
+
+
+def _vector_matrix(hits: List[dict], dim: int) -> np.ndarray:
+    import numpy as np
+    vectors = [(hit.get("_additional") or {}).get("vector") for hit in hits]
+    if all(vectors):
+        return np.array(vectors, dtype=np.float32)
+    matrix = np.zeros((len(hits), dim), dtype=np.float32)
+    for row, vector in enumerate(vectors):
+        if vector:
+            matrix[row] = vector
+    return matrix
+
+
+def _keyword_score(hit: dict) -> float:
+    try:
+        return float((hit.get("_additional") or {}).get("score") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rerank(hits: List[dict], query_vector: Sequence[float], weights: RerankWeights = RerankWeights(),
+           today: Optional[date] = None) -> List[dict]:
+    """
+    Return ``hits`` in fused-score order, best first.
+
+    Hits without ``_additional.vector`` score zero on the vector signal.
+    Every returned hit is a copy with ``_additional.score`` set to the fused
+    score and the Weaviate score kept as ``_additional.hybrid_score``.
+    """
+    import numpy as np
+    if not hits:
+        return []
+    query = np.asarray(query_vector, dtype=np.float32)
+    vector = min_max(cosine_scores(_vector_matrix(hits, len(query)), query))
+    keyword = min_max(np.array([_keyword_score(hit) for hit in hits], dtype=np.float64))
+    recency = recency_scores([hit.get("decision_date") for hit in hits], weights.half_life_years, today)
+    court = np.array([COURT_WEIGHTS.get(hit.get("court") or "", DEFAULT_COURT_WEIGHT) for hit in hits])
+    fused = weights.vector * vector + weights.keyword * keyword + weights.recency * recency + weights.court * court
+
+    ranked = []
+    for row in np.argsort(-fused, kind="stable"):
+        hit = dict(hits[row])
+        additional = dict(hit.get("_additional") or {})
+        additional["hybrid_score"] = additional.get("score")
+        additional["score"] = float(fused[row])
+        hit["_additional"] = additional
+        ranked.append(hit)
+    return ranked
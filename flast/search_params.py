@@ -0,0 +1,100 @@
+"""
+Hybrid search parameters, per request or deployment-wide.
+
+The answer endpoints accept ``alpha``, ``fusion_type``, ``limit`` and
+``query_properties``. Anything a request leaves out comes from the
+``HYBRID_*`` environment variables, and anything unset there is left to
+Weaviate (alpha 0.75, relative score fusion, every searchable property).
+``scripts/tune_hybrid.py`` measures recall@k and latency per setting on a
+labelled question set, so the defaults can be chosen deliberately.
+
+    alpha              0 (pure BM25) to 1 (pure vector)
+    fusion_type        ranked | relative_score
+    limit              hits packed into the prompt context, 1 to MAX_LIMIT
+    query_properties   properties BM25 searches, optionally boosted ("case_name^2")
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, replace
+from typing import Optional, Tuple
+
+FUSION_TYPES = {"ranked": "rankedFusion", "relative_score": "relativeScoreFusion"}
+# Information: The schema's indexSearchable text properties
+SEARCHABLE_PROPERTIES = ("case_name", "data", "citation", "court", "jurisdiction", "legal_topics")
+MAX_LIMIT = 50
+_BOOSTED = re.compile(r"^([a-z_]+)(?:\^(\d+(?:\.\d+)?))?$")
+
+
+class SearchParamError(ValueError):
+    """Invalid hybrid search parameter."""
+
+
+@dataclass(frozen=True)
+class SearchParams:
+    alpha: Optional[float] = None
+    fusion_type: Optional[str] = None
+    limit: Optional[int] = None
+    query_properties: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "SearchParams":
+        """Deployment defaults from HYBRID_ALPHA, HYBRID_FUSION_TYPE and HYBRID_QUERY_PROPERTIES (comma-separated)."""
+        properties = os.getenv("HYBRID_QUERY_PROPERTIES")
+        return cls().merge({
+            "alpha": os.getenv("HYBRID_ALPHA") or None,
+            "fusion_type": os.getenv("HYBRID_FUSION_TYPE") or None,
+            "query_properties": [p.strip() for p in properties.split(",") if p.strip()] if properties else None,
+        })
+
+    def merge(self, payload: dict) -> "SearchParams":
+        """
+        These parameters overridden by the ones set in ``payload``.
+
+        Raises:
+            SearchParamError: On out-of-range or unknown values
+        """
+        fields = {}
+        if payload.get("alpha") is not None:
+            try:
+                alpha = float(payload["alpha"])
+            except (TypeError, ValueError):
+                alpha = -1.0
+            if not 0.0 <= alpha <= 1.0:
+                raise SearchParamError("Parameter 'alpha' should be a number between 0 and 1.")
+            fields["alpha"] = alpha
+        if payload.get("fusion_type") is not None:
+            if payload["fusion_type"] not in FUSION_TYPES:
+                raise SearchParamError(f"Parameter 'fusion_type' should be one of: {', '.join(FUSION_TYPES)}.")
+            fields["fusion_type"] = payload["fusion_type"]
+        if payload.get("limit") is not None:
+            limit = payload["limit"]
+            if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_LIMIT:
+                raise SearchParamError(f"Parameter 'limit' should be an integer between 1 and {MAX_LIMIT}.")
+            fields["limit"] = limit
+        if payload.get("query_properties") is not None:
+            properties = payload["query_properties"]
+            if not isinstance(properties, list) or not properties or not all(
+                isinstance(p, str) and _BOOSTED.match(p) and _BOOSTED.match(p).group(1) in SEARCHABLE_PROPERTIES
+                for p in properties
+            ):
+                raise SearchParamError(
+                    f"Parameter 'query_properties' should be a non-empty list of: {', '.join(SEARCHABLE_PROPERTIES)} "
+                    "(optionally boosted, e.g. 'case_name^2')."
+                )
+            fields["query_properties"] = tuple(dict.fromkeys(properties))
+        return replace(self, **fields)
+
+    def hybrid_arguments(self) -> dict:
+        """Keyword arguments for ``build_hybrid_query`` and the search helpers."""
+        return {
+            "alpha": self.alpha,
+            "fusion_type": FUSION_TYPES.get(self.fusion_type),
+            "query_properties": self.query_properties or None,
+        }
+
+    def key(self) -> str:
+        """Stable text form of the parameters that are set, for cache namespaces and reports."""
+        return json.dumps({name: value for name, value in self.__dict__.items() if value not in (None, ())},
+                          sort_keys=True)
@@ -0,0 +1,268 @@
+"""
+Snapshots of a Weaviate class: objects and vectors as gzip-compressed JSON lines.
+
+A snapshot file holds one header line, one line per object and a trailer:
+
+    {"snapshot": 1, "class": "AI_v1", "schema": {...}, "exported_at": "...", "vector_dtype": "float32"}
+    {"id": "...", "properties": {...}, "vector": "<base64 little-endian float32>"}
+    {"end": true, "objects": 12345}
+
+Export pages through the class with the GraphQL ``after`` cursor and import
+posts ``/v1/batch/objects`` requests (``ObjectWriter``, a bounded number in
+flight, also used by scripts/migrate_schema.py); both stream,
+so memory stays flat whatever the class size. Objects are imported with their
+vectors and ids, so nothing is re-embedded and re-running an import
+overwrites instead of duplicating.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import os
+from array import array
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from flast.clients import RetryTransport
+from flast.weaviate_graphql import graphql_vector, iter_objects
+
+SNAPSHOT_VERSION = 1
+# Information: Vectors are base64 and barely compress; level 6 is several times faster than gzip's default 9
+COMPRESS_LEVEL = 6
+
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot, or is truncated."""
+
+
+def encode_vector(vector: Sequence[float]) -> str:
+    values = array("f", vector)
+    if values.itemsize != 4:
+        raise ValueError("float32 array required")
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def decode_vector(data: str) -> List[float]:
+    values = array("f")
+    values.frombytes(base64.b64decode(data))
+    return values.tolist()
+
+
+def connect(weaviate_url: str, timeout: float = 120.0, retries: int = 3,
+            headers: Optional[dict] = None) -> httpx.AsyncClient:
+    """Weaviate client retrying connection errors and overload responses (batch writes by id are idempotent)."""
+    return httpx.AsyncClient(
+        base_url=weaviate_url,
+        timeout=timeout,
+        headers=headers,
+        transport=RetryTransport(httpx.AsyncHTTPTransport(), retries, backoff=0.5),
+    )
+
+
+async def fetch_class_schema(http: httpx.AsyncClient, class_name: str) -> dict:
+    """Return the deployed class definition (``GET /v1/schema/<class>``)."""
+    response = await http.get(f"/v1/schema/{class_name}")
+    response.raise_for_status()
+    return response.json()
+
+
+async def create_class(http: httpx.AsyncClient, schema: dict):
+    """Create a class from a definition returned by ``fetch_class_schema``."""
+    response = await http.post("/v1/schema", json=schema)
+    response.raise_for_status()
+
+
+async def export_class(http: httpx.AsyncClient, class_name: str, path: str, page_size: int = 500,
+                       progress: Optional[Callable[[int], None]] = None) -> dict:
+    """
+    Write every object of ``class_name`` with its vector to the snapshot at ``path``.
+
+    The file is written as ``path + ".partial"`` and renamed once complete.
+
+    Returns:
+        dict: ``objects`` and ``without_vector`` counts
+    """
+    schema = await fetch_class_schema(http, class_name)
+    properties = [prop["name"] for prop in schema.get("properties", [])]
+    stats = {"objects": 0, "without_vector": 0}
+    partial = path + ".partial"
+    with gzip.open(partial, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+        f.write(json.dumps({
+            "snapshot": SNAPSHOT_VERSION,
+            "class": class_name,
+            "schema": schema,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "vector_dtype": "float32",
+        }) + "\n")
+        async for page in iter_objects(http, class_name, properties, page_size):
+            lines = []
+            for obj in page:
+                extra = obj.pop("_additional")
+                # Information: Unset properties come back as null; leave them unset on import too
+                record = {"id": extra["id"], "properties": {k: v for k, v in obj.items() if v is not None}}
+                if extra.get("vector"):
+                    record["vector"] = encode_vector(extra["vector"])
+                else:
+                    stats["without_vector"] += 1
+                lines.append(json.dumps(record, ensure_ascii=False))
+            f.write("\n".join(lines) + "\n")
+            stats["objects"] += len(page)
+            if progress is not None:
+                progress(stats["objects"])
+        f.write(json.dumps({"end": True, "objects": stats["objects"]}) + "\n")
+    os.replace(partial, path)
+    return stats
+
+
+def read_snapshot(path: str) -> Tuple[dict, Iterator[dict]]:
+    """
+    Return ``(header, records)``; records are decoded lazily, vectors as float lists.
+
+    Raises:
+        SnapshotError: If the header is missing, or (while iterating) the trailer is missing
+            or disagrees with the number of records
+    """
+    f = gzip.open(path, "rt", encoding="utf-8")
+    try:
+        header = json.loads(f.readline() or "{}")
+    except json.JSONDecodeError:
+        header = {}
+    if header.get("snapshot") != SNAPSHOT_VERSION:
+        f.close()
+        raise SnapshotError(f"{path} is not a version {SNAPSHOT_VERSION} snapshot")
+
+    def records() -> Iterator[dict]:
+        count = 0
+        with f:
+            for line in f:
+                record = json.loads(line)
+                if record.get("end"):
+                    if record.get("objects") != count:
+                        raise SnapshotError(f"{path} holds {count} objects, its trailer says {record.get('objects')}")
+                    return
+                if "vector" in record:
+                    record["vector"] = decode_vector(record["vector"])
+                count += 1
+                yield record
+        raise SnapshotError(f"{path} is truncated after {count} objects")
+
+    return header, records()
+
+
+async def write_batch(http: httpx.AsyncClient, class_name: str, records: List[dict]) -> List[str]:
+    """Post one ``/v1/batch/objects`` request; return an error message per failed object."""
+    objects = []
+    for record in records:
+        obj = json.dumps({"class": class_name, "id": record["id"], "properties": record["properties"]})
+        if "vector" in record:
+            # Information: Vectors are formatted like GraphQL query vectors, about twice as fast as json.dumps
+            obj = obj[:-1] + ', "vector": ' + graphql_vector(record["vector"]) + "}"
+        objects.append(obj)
+    response = await http.post(
+        "/v1/batch/objects",
+        content='{"objects": [' + ", ".join(objects) + "]}",
+        headers={"Content-Type": "application/json"},
+    )
+    response.raise_for_status()
+    errors = []
+    for result in response.json():
+        messages = ((result.get("result") or {}).get("errors") or {}).get("error")
+        if messages:
+            errors.append(f"{result.get('id')}: {messages[0].get('message', messages[0])}")
+    return errors
+
+
+class ObjectWriter:
+    """
+    Write ``{"id", "properties", "vector"?}`` records to a class in parallel batch requests.
+
+    At most ``concurrency`` batches are in flight, so at most
+    ``concurrency * batch_size`` records are held in memory.
+    """
+
+    def __init__(self, http: httpx.AsyncClient, class_name: str, batch_size: int = 200, concurrency: int = 4,
+                 progress: Optional[Callable[[int], None]] = None):
+        self.http = http
+        self.class_name = class_name
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.progress = progress
+        self.stats = {"objects": 0, "failed": 0, "errors": []}
+        self._batch: List[dict] = []
+        # Information: Task -> batch size, so a batch whose task raised is still counted as failed
+        self._pending: Dict[asyncio.Task, int] = {}
+
+    async def add(self, record: dict):
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            await self._submit()
+
+    async def close(self) -> dict:
+        """Send the last batch, wait for every request; return ``objects`` sent, ``failed`` and the first ``errors`` (at most 20)."""
+        try:
+            if self._batch:
+                await self._submit()
+        finally:
+            if self._pending:
+                done, _ = await asyncio.wait(self._pending)
+                self._collect(done)
+        return self.stats
+
+    async def _submit(self):
+        batch, self._batch = self._batch, []
+        if len(self._pending) >= self.concurrency:
+            done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+            self._collect(done)
+        self._pending[asyncio.create_task(self._send(batch))] = len(batch)
+        self.stats["objects"] += len(batch)
+        if self.progress is not None:
+            self.progress(self.stats["objects"])
+
+    async def _send(self, batch: List[dict]):
+        try:
+            errors = await write_batch(self.http, self.class_name, batch)
+        except httpx.HTTPError as e:
+            errors = [f"batch of {len(batch)} failed: {e}"] * len(batch)
+        self._record(errors)
+
+    def _collect(self, done):
+        """Forget finished tasks; a task that raised anything but an HTTP error fails its whole batch."""
+        for task in done:
+            size = self._pending.pop(task)
+            error = "cancelled" if task.cancelled() else task.exception()
+            if error is not None:
+                self._record([f"batch of {size} failed: {error!r}"] * size)
+
+    def _record(self, errors: List[str]):
+        self.stats["failed"] += len(errors)
+        self.stats["errors"] += errors[:max(0, 20 - len(self.stats["errors"]))]
+
+
+async def import_snapshot(http: httpx.AsyncClient, path: str, class_name: Optional[str] = None,
+                          batch_size: int = 200, concurrency: int = 4, create: bool = False,
+                          progress: Optional[Callable[[int], None]] = None) -> dict:
+    """
+    Load a snapshot into ``class_name`` (default: the class it was exported from).
+
+    Args:
+        create: Create the class from the snapshot's schema first
+
+    Returns:
+        dict: ``objects`` sent, ``failed`` objects and the first ``errors`` (at most 20)
+    """
+    header, records = read_snapshot(path)
+    class_name = class_name or header["class"]
+    if create:
+        await create_class(http, {**header["schema"], "class": class_name})
+
+    writer = ObjectWriter(http, class_name, batch_size, concurrency, progress)
+    try:
+        for record in records:
+            await writer.add(record)
+    finally:
+        # Information: Let batches already sent finish, also when the snapshot turns out truncated
+        stats = await writer.close()
+    return stats
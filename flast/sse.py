@@ -0,0 +1,36 @@
+"""
+Server-sent events encoding (API side) and decoding (Streamlit side).
+"""
+
+import json
+from typing import Iterable, Iterator, Tuple
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Encode one server-sent event with a JSON ``data`` payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[Tuple[str, dict]]:
+    """
+    Decode server-sent events from an iterable of text lines.
+
+    Args:
+        lines: Response lines without trailing newlines (e.g. ``requests`` ``iter_lines``)
+
+    Yields:
+        (event, data) tuples, where ``data`` is the decoded JSON payload
+    """
+    event, data_lines = "message", []
+    for line in lines:
+        if not line:
+            # Information: A blank line terminates the current event
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].lstrip())
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
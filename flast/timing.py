@@ -0,0 +1,51 @@
+"""
+Per-stage wall-clock timing for the question-answering pipeline.
+
+Each stage is also a trace span when tracing is on (flast/tracing.py).
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+from flast import tracing
+
+
+class StageTimer:
+    """
+    Collect durations of named pipeline stages for one request.
+
+    Stages may overlap (e.g. answer and reasoning generated concurrently);
+    each stage records its own wall-clock duration and ``total`` is the
+    time since the timer was created. ``info`` carries request facts that
+    explain the timings (e.g. whether the answer cache was hit).
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.info: Dict[str, object] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to stage ``name``."""
+        started = time.perf_counter()
+        try:
+            with tracing.span(name):
+                yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def mark(self, name: str):
+        """Record the time elapsed since the timer was created as stage ``name``."""
+        self.stages[name] = self.total()
+
+    def total(self) -> float:
+        """Seconds elapsed since the timer was created."""
+        return time.perf_counter() - self._started
+
+    def as_ms(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, plus ``total``."""
+        timings = {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()}
+        timings["total"] = round(self.total() * 1000, 1)
+        return timings
@@ -0,0 +1,269 @@
+"""
+Token counting matched to the OpenAI models the app uses.
+
+``TokenCounter`` wraps a pluggable backend with a memo of recent counts and a
+batch API. The default backend is tiktoken BPE built from a local
+``<encoding>.tiktoken`` vocabulary file (``TOKENIZER_DIR``, default
+``tokenizers/`` in the repository; fetch with ``scripts/fetch_tokenizers.py``),
+so nothing is downloaded at runtime. When the file or tiktoken is missing the
+counter falls back to a regex approximation and says so once.
+
+Encodings: ``o200k_base`` for gpt-4o prompt budgets, ``cl100k_base`` for
+text-embedding-3-small chunk sizes.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_DIR = os.getenv(
+    "TOKENIZER_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tokenizers")
+)
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "8192"))
+
+Offsets = List[Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class EncodingSpec:
+    """Pre-tokenization pattern, special tokens and vocabulary checksum of one tiktoken encoding."""
+    pat_str: str
+    special_tokens: Dict[str, int]
+    sha256: str
+    url: str
+
+
+# Information: Same constants as tiktoken_ext.openai_public, minus the download
+ENCODINGS = {
+    "cl100k_base": EncodingSpec(
+        pat_str=r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+""",
+        special_tokens={
+            "<|endoftext|>": 100257, "<|fim_prefix|>": 100258, "<|fim_middle|>": 100259,
+            "<|fim_suffix|>": 100260, "<|endofprompt|>": 100276,
+        },
+        sha256="223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+        url="https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken",
+    ),
+    "o200k_base": EncodingSpec(
+        pat_str="|".join([
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""\p{N}{1,3}""",
+            r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+            r"""\s*[\r\n]+""",
+            r"""\s+(?!\S)""",
+            r"""\s+""",
+        ]),
+        special_tokens={"<|endoftext|>": 199999, "<|endofprompt|>": 200018},
+        sha256="446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+        url="https://openaipublic.blob.core.windows.net/encodings/o200k_base.tiktoken",
+    ),
+}
+
+MODEL_ENCODINGS = {
+    "gpt-4o": "o200k_base",
+    "gpt-4o-mini": "o200k_base",
+    "gpt-4": "cl100k_base",
+    "gpt-4-turbo": "cl100k_base",
+    "gpt-3.5-turbo": "cl100k_base",
+    "text-embedding-3-small": "cl100k_base",
+    "text-embedding-3-large": "cl100k_base",
+    "text-embedding-ada-002": "cl100k_base",
+}
+DEFAULT_ENCODING = "o200k_base"
+
+
+def encoding_for_model(model: str) -> str:
+    """Encoding name for an OpenAI model; unknown models use the gpt-4o encoding."""
+    if model in MODEL_ENCODINGS:
+        return MODEL_ENCODINGS[model]
+    for prefix, name in MODEL_ENCODINGS.items():
+        if model.startswith(prefix + "-"):
+            return name
+    return DEFAULT_ENCODING
+
+
+def vocabulary_path(name: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or TOKENIZER_DIR, f"{name}.tiktoken")
+
+
+def load_ranks(path: str, sha256: Optional[str] = None) -> Dict[bytes, int]:
+    """
+    Read a ``.tiktoken`` vocabulary (one ``base64(token) rank`` per line).
+
+    Raises:
+        ValueError: If the file does not match ``sha256``
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if sha256 and hashlib.sha256(data).hexdigest() != sha256:
+        raise ValueError(f"{path} does not match the expected checksum")
+    return {
+        base64.b64decode(token): int(rank)
+        for token, rank in (line.split() for line in data.splitlines() if line)
+    }
+
+
+class TiktokenBackend:
+    """Exact BPE token counts and offsets with tiktoken."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.name = f"tiktoken:{encoding.name}"
+
+    @classmethod
+    def from_file(cls, name: str, path: str) -> "TiktokenBackend":
+        import tiktoken
+
+        spec = ENCODINGS[name]
+        return cls(tiktoken.Encoding(
+            name=name,
+            pat_str=spec.pat_str,
+            mergeable_ranks=load_ranks(path, spec.sha256),
+            special_tokens=spec.special_tokens,
+        ))
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode_ordinary(text))
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        # Information: tiktoken encodes batches on its own thread pool, outside the GIL
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+
+    def offsets(self, text: str) -> Offsets:
+        tokens = self.encoding.encode_ordinary(text)
+        byte_ends = list(accumulate(len(self.encoding.decode_single_token_bytes(t)) for t in tokens))
+        byte_starts = [0] + byte_ends[:-1]
+        if text.isascii():
+            return list(zip(byte_starts, byte_ends))
+        # Information: Map UTF-8 byte positions to character positions; a token ending mid-character takes all of it
+        char_ends = list(accumulate(len(char.encode('utf-8')) for char in text))
+        return [
+            (bisect_right(char_ends, start), bisect_right(char_ends, end - 1) + 1)
+            for start, end in zip(byte_starts, byte_ends)
+        ]
+
+
+class ApproximateBackend:
+    """
+    Dependency-free estimate used when no vocabulary is available.
+
+    Splits like the BPE pre-tokenizer and counts long pieces as several
+    tokens; typically within ~10% of tiktoken on English prose.
+    """
+
+    name = "approximate"
+    _PIECE = re.compile(r"""'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+(?!\S)|\s+""")
+    _CHARS_PER_TOKEN = 6
+
+    def count(self, text: str) -> int:
+        # Information: Same total as len(self.offsets(text)) without building the spans
+        pieces = self._PIECE.findall(text)
+        return len(pieces) + sum((len(piece) - 1) // self._CHARS_PER_TOKEN for piece in pieces
+                                 if len(piece) > self._CHARS_PER_TOKEN)
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        return [self.count(text) for text in texts]
+
+    def offsets(self, text: str) -> Offsets:
+        spans = []
+        for match in self._PIECE.finditer(text):
+            start, end = match.span()
+            pieces = (end - start + self._CHARS_PER_TOKEN - 1) // self._CHARS_PER_TOKEN
+            size = -(-(end - start) // pieces)
+            spans.extend((position, min(position + size, end)) for position in range(start, end, size))
+        return spans
+
+
+class TokenCounter:
+    """
+    Memoized token counts over a backend.
+
+    Args:
+        backend: Object with ``count``, ``count_batch`` and ``offsets``
+        cache_size: Distinct strings whose counts are remembered (LRU)
+    """
+
+    def __init__(self, backend, cache_size: int = TOKEN_COUNT_CACHE_SIZE):
+        self.backend = backend
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    def __call__(self, text: str) -> int:
+        return self.count(text)
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``."""
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+        value = self.backend.count(text)
+        self._remember(text, value)
+        return value
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Token counts for many strings; only strings not in the memo reach the backend."""
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                cached = self._cache.get(text)
+                if cached is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    self._cache.move_to_end(text)
+                    counts[i] = cached
+        if missing:
+            unique = list(missing)
+            for text, value in zip(unique, self.backend.count_batch(unique)):
+                for i in missing[text]:
+                    counts[i] = value
+                self._remember(text, value)
+        return counts
+
+    def offsets(self, text: str) -> Offsets:
+        """``(start, end)`` character span of every token of ``text`` (not memoized)."""
+        return self.backend.offsets(text)
+
+    def _remember(self, text: str, value: int):
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[text] = value
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_counter(encoding: str = DEFAULT_ENCODING) -> TokenCounter:
+    """Shared counter for ``encoding``, built on first use from the local vocabulary file."""
+    path = vocabulary_path(encoding)
+    try:
+        backend = TiktokenBackend.from_file(encoding, path)
+    except (ImportError, OSError, ValueError) as e:
+        logger.warning("Token counts for %s are approximate (%s); run scripts/fetch_tokenizers.py", encoding, e)
+        backend = ApproximateBackend()
+    return TokenCounter(backend)
+
+
+def counter_for_model(model: str) -> TokenCounter:
+    return get_counter(encoding_for_model(model))
@@ -0,0 +1,177 @@
+"""
+Optional OpenTelemetry tracing across the Streamlit page, the API and its backends.
+
+Tracing is off unless ``TRACING_EXPORTER`` is set when ``configure`` runs:
+
+    otlp   spans go to an OTLP/HTTP collector (OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318)
+    file   spans are appended as JSON lines to TRACING_FILE (default traces.jsonl)
+
+The OpenTelemetry SDK (plus the OTLP exporter for ``otlp``) is an optional
+dependency and only ``configure`` imports it, so with tracing off nothing is
+loaded and ``span`` returns a no-op context manager.
+
+One trace covers a question end to end: the Streamlit page opens a span and
+sends its W3C ``traceparent`` header (``inject``), ``TracingMiddleware``
+continues it in a server span per API request, each ``StageTimer`` stage is a
+child span, and ``TracingTransport`` adds a client span per Weaviate or OpenAI
+HTTP attempt (retries show up as siblings).
+"""
+
+import os
+from contextlib import nullcontext
+from typing import Optional
+
+import httpx
+
+DEFAULT_TRACE_FILE = "traces.jsonl"
+EXPORTERS = ("otlp", "file")
+
+_tracer = None
+_provider = None
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def configure(service_name: str) -> bool:
+    """
+    Start recording spans as ``service_name`` (``OTEL_SERVICE_NAME`` overrides it) if TRACING_EXPORTER is set.
+
+    Safe to call more than once. Returns whether tracing is on; a missing package or an unknown
+    exporter is printed and leaves tracing off.
+    """
+    global _tracer, _provider
+    exporter_name = os.getenv("TRACING_EXPORTER", "").lower()
+    if _tracer is not None or not exporter_name:
+        return _tracer is not None
+    try:
+        if exporter_name not in EXPORTERS:
+            raise ValueError(f"TRACING_EXPORTER should be one of: {', '.join(EXPORTERS)}")
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+        if exporter_name == "otlp":
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter()
+        else:
+            exporter = ConsoleSpanExporter(
+                out=open(os.getenv("TRACING_FILE") or DEFAULT_TRACE_FILE, 'a', encoding='utf-8'),
+                formatter=lambda finished: finished.to_json(indent=None) + "\n",
+            )
+    except (ImportError, OSError, ValueError) as e:
+        print(f"Tracing disabled: {str(e)}")
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": os.getenv("OTEL_SERVICE_NAME", service_name)}))
+    # Information: Spans are exported from a background thread; the request path only queues them
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider, _tracer = provider, provider.get_tracer("flast")
+    return True
+
+
+def shutdown():
+    """Export the spans still queued (also done at interpreter exit)."""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+
+def span(name: str, kind: str = "internal", context=None, **attributes):
+    """Context manager for a child span of the current one (or of ``context``); yields None when tracing is off."""
+    if _tracer is None:
+        return nullcontext()
+    from opentelemetry.trace import SpanKind
+    return _tracer.start_as_current_span(
+        name, context=context, kind=getattr(SpanKind, kind.upper()), attributes=attributes or None
+    )
+
+
+def inject(headers: dict) -> dict:
+    """``headers`` plus the current trace context (``traceparent``), for calls to another service."""
+    if _tracer is not None:
+        from opentelemetry.propagate import inject as inject_context
+        inject_context(headers)
+    return headers
+
+
+def annotate(info: dict, prefix: str = "flast."):
+    """Set request facts (e.g. ``StageTimer.info``) as attributes of the current span."""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    current = trace.get_current_span()
+    for name, value in info.items():
+        if isinstance(value, (str, bool, int, float)):
+            current.set_attribute(prefix + name, value)
+
+
+def _mark_status(current, status_code: int):
+    if status_code >= 500:
+        from opentelemetry.trace import Status, StatusCode
+        current.set_status(Status(StatusCode.ERROR))
+
+
+class TracingMiddleware:
+    """ASGI middleware continuing the caller's trace in one server span per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if _tracer is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        from opentelemetry.propagate import extract
+
+        carrier = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        method = scope["method"]
+        with span(f"{method} {scope['path']}", kind="server", context=extract(carrier),
+                  **{"http.request.method": method, "url.path": scope["path"]}) as current:
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    current.set_attribute("http.response.status_code", message["status"])
+                    _mark_status(current, message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # Information: The route template is only known once the router has matched
+                route: Optional[str] = getattr(scope.get("route"), "path", None)
+                if route:
+                    current.update_name(f"{method} {route}")
+                    current.set_attribute("http.route", route)
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """
+    Client span around each request an httpx client sends to ``peer``, with the trace context
+    in its headers. The span ends when the response headers arrive; reading a streamed body
+    is timed by the enclosing stage span.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, peer: str):
+        self._transport = transport
+        self.peer = peer
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _tracer is None:
+            return await self._transport.handle_async_request(request)
+        with span(f"{self.peer} {request.method} {request.url.path}", kind="client", **{
+            "peer.service": self.peer,
+            "http.request.method": request.method,
+            "url.full": str(request.url),
+        }) as current:
+            inject(request.headers)
+            response = await self._transport.handle_async_request(request)
+            current.set_attribute("http.response.status_code", response.status_code)
+            _mark_status(current, response.status_code)
+            return response
+
+    async def aclose(self):
+        await self._transport.aclose()
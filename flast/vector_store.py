@@ -0,0 +1,196 @@
+"""
+Append-only on-disk store of embedded chunks.
+
+Replaces the ``final_data.json`` index (chunk text as key, embedding as JSON
+floats), which was re-read and rewritten in full for every chunk. A store is
+a directory of three files that are only ever appended to:
+
+    vectors.f32   row-major float32 vectors, ``dim`` values per row
+    texts.bin     UTF-8 chunk texts, back to back
+    index.jsonl   one line per row: {"hash", "case_name", "offset", "length"}, plus
+                  "properties" when the row was appended with them
+
+Appending a chunk writes its vector, its text and one index line, so adding n
+chunks costs O(n) I/O instead of O(n²). Loading reads only the small index;
+vectors are memory-mapped (``vectors()``) and texts are read on demand. The
+index line is written last and a torn tail is ignored on open, so a crash
+mid-append loses at most the rows being written.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+VECTORS_FILE = "vectors.f32"
+TEXTS_FILE = "texts.bin"
+INDEX_FILE = "index.jsonl"
+META_FILE = "store.json"
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorStore:
+    """
+    Chunks with their embeddings, deduplicated by text.
+
+    Args:
+        directory: Store directory; created if missing
+        dim: Vector size; required for a new store, checked against an existing one
+
+    Raises:
+        ValueError: If ``dim`` is missing for a new store or differs from the stored one
+    """
+
+    def __init__(self, directory: str, dim: Optional[int] = None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta_path = self._path(META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if dim is not None and dim != meta["dim"]:
+                raise ValueError(f"{directory} holds {meta['dim']}-dimensional vectors, not {dim}")
+            self.dim = meta["dim"]
+        elif dim is None:
+            raise ValueError(f"{directory} is not a vector store yet; pass dim to create it")
+        else:
+            self.dim = dim
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "dim": dim, "dtype": "float32"}, f)
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._entries: List[dict] = []
+        self._load_index()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        text_end = 0
+        index_path = self._path(INDEX_FILE)
+        if os.path.exists(index_path):
+            valid_bytes = 0
+            with open(index_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self._rows.setdefault(entry["hash"], len(self._entries))
+                    self._entries.append(entry)
+                    valid_bytes += len(line)
+                    text_end = entry["offset"] + entry["length"]
+            if valid_bytes != os.path.getsize(index_path):
+                os.truncate(index_path, valid_bytes)
+        # Information: Drop vector/text bytes of rows whose index line never made it to disk
+        for name, size in ((VECTORS_FILE, len(self._entries) * self.dim * 4), (TEXTS_FILE, text_end)):
+            path = self._path(name)
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+            elif os.path.getsize(path) > size:
+                os.truncate(path, size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, text: str) -> bool:
+        return text_key(text) in self._rows
+
+    def append(self, items: Iterable[Union[Tuple[str, Sequence[float], str],
+                                           Tuple[str, Sequence[float], str, dict]]]) -> int:
+        """
+        Append ``(text, vector, case_name)`` or ``(text, vector, case_name, properties)``
+        items, skipping texts already stored. ``properties`` must be JSON-serializable.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            rows, vectors, texts, entries = {}, [], [], []
+            offset = self._entries[-1]["offset"] + self._entries[-1]["length"] if self._entries else 0
+            for text, vector, case_name, *properties in items:
+                key = text_key(text)
+                if key in self._rows or key in rows:
+                    continue
+                data = text.encode("utf-8")
+                if len(vector) != self.dim:
+                    raise ValueError(f"Vector has {len(vector)} values, the store holds {self.dim}")
+                rows[key] = len(self._entries) + len(entries)
+                vectors.append(vector)
+                texts.append(data)
+                entry = {"hash": key, "case_name": case_name, "offset": offset, "length": len(data)}
+                if properties and properties[0]:
+                    entry["properties"] = properties[0]
+                entries.append(entry)
+                offset += len(data)
+            if not entries:
+                return 0
+            with open(self._path(VECTORS_FILE), 'ab') as f:
+                f.write(np.asarray(vectors, dtype='<f4').tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._path(TEXTS_FILE), 'ab') as f:
+                f.write(b"".join(texts))
+                f.flush()
+                os.fsync(f.fileno())
+            # Information: Index lines go last; they are what makes the rows visible after a restart
+            with open(self._path(INDEX_FILE), 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+            self._rows.update(rows)
+            self._entries.extend(entries)
+            return len(entries)
+
+    def vectors(self) -> np.ndarray:
+        """Read-only ``(len(self), dim)`` float32 memory map of every stored vector."""
+        if not self._entries:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.memmap(self._path(VECTORS_FILE), dtype='<f4', mode='r', shape=(len(self._entries), self.dim))
+
+    def row(self, text: str) -> Optional[int]:
+        return self._rows.get(text_key(text))
+
+    def properties(self, row: int) -> dict:
+        """``case_name`` and the stored properties of one row, without reading its text."""
+        entry = self._entries[row]
+        return {**entry.get("properties", {}), "case_name": entry["case_name"]}
+
+    def entry(self, row: int) -> dict:
+        """``{"text", "case_name", "properties"}`` of one row."""
+        return self.entries([row])[0]
+
+    def entries(self, rows: Sequence[int]) -> List[dict]:
+        """``{"text", "case_name", "properties"}`` of several rows, read through one file handle."""
+        result = []
+        with open(self._path(TEXTS_FILE), 'rb') as f:
+            for row in rows:
+                entry = self._entries[row]
+                f.seek(entry["offset"])
+                result.append({
+                    "text": f.read(entry["length"]).decode("utf-8"),
+                    "case_name": entry["case_name"],
+                    "properties": entry.get("properties", {}),
+                })
+        return result
+
+    def __iter__(self) -> Iterator[dict]:
+        """Every row as ``{"text", "case_name", "properties", "vector"}``, reading texts sequentially."""
+        vectors = self.vectors()
+        with open(self._path(TEXTS_FILE), 'rb') as f:
+            for row, entry in enumerate(self._entries):
+                f.seek(entry["offset"])
+                yield {
+                    "text": f.read(entry["length"]).decode("utf-8"),
+                    "case_name": entry["case_name"],
+                    "properties": entry.get("properties", {}),
+                    "vector": vectors[row],
+                }
@@ -0,0 +1,267 @@
+"""
+Async access to the Weaviate GraphQL endpoint.
+
+weaviate-client v3 is synchronous, so the API talks to ``/v1/graphql``
+directly over a shared ``httpx.AsyncClient`` to keep the event loop free
+while a query is in flight.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Sequence, Union
+
+import httpx
+
+
+def graphql_string(value: str) -> str:
+    """Return ``value`` as a quoted GraphQL string literal."""
+    # Information: JSON string escaping is valid GraphQL string escaping
+    return json.dumps(value)
+
+
+def build_hybrid_query(class_name: str, query: str, properties: List[str], limit: int,
+                       alias: Optional[str] = None, vector: Optional[Sequence[float]] = None,
+                       additional: Sequence[str] = ("score",), where: Optional[str] = None,
+                       alpha: Optional[float] = None, fusion_type: Optional[str] = None,
+                       query_properties: Optional[Sequence[str]] = None) -> str:
+    """
+    Build the ``Get`` selection for a hybrid search.
+
+    Args:
+        class_name: Weaviate class to search (e.g. ``AI_v1``)
+        query: Search text used for both BM25 and vector search
+        properties: Object properties to return
+        limit: Maximum number of hits
+        alias: Optional GraphQL alias, so several searches can share one request
+        vector: Precomputed query embedding; without it Weaviate vectorizes ``query`` itself
+        additional: ``_additional`` fields to return (e.g. ``vector`` for local re-ranking)
+        where: ``where`` filter value (e.g. from ``SearchFilters.where``); only matching objects are ranked
+        alpha, fusion_type, query_properties: Hybrid ``alpha``, ``fusionType`` (``rankedFusion`` or
+            ``relativeScoreFusion``) and BM25 ``properties``; None keeps Weaviate's defaults
+
+    Returns:
+        str: GraphQL selection for one class, without the ``{ Get { } }`` wrapper
+    """
+    fields = " ".join(list(properties) + [f"_additional {{ {' '.join(additional)} }}"])
+    head = f"{alias}: {class_name}" if alias else class_name
+    hybrid = f"query: {graphql_string(query)}"
+    if vector is not None:
+        hybrid += f", vector: {graphql_vector(vector)}"
+    if alpha is not None:
+        hybrid += f", alpha: {float(alpha)}"
+    if fusion_type:
+        hybrid += f", fusionType: {fusion_type}"
+    if query_properties:
+        hybrid += f", properties: [{', '.join(graphql_string(p) for p in query_properties)}]"
+    condition = f", where: {where}" if where else ""
+    return f"{head}(hybrid: {{{hybrid}}}{condition}, limit: {limit}) {{ {fields} }}"
+
+
+def graphql_vector(vector: Sequence[float]) -> str:
+    """Return ``vector`` as a GraphQL list literal."""
+    # Information: 9 significant digits round-trip float32 exactly and keep the query about half the size of repr()
+    return "[" + ",".join(["%.9g" % value for value in vector]) + "]"
+
+
+def graphql_error(error: dict) -> ValueError:
+    return ValueError(f"Weaviate GraphQL error: {error.get('message', error)}")
+
+
+async def run_graphql(http: httpx.AsyncClient, query: str, raise_errors: bool = True) -> dict:
+    """
+    Post a GraphQL query to Weaviate and return the decoded response.
+
+    Args:
+        raise_errors: Raise on GraphQL errors; pass False to inspect partial results
+
+    Raises:
+        httpx.HTTPStatusError: If Weaviate answers with a non-2xx status
+        ValueError: If the response carries GraphQL errors and ``raise_errors`` is set
+    """
+    response = await http.post("/v1/graphql", json={"query": query})
+    response.raise_for_status()
+    result = response.json()
+    # Information: Weaviate reports query errors with HTTP 200 and an `errors` list
+    if raise_errors and result.get("errors"):
+        raise graphql_error(result['errors'][0])
+    return result
+
+
+async def hybrid_search(
+    http: httpx.AsyncClient,
+    class_name: str,
+    query: str,
+    properties: List[str],
+    limit: int = 5,
+    vector: Optional[Sequence[float]] = None,
+    additional: Sequence[str] = ("score",),
+    where: Optional[str] = None,
+    alpha: Optional[float] = None,
+    fusion_type: Optional[str] = None,
+    query_properties: Optional[Sequence[str]] = None,
+) -> List[dict]:
+    """
+    Run a hybrid (BM25 + vector) search and return the hits for ``class_name``.
+
+    ``vector`` is the query embedding when the caller already has it; the remaining
+    arguments are those of ``build_hybrid_query``.
+
+    Raises:
+        ValueError: If the response does not contain ``data.Get.<class_name>``
+    """
+    selection = build_hybrid_query(class_name, query, properties, limit, vector=vector, additional=additional,
+                                   where=where, alpha=alpha, fusion_type=fusion_type,
+                                   query_properties=query_properties)
+    result = await run_graphql(http, "{ Get { " + selection + " } }")
+    if 'data' not in result or 'Get' not in (result['data'] or {}) or class_name not in result['data']['Get']:
+        raise ValueError("Unexpected response structure from Weaviate")
+    return result['data']['Get'][class_name] or []
+
+
+async def batch_hybrid_search(
+    http: httpx.AsyncClient,
+    class_name: str,
+    queries: List[str],
+    properties: List[str],
+    limit: int = 5,
+    batch_size: int = 50,
+    concurrency: int = 4,
+    vectors: Optional[List[Optional[Sequence[float]]]] = None,
+    additional: Sequence[str] = ("score",),
+    where: Optional[str] = None,
+    alpha: Optional[float] = None,
+    fusion_type: Optional[str] = None,
+    query_properties: Optional[Sequence[str]] = None,
+) -> List[Union[List[dict], Exception]]:
+    """
+    Run many hybrid searches as aliased ``Get`` selections, ``batch_size`` per request.
+
+    ``vectors`` optionally holds each query's embedding (None entries are vectorized by Weaviate).
+
+    Returns:
+        One entry per query, in order: its hits, or the exception that query failed with.
+        A failed request fails every query in it; a GraphQL error scoped to one
+        alias fails only that query.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    vectors = vectors if vectors is not None else [None] * len(queries)
+
+    async def run_batch(batch: List[str], batch_vectors: list) -> List[Union[List[dict], Exception]]:
+        selections = " ".join(
+            build_hybrid_query(class_name, query, properties, limit, alias=f"q{i}", vector=vector,
+                               additional=additional, where=where, alpha=alpha, fusion_type=fusion_type,
+                               query_properties=query_properties)
+            for i, (query, vector) in enumerate(zip(batch, batch_vectors))
+        )
+        try:
+            async with semaphore:
+                result = await run_graphql(http, "{ Get { " + selections + " } }", raise_errors=False)
+        except Exception as e:
+            return [e] * len(batch)
+
+        errors = {}
+        for error in result.get("errors") or []:
+            path = error.get("path") or []
+            errors[path[1] if len(path) > 1 else None] = graphql_error(error)
+        found = (result.get("data") or {}).get("Get") or {}
+
+        hits = []
+        for i in range(len(batch)):
+            alias = f"q{i}"
+            if alias in errors:
+                hits.append(errors[alias])
+            elif found.get(alias) is None and None in errors:
+                hits.append(errors[None])
+            else:
+                hits.append(found.get(alias) or [])
+        return hits
+
+    batches = await asyncio.gather(*(
+        run_batch(queries[start:start + batch_size], vectors[start:start + batch_size]) for start in range(0, len(queries), batch_size)
+    ))
+    return [hits for batch in batches for hits in batch]
+
+
+def build_filtered_query(class_name: str, properties: List[str], limit: int, where: str,
+                         query: Optional[str] = None, additional: Sequence[str] = ("score",),
+                         sort: Optional[str] = None) -> str:
+    """
+    Build a ``Get`` query over the objects matching ``where`` (no vector search).
+
+    With ``query`` hits are BM25-ranked; otherwise they come in ascending ``sort`` property order.
+    """
+    fields = " ".join(list(properties) + [f"_additional {{ {' '.join(additional)} }}"])
+    if query:
+        order = f"bm25: {{query: {graphql_string(query)}}}, "
+    else:
+        order = f'sort: [{{path: ["{sort}"], order: asc}}], ' if sort else ""
+    return f"{{ Get {{ {class_name}({order}where: {where}, limit: {limit}) {{ {fields} }} }} }}"
+
+
+async def filtered_search(
+    http: httpx.AsyncClient,
+    class_name: str,
+    properties: List[str],
+    where: str,
+    limit: int = 5,
+    query: Optional[str] = None,
+    additional: Sequence[str] = ("score",),
+    sort: Optional[str] = None,
+) -> List[dict]:
+    """
+    Hits for ``class_name`` among the objects matching ``where``, ranked by BM25 on ``query``
+    (or ordered by ``sort`` without one).
+
+    Raises:
+        ValueError: If the response does not contain ``data.Get.<class_name>``
+    """
+    result = await run_graphql(http, build_filtered_query(class_name, properties, limit, where, query, additional, sort))
+    if 'data' not in result or 'Get' not in (result['data'] or {}) or class_name not in result['data']['Get']:
+        raise ValueError("Unexpected response structure from Weaviate")
+    return result['data']['Get'][class_name] or []
+
+
+def build_cursor_query(class_name: str, properties: List[str], limit: int, after: Optional[str] = None,
+                       additional: Sequence[str] = ("id",)) -> str:
+    """Build a ``Get`` query for one page of ``class_name`` in id order, starting after object ``after``."""
+    fields = " ".join(list(properties) + [f"_additional {{ {' '.join(additional)} }}"])
+    cursor = f", after: {graphql_string(after)}" if after else ""
+    return f"{{ Get {{ {class_name}(limit: {limit}{cursor}) {{ {fields} }} }} }}"
+
+
+async def iter_objects(
+    http: httpx.AsyncClient,
+    class_name: str,
+    properties: List[str],
+    page_size: int = 500,
+    additional: Sequence[str] = ("id", "vector"),
+) -> AsyncIterator[List[dict]]:
+    """
+    Yield every object of ``class_name`` in pages of ``page_size``, using Weaviate's ``after`` cursor.
+
+    ``additional`` must include ``id``; it is what the next page starts after.
+
+    Raises:
+        ValueError: If the response does not contain ``data.Get.<class_name>``
+    """
+    after = None
+    while True:
+        result = await run_graphql(http, build_cursor_query(class_name, properties, page_size, after, additional))
+        if 'data' not in result or 'Get' not in (result['data'] or {}) or class_name not in result['data']['Get']:
+            raise ValueError("Unexpected response structure from Weaviate")
+        page = result['data']['Get'][class_name] or []
+        if not page:
+            return
+        # Information: Read the cursor before yielding; callers may consume the page in place
+        after = page[-1]['_additional']['id']
+        yield page
+
+
+async def count_objects(http: httpx.AsyncClient, class_name: str) -> int:
+    """Number of objects in ``class_name`` (``Aggregate`` meta count)."""
+    result = await run_graphql(http, f"{{ Aggregate {{ {class_name} {{ meta {{ count }} }} }} }}")
+    try:
+        return int(result['data']['Aggregate'][class_name][0]['meta']['count'])
+    except (KeyError, IndexError, TypeError):
+        raise ValueError("Unexpected response structure from Weaviate")
@@ -6,10 +6,26 @@ import openai
 import json
 from dotenv import load_dotenv
 import os
+import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Information: Make the repository root importable when run as `streamlit run pages/Question_Answer.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flast import tracing
+from flast.prompts import PromptRegistry
+from flast.sse import iter_sse_events
 
 load_dotenv()
 API_endpoint = os.getenv("API_ENDPOINT")
 API_AUTH_TOKEN = os.getenv("API_AUTH_TOKEN")  # Information: Read auth token from environment
+# Information: Streaming endpoint renders answer tokens as they arrive (set API_STREAMING=false to disable)
+API_STREAM_ENDPOINT = os.getenv("API_STREAM_ENDPOINT") or (
+    API_endpoint.rstrip('/') + '/stream' if API_endpoint else None
+)
+USE_STREAMING = os.getenv("API_STREAMING", "true").lower() == "true"
+# Information: (connect, read) timeouts in seconds; generation can take a while, connecting should not
+API_TIMEOUT = (float(os.getenv("API_CONNECT_TIMEOUT", "5")), float(os.getenv("API_READ_TIMEOUT", "180")))
 
 st.set_page_config(
     layout="wide",
@@ -21,11 +37,46 @@ st.title("FLAST-AI V1-Vector")
 
 prompts_folder = "prompts"
 
+
+# Information: One registry per Streamlit server process; reruns reuse it and files are only re-read on change
+@st.cache_resource
+def get_prompt_registry():
+    return PromptRegistry(prompts_folder, {"answer": "prompt.txt", "reasoning": "reasoning_prompt.txt"})
+
+
+# Information: Once per Streamlit server process; TRACING_EXPORTER turns tracing on (see flast/tracing.py)
+@st.cache_resource
+def start_tracing():
+    return tracing.configure("flast-streamlit")
+
+
+start_tracing()
+
 # Load prompts without displaying them
-with open(os.path.join(prompts_folder, 'prompt.txt'), 'r') as f:
-    prompt = f.read()
-with open(os.path.join(prompts_folder, 'reasoning_prompt.txt'), 'r') as f:
-    reasoning_prompt = f.read()
+prompt = get_prompt_registry().get("answer")
+reasoning_prompt = get_prompt_registry().get("reasoning")
+
+# Information: One keep-alive session per Streamlit server process, so questions reuse the TCP/TLS connection
+@st.cache_resource
+def get_api_session():
+    """Pooled session that retries connection failures and gateway errors with jittered backoff."""
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,  # Information: Never resend a question the API may already be answering
+        status=2,
+        # Information: No 504: after a gateway timeout the API may still be answering the question
+        status_forcelist=(502, 503),
+        allowed_methods=None,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 def get_answer_from_api(user_question, model):
     # Information: Use auth token from environment instead of hardcoded value
@@ -43,13 +94,65 @@ def get_answer_from_api(user_question, model):
         'X-API-Key': API_AUTH_TOKEN  # Information: Header-based auth (preferred)
     }
     try:
-        response = requests.post(API_endpoint, headers=headers, json=payload)
-        response.raise_for_status()  # Raises an HTTPError for bad responses
-        return response.text
+        # Information: The API continues this trace, so its Weaviate and OpenAI spans nest under this one
+        with tracing.span("question_answer", kind="client", **{"flast.model": model, "flast.streaming": False}):
+            response = get_api_session().post(
+                API_endpoint, headers=tracing.inject(headers), json=payload, timeout=API_TIMEOUT
+            )
+            response.raise_for_status()  # Raises an HTTPError for bad responses
+            return response.text
     except requests.RequestException as e:
         print(f"API request failed: {str(e)}")
         return json.dumps({"error": str(e)})
 
+def stream_answer_from_api(user_question, model):
+    """Yield (event, data) server-sent events from the streaming endpoint."""
+    payload = {
+        "user_question": user_question,
+        "user_model": model,
+        "user_auth": API_AUTH_TOKEN  # Keep for backward compatibility
+    }
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream',
+        'X-API-Key': API_AUTH_TOKEN
+    }
+    with get_api_session().post(
+        API_STREAM_ENDPOINT, headers=tracing.inject(headers), json=payload, stream=True, timeout=API_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        yield from iter_sse_events(response.iter_lines(decode_unicode=True))
+
+
+def render_streamed_answer(user_question, model):
+    # Information: Placeholders keep the same layout as the non-streaming view while filling in incrementally
+    answer_box = st.empty()
+    reasoning_box = st.empty()
+    context_box = st.empty()
+    case_box = st.empty()
+    answer, reasoning = "", ""
+    if not API_AUTH_TOKEN:
+        st.error("API_AUTH_TOKEN not configured in .env")
+        return
+    try:
+        # Information: The span lasts until the last event, so it includes rendering the streamed tokens
+        with tracing.span("question_answer", kind="client", **{"flast.model": model, "flast.streaming": True}):
+            for event, data in stream_answer_from_api(user_question, model):
+                if event == "context":
+                    context_box.info("Context : \n\n  " + (data.get('context') or 'No context provided'))
+                    case_box.warning("Reference case name : \n\n " + (data.get('case_name') or 'No case name provided'))
+                elif event == "answer":
+                    answer += data.get('token', '')
+                    answer_box.success("Answer : \n\n  " + answer)
+                elif event == "reasoning":
+                    reasoning += data.get('token', '')
+                    reasoning_box.success("Reasoning : \n\n  " + reasoning)
+                elif event == "error":
+                    st.error(f"An error occurred: {data.get('detail', 'Unknown error')}")
+    except requests.RequestException as e:
+        print(f"API request failed: {str(e)}")
+        st.error(f"API request failed: {str(e)}")
+
 # Comment out or remove the left_column code block if not needed
 # left_column, right_column = st.columns(2)
 # with left_column:
@@ -62,7 +165,10 @@ form = st.form(key='my_form')
 user_question = form.text_area(label='Enter your question')
 submit_button = form.form_submit_button(label='Submit')
 
-if submit_button:
+if submit_button and USE_STREAMING:
+    with right_column:
+        render_streamed_answer(user_question, "gpt-4o")
+elif submit_button:
     with right_column:
         ans_dict = get_answer_from_api(user_question, "gpt-4o")
         # st.write("Raw API response:", ans_dict)  # Debug: Print raw response
@@ -9,13 +9,22 @@ import time
 import pdfplumber
 import json
 import os
+import sys
 from weaviate import Client as WeaviateClient
 from io import StringIO
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 from scipy.spatial.distance import cosine
-from transformers import GPT2TokenizerFast
+
+# Information: Make the repository root importable when run as a Streamlit page
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flast.active_class import DEFAULT_CLASS_FILE, ActiveClass
+from flast.chunk_hashes import ChunkHashIndex
+from flast.embedding_cache import EmbeddingCache
+from flast.ingestion import chunk_objects, chunk_vectors, delete_chunks, openai_embedder, prepare_document, stored_case_ids
+from flast.normalize import normalize_pdf_text
+from flast.vector_store import VectorStore
 
 st.set_page_config(
     layout="wide",
@@ -30,11 +39,12 @@ openai.api_key = os.getenv("OPENAI_API_KEY")
 weaviate_API = os.getenv("WEAVIATE_API")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 COMPLETIONS_MODEL = "gpt-4o"
-# Information: Lazy-load tokenizer to avoid memory issues at startup
-tokenizer = None
 EMBEDDING_MODEL = "text-embedding-3-small"  # Information: Updated to match schema vectorizer
 
 # All configs and settings
+# Information: Same class file as the API, so uploads follow scripts/migrate_schema.py --switch
+active_class = ActiveClass(os.getenv("WEAVIATE_CLASS_FILE", DEFAULT_CLASS_FILE), default=os.getenv("WEAVIATE_CLASS", "AI_v1"))
+
 # Information: Lazy-load Weaviate client to avoid startup issues
 client = None
 
@@ -42,7 +52,7 @@ def get_client():
     """Lazy-load Weaviate client only when needed"""
     global client
     if client is None:
-        # Information: Using weaviate-client v3 API (compatible with Weaviate 1.18.2)
+        # Information: weaviate-client v3 API; the server must be Weaviate 1.24+ (schema/README.md)
         client = WeaviateClient(
             url="http://localhost:8080",  # test1
             # url=WEAVIATE_API,  # test2
@@ -50,21 +60,25 @@ def get_client():
         )
     return client
 
-# create index_files directory if not exists
 
-INDEX_FILE_PATH = 'final_data.json'
+# Information: Chunk IDs already written to Weaviate (shared with scripts/ingest.py), so re-uploads only send changes
+@st.cache_resource
+def get_hash_index():
+    return ChunkHashIndex()
 
-# ---------------------------------- ALL Helper functions ----------------------------------
 
-# Get embedding for a text
+# Information: Chunk vectors by model + text hash (shared with scripts/ingest.py), so re-uploads never re-embed text
+@st.cache_resource
+def get_embedder():
+    return EmbeddingCache(), openai_embedder(openai.OpenAI(api_key=openai_api_key))
+
+# create index_files directory if not exists
 
+# Information: Append-only store that replaced final_data.json (migrate with scripts/migrate_final_data.py)
+PDF_VECTOR_STORE_PATH = 'pdf_vectors'
+EMBEDDING_DIM = 1536  # Information: text-embedding-3-small
 
-def get_embedding(text, model):
-    result = openai.Embedding.create(
-        model=model,
-        input=text
-    )
-    return result["data"][0]["embedding"]
+# ---------------------------------- ALL Helper functions ----------------------------------
 
 # Get similarity between two vectors
 
@@ -96,126 +110,78 @@ def read_clean_text(text_path):
     return texts, case_name
 
 
-def extract_metadata(raw_text):
-    """Extract case metadata from raw text."""
-    # Information: Extract case name from first line
-    lines = raw_text.splitlines()
-    case_name = lines[0] if lines else "Unknown Case"
-    
-    # Information: Extract citation using regex (e.g., [2024] FamCA 123)
-    citation_match = re.search(r'\[(\d{4})\]\s+([A-Z][a-zA-Z]+)\s+(\d+)', case_name)
-    citation = citation_match.group(0) if citation_match else ""
-    
-    # Information: Extract court from citation
-    court = ""
-    if "FamCA" in case_name:
-        court = "Family Court of Australia"
-    elif "FCFCA" in case_name or "FedCFamC" in case_name:
-        court = "Federal Circuit and Family Court"
-    elif "FCCA" in case_name:
-        court = "Federal Circuit Court"
-    
-    # Information: Extract jurisdiction (default to Federal for family law)
-    jurisdiction = "Federal"
-    for state in ["NSW", "VIC", "QLD", "SA", "WA", "TAS", "NT", "ACT"]:
-        if state in case_name:
-            jurisdiction = state
-            break
-    
-    # Information: Extract decision date from citation year
-    decision_date = ""
-    if citation_match:
-        year = citation_match.group(1)
-        decision_date = f"{year}-01-01"  # Default to Jan 1 if specific date not available
-    
-    return {
-        "case_name": case_name,
-        "citation": citation,
-        "court": court,
-        "jurisdiction": jurisdiction,
-        "decision_date": decision_date
-    }
-
-
 def index_textfiles_main(raw_text, file_name):
 
     st.info(f"Generating embedding for context of file name: {file_name}")
 
-    # Information: Extract metadata from raw text
-    metadata = extract_metadata(raw_text)
-    case_name = metadata["case_name"]
-    
-    # remove first 56 lines
-    raw_text = raw_text.splitlines()[56:]
-    raw_text = "\n".join(raw_text)
-    raw_text = raw_text.split("I certify")
-    raw_text = raw_text[0]
-
-    # Remove all lines which start with (cid:
-    text = re.sub(r'\(cid:[0-9]+\)', '', raw_text)
-
-    # Remove all lines containing consecutive dots
-    text = re.sub(r'\.*\.*', '', text)
-
-    # Remove all new line characters
-    text = re.sub(r'\n', '', text)
-
-    # Remove all extra spaces between words
-    text = re.sub(r' +', ' ', text)
-
-    # Remove all remaining consecutive spaces
-    text = re.sub(r'\s+', ' ', text)
-
-    # Remove leading and trailing spaces
-    text = text.strip()
+    # Information: Cleaning and chunking are shared with scripts/ingest.py (flast/ingestion.py)
+    metadata, chunks = prepare_document(raw_text, token_limit=500, source_uri=file_name)
+    total_chunks = len(chunks)
 
-    total_tokenized = 0
     total_character_count = 0
     data_ids = []
-    token_limit = 500  # Information: Reduced from 6000 to prevent memory issues and stay within model limits
-    
-    # Information: Lazy-load tokenizer only when needed
-    global tokenizer
-    if tokenizer is None:
-        tokenizer = GPT2TokenizerFast.from_pretrained("gpt2")
-    
-    # Information: Tokenize and chunk the text
-    tokens = tokenizer.tokenize(text)
-    chunks = [
-        tokens[i:i + token_limit] for i in range(0, len(tokens), token_limit)
-    ]
-    total_chunks = len(chunks)
-    
-    # Information: Get current timestamp for ingestion_date
-    from datetime import datetime
-    ingestion_date = datetime.now().isoformat()
+
+    # Information: Content-hash IDs make re-uploads idempotent; only new or changed chunks are sent (and vectorized)
+    objects = chunk_objects(metadata, chunks)
+    hash_index = get_hash_index()
+    class_name = active_class.get()
+    new_ids, stale_ids = hash_index.diff(class_name, metadata["case_name"], [chunk_id for chunk_id, _ in objects])
+
+    # Information: Send precomputed vectors; if embedding fails, Weaviate's module vectorizes the chunks instead
+    to_send = [(chunk_id, properties) for chunk_id, properties in objects if chunk_id in new_ids]
+    try:
+        embedding_cache, embed_fn = get_embedder()
+        vectors = dict(zip([chunk_id for chunk_id, _ in to_send], chunk_vectors(embedding_cache, embed_fn, to_send)))
+    except Exception as e:
+        st.warning(f"Could not compute embeddings locally ({e}); Weaviate will vectorize the chunks")
+        vectors = {}
 
     # Information: Get Weaviate client and configure batch API
     weaviate_client = get_client()
-    weaviate_client.batch.configure(batch_size=100)
-    with weaviate_client.batch as batch:
-        for chunk_index, chunk in enumerate(chunks):
-            chunk_text = tokenizer.convert_tokens_to_string(chunk)
+    failed_ids = set()
 
-            tokenized_chunk = len(chunk)
-            total_tokenized += tokenized_chunk
+    def collect_errors(results):
+        for result in results or []:
+            if ((result.get("result") or {}).get("errors")):
+                failed_ids.add(result.get("id"))
 
-            character_count = len(chunk_text)
+    weaviate_client.batch.configure(batch_size=100, callback=collect_errors)
+    with weaviate_client.batch as batch:
+        for chunk_id, properties in to_send:
+            character_count = len(properties["data"])
             total_character_count += character_count
 
-            # Information: Simple properties for v3 API (will upgrade schema later)
-            properties = {
-                "case_name": metadata["case_name"],
-                "data": chunk_text
-            }
-
             try:
-                res = weaviate_client.batch.add_data_object(properties, "AI_v1")
-                # data_ids.append(str(res))
+                res = weaviate_client.batch.add_data_object(
+                    properties, class_name, uuid=chunk_id, vector=vectors.get(chunk_id)
+                )
+                data_ids.append(res)
             except Exception as e:
                 print(f"An error occurred: {e}")
 
-    st.success("File uploaded successfully")
+    # Information: Replace the case: drop chunks the new version no longer has, once all replacements are stored
+    if not failed_ids:
+        try:
+            # Information: Also chunks the hash index never saw (older random-UUID chunks, other machines)
+            stored_ids = stored_case_ids(weaviate_client, class_name, metadata["case_name"])
+            stale_ids |= stored_ids - {chunk_id for chunk_id, _ in objects}
+        except Exception as e:
+            st.warning(f"Could not list the stored chunks of this case ({e}); removing only the indexed stale chunks")
+    deleted = delete_chunks(weaviate_client, class_name, stale_ids) if not failed_ids else set()
+    hash_index.replace_case(
+        class_name,
+        metadata["case_name"],
+        [chunk_id for chunk_id, _ in objects if chunk_id not in failed_ids] + sorted(stale_ids - deleted),
+    )
+
+    st.info(
+        f"{len(data_ids) - len(failed_ids)} chunks written, {len(objects) - len(new_ids)} unchanged chunks skipped, "
+        f"{len(deleted)} stale chunks removed"
+    )
+    if failed_ids:
+        st.error(f"{len(failed_ids)} chunks failed to upload; upload the file again to retry them")
+    else:
+        st.success("File uploaded successfully")
 
 
 def parse_pdf(feed):
@@ -223,61 +189,31 @@ def parse_pdf(feed):
     # Read the pdf file
     # pdf = pdfplumber.open(pdf_file_path)
     with pdfplumber.open(feed) as pdf:
-        # Extract all pages text
-        pages = pdf.pages
-
-    # Extract all text from all pages
-    text = ""
-
-    for page in pages:
-        text += page.extract_text()
+        # Extract all text from all pages
+        text = "".join(page.extract_text() or "" for page in pdf.pages)
 
     print(text)
 
-    # Remove all lines which startes with (cid:
-    text = re.sub(r'\(cid:[0-9]+\)', '', text)
-
-    # remove all extra space between words, but dont touch the new line caharcter
-    text = re.sub(r' +', ' ', text)
-
-    # replace " \n" with "\n"
-    text = re.sub(r' \n', '\n', text)
-
-    # Remove all extra new line characters
-    text = re.sub(r'\n+', '\n', text)
-
-    text = text.strip()
+    # Information: Drop (cid:N), collapse spaces and blank lines in one pass (flast/normalize.py)
+    text = normalize_pdf_text(text)
 
     # case_name is 2nd line of the text
     case_name = text.split('\n')[1]
 
     chunks = textwrap.wrap(text, 2500)
 
-    for chunk in chunks:
-        # first check if index_files/index.json exists
-        if os.path.exists(INDEX_FILE_PATH):
-            with open(INDEX_FILE_PATH, 'r') as infile:
-                result = json.load(infile)
-        else:
-            result = dict()
-
-        # Check if the chunk is already in index.json
-        if chunk in result:
-            st.info(" -> Chunk already in index.json, skipping embedding generation")
-        else:
-            st.info("     -> Generating embedding for chunk")
-            # get embedding using gpt3_embedding function
-            embedding = get_embedding(chunk.encode(
-                encoding='ASCII', errors='ignore').decode(), EMBEDDING_MODEL)
-
-            # create a dictionary with content as key and embedding, case_name as a sub dictionary
-            result[chunk] = {'embedding': embedding, 'case_name': case_name}
-
-            # save the dictionary to index.json file
-            with open(INDEX_FILE_PATH, 'w') as outfile:
-                json.dump(result, outfile, indent=2)
-
-            time.sleep(5)
+    # Information: Only chunks not stored yet are embedded (batched, via the embedding cache) and appended
+    store = VectorStore(PDF_VECTOR_STORE_PATH, dim=EMBEDDING_DIM)
+    new_chunks = list(dict.fromkeys(chunk for chunk in chunks if chunk not in store))
+    st.info(f" -> {len(chunks) - len(new_chunks)} chunks already in the store, embedding {len(new_chunks)}")
+    if new_chunks:
+        embedding_cache, embed_fn = get_embedder()
+        embeddings = embedding_cache.embed(
+            EMBEDDING_MODEL,
+            [chunk.encode(encoding='ASCII', errors='ignore').decode() for chunk in new_chunks],
+            embed_fn,
+        )
+        store.append((chunk, embedding, case_name) for chunk, embedding in zip(new_chunks, embeddings))
 
     st.success(f"Completed embedding for contexts of uploaded file name\n")
 
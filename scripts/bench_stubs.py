@@ -0,0 +1,152 @@
+"""
+Stub Weaviate and OpenAI backends for the benchmark scripts.
+
+The stubs are plain ``httpx.MockTransport`` handlers, so the API code under
+test runs unchanged (real httpx and AsyncOpenAI clients) while each backend
+call only costs a configurable ``asyncio.sleep``.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Information: Make the repository root importable when run as `python scripts/<name>.py`
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+STUB_WEAVIATE_URL = "http://weaviate.stub"
+STUB_OPENAI_URL = "http://openai.stub/v1"
+
+STUB_HITS = [
+    {
+        "case_name": f"Stub & Stub [2024] FamCA {i}",
+        "data": "[1] The parties separated in 2019. [2] The court considered s60CC factors. " * 20,
+        "_additional": {"score": str(1.0 - i / 10)},
+    }
+    for i in range(5)
+]
+
+
+def weaviate_transport(latency: float) -> httpx.MockTransport:
+    """
+    Return a transport answering every GraphQL ``Get`` with ``STUB_HITS`` after ``latency`` seconds.
+
+    Aliased selections (``q0: AI_v1(...)``) each get their own copy of the hits. Schema
+    reads describe the legacy class (``data`` and ``case_name`` only).
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/v1/schema/"):
+            return httpx.Response(200, json={"class": request.url.path.rsplit("/", 1)[-1], "properties": [
+                {"name": "data", "dataType": ["text"]}, {"name": "case_name", "dataType": ["text"]},
+            ]})
+        query = json.loads(request.content)["query"]
+        await asyncio.sleep(latency)
+        # Information: str.split, not a regex; queries carrying a query vector are tens of KB of digits
+        aliases = [head.rsplit(" ", 1)[-1] for head in query.split(": AI_v1(")[:-1]] or ["AI_v1"]
+        return httpx.Response(200, json={"data": {"Get": {alias: STUB_HITS for alias in aliases}}})
+
+    return httpx.MockTransport(handler)
+
+
+def openai_transport(latency: float, fused_latency_factor: float = 1.5) -> httpx.MockTransport:
+    """
+    Return a transport answering every chat completion after ``latency`` seconds.
+
+    JSON-mode requests (fused answer + reasoning) return both fields and take
+    ``fused_latency_factor`` times longer, modelling the longer combined output.
+    Streaming requests get the same content as an event stream (ending with a
+    usage chunk when ``stream_options.include_usage`` is set); embeddings
+    requests return deterministic per-text vectors without delay.
+    """
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path.endswith("/embeddings"):
+            return httpx.Response(200, json=stub_embeddings(body))
+        content = "Stub answer citing [1] and [2]."
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            content = json.dumps({"answer": content, "reasoning": "Stub reasoning. Relevance 8/10."})
+            await asyncio.sleep(latency * fused_latency_factor)
+        else:
+            await asyncio.sleep(latency)
+        if body.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=stream_chunks(
+                    body.get("model", "stub"), content, (body.get("stream_options") or {}).get("include_usage", False)
+                ),
+            )
+        return httpx.Response(200, json={
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+        })
+
+    return httpx.MockTransport(handler)
+
+
+def stub_vector(text: str, dim: int = 1536) -> list:
+    """Deterministic unit vector for ``text`` (same text, same vector)."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def stub_embeddings(body: dict) -> dict:
+    """OpenAI embeddings response for a stub request body."""
+    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    vectors = [stub_vector(text) for text in inputs]
+    if body.get("encoding_format") == "base64":
+        vectors = [base64.b64encode(np.asarray(vector, dtype="<f4").tobytes()).decode("ascii") for vector in vectors]
+    return {
+        "object": "list",
+        "model": body.get("model", "stub"),
+        "data": [{"object": "embedding", "index": i, "embedding": vector} for i, vector in enumerate(vectors)],
+        "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+    }
+
+
+def stream_chunks(model: str, content: str, include_usage: bool = False) -> bytes:
+    """Encode ``content`` word by word as an OpenAI chat completion event stream."""
+    events = []
+    for word in content.split(" "):
+        chunk = {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+        }
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    if include_usage:
+        # Information: OpenAI sends token usage in a final chunk without choices
+        usage = {"prompt_tokens": 100, "completion_tokens": len(events), "total_tokens": 100 + len(events)}
+        chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                 "model": model, "choices": [], "usage": usage}
+        events.append(f"data: {json.dumps(chunk)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0-100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for POST /generate_answers/ against stubbed backends.
+
+Every Weaviate query and OpenAI completion is answered by an in-process stub
+after a fixed latency, so the measured throughput reflects only how many
+questions one API worker can keep in flight.
+
+Usage:
+    python scripts/benchmark_concurrency.py [--requests N] [--concurrency C]
+        [--weaviate-latency S] [--openai-latency S] [--min-speedup X]
+
+Exits non-zero when concurrent throughput is not at least --min-speedup
+times the serial throughput.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from bench_stubs import (
+    REPO_ROOT,
+    STUB_OPENAI_URL,
+    STUB_WEAVIATE_URL,
+    openai_transport,
+    percentile,
+    weaviate_transport,
+)
+
+BENCH_TOKEN = "bench-token"
+
+
+def load_app(weaviate_latency: float, openai_latency: float, fused_latency_factor: float = 1.5):
+    """Import Main with its backends replaced by stubs and return the module."""
+    os.environ["API_AUTH_TOKEN"] = BENCH_TOKEN
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    # Information: Measure the full pipeline, not answer or embedding cache hits
+    os.environ.setdefault("ANSWER_CACHE_ENABLED", "false")
+    os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+    # Information: Main resolves prompts/ relative to the working directory
+    os.chdir(REPO_ROOT)
+
+    import Main
+    Main.backends.install(
+        weaviate_http=httpx.AsyncClient(
+            base_url=STUB_WEAVIATE_URL, transport=weaviate_transport(weaviate_latency)
+        ),
+        openai=AsyncOpenAI(
+            api_key="stub",
+            base_url=STUB_OPENAI_URL,
+            http_client=httpx.AsyncClient(transport=openai_transport(openai_latency, fused_latency_factor)),
+        ),
+    )
+    return Main
+
+
+async def run_load(app, total: int, concurrency: int) -> dict:
+    """Send ``total`` questions with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://api", timeout=None
+    ) as api:
+        async def one(i: int):
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                response = await api.post(
+                    "/generate_answers/",
+                    headers={"X-API-Key": BENCH_TOKEN},
+                    json={"user_question": f"Question {i} about relocation?", "user_model": "gpt-4o"},
+                )
+                latencies.append(time.perf_counter() - started)
+                # Information: Pipeline errors come back as 200 with the error text as the answer
+                if response.status_code != 200 or not response.json()["answer"].startswith("Stub answer"):
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "failures": failures,
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+def print_result(result: dict):
+    print(
+        f"  concurrency={result['concurrency']:<4} requests={result['requests']:<5} "
+        f"failures={result['failures']:<3} throughput={result['throughput_rps']:8.2f} req/s  "
+        f"p50={result['p50_ms']:8.1f} ms  p95={result['p95_ms']:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent load benchmark for /generate_answers/')
+    parser.add_argument('--requests', type=int, default=200, help='Questions per run (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Questions in flight (default: 50)')
+    parser.add_argument('--weaviate-latency', type=float, default=0.05, help='Stub Weaviate latency in seconds')
+    parser.add_argument('--openai-latency', type=float, default=0.2, help='Stub OpenAI latency in seconds')
+    parser.add_argument('--min-speedup', type=float, default=10.0,
+                        help='Required concurrent/serial throughput ratio (default: 10)')
+    args = parser.parse_args()
+
+    Main = load_app(args.weaviate_latency, args.openai_latency)
+
+    print("📊 /generate_answers/ load benchmark (stubbed backends)")
+    serial_requests = max(1, min(args.requests, 10))
+    serial = asyncio.run(run_load(Main.app, serial_requests, 1))
+    print_result(serial)
+    concurrent = asyncio.run(run_load(Main.app, args.requests, args.concurrency))
+    print_result(concurrent)
+
+    speedup = concurrent["throughput_rps"] / serial["throughput_rps"]
+    print(f"\n  Speedup: {speedup:.1f}x (required: {args.min_speedup:.1f}x)")
+    if serial["failures"] or concurrent["failures"]:
+        print("❌ Some requests failed")
+        sys.exit(1)
+    if speedup < args.min_speedup:
+        print("❌ Concurrent throughput below target")
+        sys.exit(1)
+    print("✅ Worker keeps questions in flight concurrently")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark context packing time and prompt size versus k.
+
+Builds synthetic Weaviate hits (several chunks per case, some adjacent,
+some duplicated) and reports, for each k, how long build_context takes
+and how many tokens end up in the prompt under the budget.
+
+Usage:
+    python scripts/benchmark_context.py [--k 1,5,10,20,50] [--budget 3000] [--repeat 50]
+"""
+
+import argparse
+import random
+import time
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.context import build_context
+
+PARAGRAPH = (
+    "[{n}] The mother seeks orders permitting relocation of the child to Perth. The father opposes "
+    "the application and relies on the child's relationship with the paternal family. Having regard "
+    "to the s60CC considerations, the Court finds the benefit of a meaningful relationship weighs "
+    "heavily. "
+)
+
+
+def synthetic_hits(k: int, seed: int = 7) -> list:
+    """k hits spread over k // 3 + 1 cases, with adjacent and duplicate chunks."""
+    rng = random.Random(seed)
+    cases = [f"Smith & Jones (No {i}) [2024] FamCA {100 + i}" for i in range(k // 3 + 1)]
+    hits = []
+    for i in range(k):
+        case = rng.choice(cases)
+        chunk_index = rng.randint(0, 8)
+        hits.append({
+            "case_name": case,
+            "chunk_index": chunk_index,
+            "data": "".join(PARAGRAPH.format(n=chunk_index * 5 + j) for j in range(5)),
+            "_additional": {"score": f"{rng.random():.6f}"},
+        })
+    return hits
+
+
+def load_counter():
+    """Token counter used by the API for gpt-4o."""
+    from flast.tokens import counter_for_model
+    return counter_for_model("gpt-4o").count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark context packing versus k')
+    parser.add_argument('--k', default='1,5,10,20,50', help='Comma-separated hit counts (default: 1,5,10,20,50)')
+    parser.add_argument('--budget', type=int, default=3000, help='Token budget (default: 3000)')
+    parser.add_argument('--repeat', type=int, default=50, help='Repetitions per k (default: 50)')
+    args = parser.parse_args()
+
+    count_tokens = load_counter()
+    print(f"📊 Context packing (budget {args.budget} tokens, {args.repeat} runs per k)")
+    print(f"  {'k':>4}  {'raw tokens':>10}  {'prompt tokens':>13}  {'passages':>8}  {'cases':>5}  {'pack ms':>8}")
+    for k in [int(value) for value in args.k.split(',')]:
+        hits = synthetic_hits(k)
+        raw_tokens = sum(count_tokens(hit["data"]) for hit in hits)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            packed = build_context(hits, args.budget, count_tokens)
+        elapsed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+        print(
+            f"  {k:>4}  {raw_tokens:>10}  {packed.tokens:>13}  {len(packed.passages):>8}  "
+            f"{len(packed.case_names):>5}  {elapsed_ms:>8.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
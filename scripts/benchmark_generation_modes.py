@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare answer/reasoning generation modes by per-stage latency.
+
+Runs the same questions through each GENERATION_MODE (sequential, fused,
+parallel) and reports p50/p95 of every stage returned in the response
+``timings`` so the mode with the best p95 can be picked.
+
+Usage:
+    # Stubbed backends (default)
+    python scripts/benchmark_generation_modes.py [--requests N] [--concurrency C]
+
+    # A running API with real Weaviate/OpenAI backends
+    python scripts/benchmark_generation_modes.py --api-url http://127.0.0.1:8000 \
+        --questions questions.txt
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections import defaultdict
+
+import httpx
+
+from bench_stubs import percentile
+from benchmark_concurrency import BENCH_TOKEN, load_app
+
+MODES = ("sequential", "fused", "parallel")
+
+
+async def run_mode(api: httpx.AsyncClient, token: str, questions, mode: str, model: str, concurrency: int) -> dict:
+    """Send every question with ``generation_mode=mode`` and collect stage timings."""
+    semaphore = asyncio.Semaphore(concurrency)
+    stages = defaultdict(list)
+    failures = 0
+
+    async def one(question: str):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            response = await api.post(
+                "/generate_answers/",
+                headers={"X-API-Key": token},
+                json={"user_question": question, "user_model": model, "generation_mode": mode},
+            )
+            stages["client"].append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                failures += 1
+                return
+            for stage, ms in response.json().get("timings", {}).items():
+                stages[stage].append(ms)
+
+    await asyncio.gather(*(one(q) for q in questions))
+    return {"failures": failures, "stages": stages}
+
+
+def print_mode(mode: str, result: dict):
+    print(f"\n  {mode} (failures={result['failures']})")
+    for stage, values in sorted(result["stages"].items()):
+        print(f"    {stage:<11} p50={percentile(values, 50):9.1f} ms  p95={percentile(values, 95):9.1f} ms")
+
+
+async def run_all(api: httpx.AsyncClient, token: str, questions, model: str, concurrency: int):
+    results = {}
+    for mode in MODES:
+        results[mode] = await run_mode(api, token, questions, mode, model, concurrency)
+        print_mode(mode, results[mode])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage latency of each generation mode')
+    parser.add_argument('--requests', type=int, default=50, help='Stub questions per mode (default: 50)')
+    parser.add_argument('--concurrency', type=int, default=10, help='Questions in flight (default: 10)')
+    parser.add_argument('--model', default='gpt-4o', help='Model sent as user_model (default: gpt-4o)')
+    parser.add_argument('--api-url', help='Benchmark a running API instead of stubbed backends')
+    parser.add_argument('--questions', help='Text file with one question per line (used with --api-url)')
+    parser.add_argument('--openai-latency', type=float, default=0.5, help='Stub OpenAI latency in seconds')
+    parser.add_argument('--fused-latency-factor', type=float, default=1.5,
+                        help='Stub latency multiplier for the fused completion (default: 1.5)')
+    args = parser.parse_args()
+
+    if args.questions:
+        with open(args.questions, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = [f"Question {i} about parenting orders?" for i in range(args.requests)]
+
+    if args.api_url:
+        token = os.getenv("API_AUTH_TOKEN", "")
+        transport = None
+        base_url = args.api_url
+    else:
+        Main = load_app(0.05, args.openai_latency, args.fused_latency_factor)
+        token = BENCH_TOKEN
+        transport = httpx.ASGITransport(app=Main.app)
+        base_url = "http://api"
+
+    print(f"📊 Generation mode benchmark ({len(questions)} questions, concurrency {args.concurrency})")
+
+    async def go():
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as api:
+            return await run_all(api, token, questions, args.model, args.concurrency)
+
+    results = asyncio.run(go())
+    best = min(
+        (mode for mode in MODES if results[mode]["stages"]["total"]),
+        key=lambda mode: percentile(results[mode]["stages"]["total"], 95),
+        default=None,
+    )
+    if best:
+        print(f"\n✅ Best p95 total latency: {best}")
+
+
+if __name__ == '__main__':
+    main()
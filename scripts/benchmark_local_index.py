@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local index (flast/local_index.py): latency and recall@k.
+
+Synthetic mode (default) writes ``--rows`` clustered vectors with short texts
+to a temporary index, builds it twice (brute force, then IVF) and reports the
+per-query latency of each and the recall@k of IVF hybrid hits against the
+exact brute-force hybrid hits.
+
+With ``--weaviate-url`` and ``--index`` it compares a built index against the
+live class instead: queries are sampled from the index (stored vector, first
+words of the chunk as text), run through Weaviate's hybrid search and the
+local index, and recall@k is the share of Weaviate's top-k ids the local
+index also returns.
+
+Usage:
+    python scripts/benchmark_local_index.py [--rows 100000] [--dim 1536] [--queries 200] [--k 5] [--nprobe 16]
+    python scripts/benchmark_local_index.py --weaviate-url http://localhost:8080 --index local_index [--queries 200]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.local_index import LocalIndex, build
+from flast.vector_store import VectorStore
+from flast.weaviate_graphql import hybrid_search
+
+PROPERTIES = ["case_name", "chunk_index"]
+
+
+def write_corpus(directory: str, rows: int, dim: int, rng: np.random.Generator, batch: int = 5000):
+    """Clustered unit vectors; each row's text mixes its cluster's topic words with common words."""
+    clusters = max(1, rows // 200)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vocabulary = np.array([f"w{i}" for i in range(20000)])
+    store = VectorStore(directory, dim=dim)
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        labels = rng.integers(0, clusters, count)
+        vectors = centers[labels] + 0.8 * rng.standard_normal((count, dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1)[:, None]
+        common = rng.zipf(1.3, (count, 40)) % len(vocabulary)
+        topic = (labels[:, None] * 7 + rng.integers(0, 7, (count, 8))) % len(vocabulary)
+        store.append(
+            (f"[{start + i}] " + " ".join(vocabulary[np.concatenate([common[i], topic[i]])]), vectors[i],
+             f"Case {labels[i]}", {"id": str(start + i), "chunk_index": 0})
+            for i in range(count)
+        )
+
+
+def sample_queries(index: LocalIndex, count: int, rng: np.random.Generator, noise: float = 0.0):
+    rows = rng.choice(len(index), size=min(count, len(index)), replace=False)
+    queries = []
+    for row, entry in zip(rows, index.store.entries(rows.tolist())):
+        vector = np.asarray(index.vectors[row], dtype=np.float32)
+        if noise:
+            vector = vector + noise * rng.standard_normal(len(vector), dtype=np.float32) / np.sqrt(len(vector))
+        queries.append((" ".join(entry["text"].split()[1:9]), vector.tolist()))
+    return queries
+
+
+def run_local(index: LocalIndex, queries: list, k: int):
+    latencies, results = [], []
+    for text, vector in queries:
+        started = time.perf_counter()
+        hits = index.search(text, vector, PROPERTIES, limit=k, additional=("id", "score"))
+        latencies.append(time.perf_counter() - started)
+        results.append([hit["_additional"]["id"] for hit in hits])
+    return results, latencies
+
+
+def recall(expected: list, found: list) -> float:
+    scores = [len(set(e) & set(f)) / len(e) for e, f in zip(expected, found) if e]
+    return statistics.mean(scores) if scores else 0.0
+
+
+def p(latencies: list, q: float) -> float:
+    return float(np.percentile(latencies, q)) * 1000
+
+
+def synthetic(args):
+    rng = np.random.default_rng(18)
+    workdir = tempfile.mkdtemp(prefix="local_index_bench_")
+    try:
+        started = time.perf_counter()
+        write_corpus(workdir, args.rows, args.dim, rng)
+        write_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        build(workdir, nlist=0)
+        flat_build = time.perf_counter() - started
+        flat = LocalIndex(workdir)
+        queries = sample_queries(flat, args.queries, rng, noise=0.5)
+        expected, flat_latency = run_local(flat, queries, args.k)
+
+        started = time.perf_counter()
+        stats = build(workdir)
+        ivf_build = time.perf_counter() - started
+        ivf = LocalIndex(workdir, nprobe=args.nprobe)
+        found, ivf_latency = run_local(ivf, queries, args.k)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"📊 {args.rows} rows x {args.dim} dims, {len(queries)} queries, k={args.k} (corpus written in {write_seconds:.1f}s)")
+    print(f"  {'index':>16}  {'build s':>8}  {'p50 ms':>7}  {'p95 ms':>7}  {'recall@k':>8}")
+    print(f"  {'brute force':>16}  {flat_build:>8.1f}  {p(flat_latency, 50):>7.2f}  {p(flat_latency, 95):>7.2f}  {1.0:>8.3f}")
+    print(f"  {ivf.kind + ' nprobe=' + str(args.nprobe):>16}  {ivf_build:>8.1f}  {p(ivf_latency, 50):>7.2f}  "
+          f"{p(ivf_latency, 95):>7.2f}  {recall(expected, found):>8.3f}")
+    if stats["nlist"] == 0:
+        print(f"  (below the IVF threshold, both runs are brute force)")
+
+
+async def against_weaviate(args, index: LocalIndex, queries: list):
+    expected, latencies = [], []
+    async with httpx.AsyncClient(base_url=args.weaviate_url, timeout=60.0) as http:
+        for text, vector in queries:
+            started = time.perf_counter()
+            hits = await hybrid_search(http, args.class_name, text, PROPERTIES, limit=args.k, vector=vector,
+                                       additional=("id",))
+            latencies.append(time.perf_counter() - started)
+            expected.append([hit["_additional"]["id"] for hit in hits])
+    return expected, latencies
+
+
+def live(args):
+    index = LocalIndex(args.index, nprobe=args.nprobe)
+    queries = sample_queries(index, args.queries, np.random.default_rng(18))
+    try:
+        expected, weaviate_latency = asyncio.run(against_weaviate(args, index, queries))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"❌ Weaviate query failed: {e}")
+        sys.exit(1)
+    found, local_latency = run_local(index, queries, args.k)
+    print(f"📊 {len(index)} rows ({index.kind}), {len(queries)} queries, k={args.k}")
+    print(f"  {'source':>8}  {'p50 ms':>7}  {'p95 ms':>7}")
+    print(f"  {'weaviate':>8}  {p(weaviate_latency, 50):>7.2f}  {p(weaviate_latency, 95):>7.2f}")
+    print(f"  {'local':>8}  {p(local_latency, 50):>7.2f}  {p(local_latency, 95):>7.2f}")
+    print(f"  recall@{args.k} of Weaviate's hits: {recall(expected, found):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the local index: latency and recall@k')
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic rows (default: 100000)')
+    parser.add_argument('--dim', type=int, default=1536, help='Synthetic vector size (default: 1536)')
+    parser.add_argument('--queries', type=int, default=200, help='Queries (default: 200)')
+    parser.add_argument('--k', type=int, default=5, help='Hits per query (default: 5)')
+    parser.add_argument('--nprobe', type=int, default=16, help='IVF lists scanned per query (default: 16)')
+    parser.add_argument('--weaviate-url', help='Compare a built index against this Weaviate instance')
+    parser.add_argument('--index', help='Built index directory (with --weaviate-url)')
+    parser.add_argument('--class-name', default='AI_v1', help='Weaviate class (default: AI_v1)')
+    args = parser.parse_args()
+
+    if args.weaviate_url:
+        if not args.index or not os.path.isdir(args.index):
+            print("❌ --weaviate-url needs --index pointing at a built local index")
+            sys.exit(1)
+        live(args)
+    else:
+        synthetic(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the judgment normalizer against the old re.sub chains.
+
+Builds large synthetic judgments (dot leaders, (cid:N) glyphs, CRLF and
+other line breaks, tabs, space runs, Unicode spaces), checks that
+flast/normalize.py produces byte-identical output to the legacy text and
+PDF chains, fuzzes both on random short strings, and reports the speedup.
+Exits 1 on any mismatch.
+
+Usage:
+    python scripts/benchmark_normalize.py [--sizes-mb 1,4,16] [--repeat 5] [--fuzz 20000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.ingestion import FOOTER_MARKER, HEADER_LINES
+from flast.normalize import normalize_judgment, normalize_pdf_text
+
+
+def legacy_text(raw_text: str) -> str:
+    """The chain index_textfiles_main used before flast/normalize.py."""
+    raw_text = raw_text.splitlines()[HEADER_LINES:]
+    raw_text = "\n".join(raw_text)
+    raw_text = raw_text.split(FOOTER_MARKER)
+    raw_text = raw_text[0]
+    text = re.sub(r'\(cid:[0-9]+\)', '', raw_text)
+    text = re.sub(r'\.*\.*', '', text)
+    text = re.sub(r'\n', '', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_pdf(text: str) -> str:
+    """The chain parse_pdf used before flast/normalize.py."""
+    text = re.sub(r'\(cid:[0-9]+\)', '', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r' \n', '\n', text)
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+
+PIECES = [
+    "The mother seeks orders permitting relocation of the child. ", "s 60CC(2)(a) ", "Smith & Jones ",
+    "[2024] FamCA 123 ", "..........", " . . . ", "(cid:12)", "(cid:3", "  ", "   ", "\t", "\n", "\r\n", "\n\n",
+    " \n", "\r", "\x0c", " ", " ", "\x85", "I certify", "(1) ", "para 14 ", "cid:", "(", ")",
+]
+
+
+def synthetic_judgment(size: int, rng: random.Random) -> str:
+    header = "\n".join([f"Smith & Jones (No {rng.randint(1, 9)}) [2024] FamCA 123"] + ["COVER SHEET"] * 60)
+    parts, length = [header], len(header)
+    body = [piece for piece in PIECES if piece != "I certify"]
+    while length < size:
+        piece = rng.choice(body) if rng.random() < 0.5 else PIECES[0]
+        parts.append(piece)
+        length += len(piece)
+    parts.append("\nI certify that the preceding paragraphs are a true copy.\nAssociate:\n")
+    return "".join(parts)
+
+
+def timed(function, text: str, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(text)
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def fuzz(count: int, rng: random.Random) -> int:
+    """Compare both paths on random short inputs; return the number of mismatches."""
+    mismatches = 0
+    for _ in range(count):
+        text = "".join(rng.choice(PIECES + ["a", "b", ".", " ", "\n"]) for _ in range(rng.randint(0, 80)))
+        text = "\n" * rng.randint(0, 3) + text
+        for name, new, old, source in (
+            ("text", lambda t: normalize_judgment(t, 2, FOOTER_MARKER), None, text),
+            ("pdf", normalize_pdf_text, legacy_pdf, text),
+        ):
+            if old is None:
+                expected = legacy_text("\n" * (HEADER_LINES - 2) + source)
+            else:
+                expected = old(source)
+            if new(source) != expected:
+                mismatches += 1
+                if mismatches <= 3:
+                    print(f"  ❌ {name} mismatch for {source!r}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark flast/normalize.py against the legacy re.sub chains')
+    parser.add_argument('--sizes-mb', default='1,4,16', help='Comma-separated judgment sizes in MB (default: 1,4,16)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per size; the best is reported (default: 5)')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Random short inputs to compare (default: 20000)')
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    failed = False
+    print(f"📊 Normalization, best of {args.repeat}")
+    print(f"  {'size':>6}  {'path':>4}  {'legacy ms':>10}  {'new ms':>8}  {'speedup':>7}  identical")
+    for size_mb in [float(value) for value in args.sizes_mb.split(',')]:
+        text = synthetic_judgment(int(size_mb * 1024 * 1024), rng)
+        for path, old, new in (
+            ("text", legacy_text, lambda t: normalize_judgment(t, HEADER_LINES, FOOTER_MARKER)),
+            ("pdf", legacy_pdf, normalize_pdf_text),
+        ):
+            expected, old_seconds = timed(old, text, args.repeat)
+            result, new_seconds = timed(new, text, args.repeat)
+            identical = result == expected
+            failed |= not identical
+            print(f"  {size_mb:>4g}MB  {path:>4}  {old_seconds * 1000:>10.1f}  {new_seconds * 1000:>8.1f}  "
+                  f"{old_seconds / new_seconds:>6.1f}x  {'yes' if identical else 'NO'}")
+
+    if args.fuzz:
+        mismatches = fuzz(args.fuzz, rng)
+        failed |= bool(mismatches)
+        print(f"  Fuzz: {args.fuzz} random inputs per path, {mismatches} mismatches")
+
+    if failed:
+        print("❌ Output differs from the legacy chains")
+        sys.exit(1)
+    print("✅ Byte-identical to the legacy chains")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark local re-ranking (flast/rerank.py) versus candidate count.
+
+Builds N synthetic Weaviate hits (vectors as JSON-decoded lists, hybrid
+scores, decision dates, courts) and times ``rerank`` against a per-hit loop
+that scores each candidate with its own ``np.dot`` (as
+``vector_similarity`` in pages/Upload_Data.py does). Both must produce the
+same order; exits 1 if they differ.
+
+Usage:
+    python scripts/benchmark_rerank.py [--n 50,200,1000] [--dim 1536] [--repeat 20]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import date
+
+import numpy as np
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.rerank import COURT_WEIGHTS, DEFAULT_COURT_WEIGHT, UNDATED_RECENCY, RerankWeights, rerank
+
+TODAY = date(2026, 1, 1)
+COURTS = list(COURT_WEIGHTS) + [""]
+
+
+def synthetic_hits(n: int, dim: int, rng: random.Random, np_rng) -> list:
+    vectors = np_rng.standard_normal((n, dim)).astype(np.float32)
+    return [
+        {
+            "case_name": f"Case {i}",
+            "data": "text",
+            "court": rng.choice(COURTS),
+            "decision_date": "" if rng.random() < 0.1 else f"{rng.randint(1995, 2025)}-01-01T00:00:00Z",
+            "_additional": {"score": f"{rng.random():.6f}", "vector": vectors[i].tolist()},
+        }
+        for i in range(n)
+    ]
+
+
+def loop_rerank(hits: list, query: list, weights: RerankWeights) -> list:
+    """Reference: one np.dot per candidate, Python arithmetic for everything else."""
+    q = np.array(query)
+    cosines = [float(np.dot(np.array(h["_additional"]["vector"]), q)
+                     / (np.linalg.norm(h["_additional"]["vector"]) * np.linalg.norm(q))) for h in hits]
+    keywords = [float(h["_additional"]["score"]) for h in hits]
+
+    def scaled(values):
+        low, high = min(values), max(values)
+        return [1.0] * len(values) if high - low <= 1e-12 else [(v - low) / (high - low) for v in values]
+
+    fused = []
+    for hit, cosine, keyword in zip(hits, scaled(cosines), scaled(keywords)):
+        if hit["decision_date"]:
+            age = (TODAY - date.fromisoformat(hit["decision_date"][:10])).days / 365.25
+            recency = 0.5 ** (max(age, 0.0) / weights.half_life_years)
+        else:
+            recency = UNDATED_RECENCY
+        court = COURT_WEIGHTS.get(hit["court"], DEFAULT_COURT_WEIGHT)
+        fused.append(weights.vector * cosine + weights.keyword * keyword
+                     + weights.recency * recency + weights.court * court)
+    return [hits[i] for i in sorted(range(len(hits)), key=lambda i: -fused[i])]
+
+
+def timed(function, repeat: int):
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark local re-ranking versus candidate count')
+    parser.add_argument('--n', default='50,200,1000', help='Comma-separated candidate counts (default: 50,200,1000)')
+    parser.add_argument('--dim', type=int, default=1536, help='Vector size (default: 1536)')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per N; the best is reported (default: 20)')
+    args = parser.parse_args()
+
+    rng, np_rng = random.Random(17), np.random.default_rng(17)
+    weights = RerankWeights()
+    query = np_rng.standard_normal(args.dim).astype(np.float32).tolist()
+    failed = False
+    print(f"📊 Re-ranking, {args.dim}-dim vectors, best of {args.repeat}")
+    print(f"  {'N':>5}  {'rerank ms':>9}  {'loop ms':>8}  {'speedup':>7}  same order")
+    for n in [int(value) for value in args.n.split(',')]:
+        hits = synthetic_hits(n, args.dim, rng, np_rng)
+        ranked, fast = timed(lambda: rerank(hits, query, weights, today=TODAY), args.repeat)
+        expected, slow = timed(lambda: loop_rerank(hits, query, weights), max(1, args.repeat // 4))
+        same = [h["case_name"] for h in ranked] == [h["case_name"] for h in expected]
+        failed |= not same
+        print(f"  {n:>5}  {fast * 1000:>9.2f}  {slow * 1000:>8.2f}  {slow / fast:>6.1f}x  {'yes' if same else 'NO'}")
+
+    if failed:
+        print("❌ Vectorized ranking differs from the reference")
+        sys.exit(1)
+    print("✅ Vectorized ranking matches the per-hit reference")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-start import time of the API.
+
+Imports Main in fresh interpreters and fails (exit code 1) when the median
+import time exceeds a threshold, or when a dependency that should load
+lazily (tiktoken, numpy, bs4, the sync weaviate client, OpenTelemetry) is
+imported at startup. Nothing connects to a backend during the import.
+
+Usage:
+    python scripts/benchmark_startup.py [--runs 5] [--max-seconds 1.5] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from bench_stubs import REPO_ROOT
+
+# Information: Modules the request path only needs on first use (or never)
+LAZY_MODULES = ("tiktoken", "numpy", "bs4", "weaviate", "opentelemetry")
+
+PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import Main\n"
+    "elapsed = time.perf_counter() - started\n"
+    f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))\n"
+)
+
+
+def probe_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "stub")
+    env.setdefault("API_AUTH_TOKEN", "bench-token")
+    return env
+
+
+def cold_import() -> dict:
+    """Import Main once in a new interpreter and return its timing and lazily-expected modules."""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=REPO_ROOT, env=probe_env(),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(top: int) -> list:
+    """(cumulative ms, module) of the slowest top-level imports, from ``-X importtime``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import Main"], cwd=REPO_ROOT, env=probe_env(),
+        capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Information: Only direct imports of Main (one level below it) to avoid double counting
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API cold-start import time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time (default: 5)')
+    parser.add_argument('--max-seconds', type=float, default=1.5,
+                        help='Fail if the median import time exceeds this (default: 1.5)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list (default: 10)')
+    args = parser.parse_args()
+
+    results = [cold_import() for _ in range(args.runs)]
+    seconds = [result["seconds"] for result in results]
+    loaded = sorted({module for result in results for module in result["loaded"]})
+    median = statistics.median(seconds)
+
+    print(f"📊 import Main ({args.runs} cold runs)")
+    print(f"  median={median * 1000:8.1f} ms  min={min(seconds) * 1000:8.1f} ms  max={max(seconds) * 1000:8.1f} ms")
+    if args.top:
+        print("  Slowest imports (cumulative ms):")
+        for ms, name in slowest_imports(args.top):
+            print(f"    {ms:8.1f}  {name}")
+
+    failed = False
+    if loaded:
+        print(f"❌ Loaded at import time but should be lazy: {', '.join(loaded)}")
+        failed = True
+    if median > args.max_seconds:
+        print(f"❌ Cold start regressed: median {median:.2f}s > {args.max_seconds:.2f}s")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"✅ Cold start within {args.max_seconds:.2f}s and heavy dependencies stay lazy")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark token counting (flast/tokens.py).
+
+Counts a set of synthetic judgment passages cold (memo cleared), again with
+the memo warm (as when the same chunks are packed into many prompts), and in
+one ``count_batch`` call. When transformers is installed, the GPT-2 tokenizer
+the counter replaced is timed on the same texts for comparison.
+
+Usage:
+    python scripts/benchmark_tokens.py [--texts 2000] [--model gpt-4o] [--repeat 3]
+"""
+
+import argparse
+import random
+import time
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.tokens import counter_for_model
+
+WORDS = (
+    "the mother father child relocation parenting orders court found that s 60CC best interests evidence "
+    "hearing Federal Circuit and Family Court of Australia [2024] FamCA 123 para (a) (b) 14 2019 consent "
+    "property settlement contributions adjustment s 79 just and equitable"
+).split()
+
+
+def passages(count: int, rng: random.Random):
+    return [
+        f"[{i}] " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(80, 400))) + "."
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark token counting')
+    parser.add_argument('--texts', type=int, default=2000, help='Number of passages (default: 2000)')
+    parser.add_argument('--model', default='gpt-4o', help='Model whose encoding is used (default: gpt-4o)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the best is reported (default: 3)')
+    args = parser.parse_args()
+
+    texts = passages(args.texts, random.Random(14))
+    counter = counter_for_model(args.model)
+
+    def cold():
+        counter._cache.clear()
+        for text in texts:
+            counter.count(text)
+
+    def batch():
+        counter._cache.clear()
+        counter.count_batch(texts)
+
+    def warm():
+        for text in texts:
+            counter.count(text)
+
+    results = [("cold", timed(cold, args.repeat)), ("batch", timed(batch, args.repeat))]
+    warm()
+    results.append(("memoized", timed(warm, args.repeat)))
+
+    try:
+        from transformers import GPT2TokenizerFast
+        tokenizer = GPT2TokenizerFast.from_pretrained("gpt2")
+        results.append(("gpt2 (old)", timed(lambda: [len(tokenizer.encode(text)) for text in texts], args.repeat)))
+    except Exception as e:
+        print(f"  (GPT-2 comparison skipped: {type(e).__name__})")
+
+    print(f"📊 Token counting, {args.texts} passages, backend {counter.name}, best of {args.repeat}")
+    print(f"  {'mode':>10}  {'total ms':>9}  {'µs/text':>8}")
+    for mode, seconds in results:
+        print(f"  {mode:>10}  {seconds * 1000:>9.1f}  {seconds / len(texts) * 1e6:>8.1f}")
+    print(f"  {sum(counter.count_batch(texts))} tokens in total")
+
+
+if __name__ == '__main__':
+    main()
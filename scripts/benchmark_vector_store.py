@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark the append-only vector store against the legacy final_data.json index.
+
+Writes ``--chunks`` synthetic chunks to a flast/vector_store.py store (appends
+of ``--batch`` rows, as parse_pdf does per file), reopens it and memory-maps
+the vectors. The legacy JSON index (rewritten in full, ``indent=2``, after
+every chunk) is measured on ``--legacy-chunks`` chunks and extrapolated to
+``--chunks``: per-chunk rewrites grow quadratically, a single load linearly.
+Also checks that the store round-trips every vector and text.
+
+Usage:
+    python scripts/benchmark_vector_store.py [--chunks 100000] [--dim 1536] [--legacy-chunks 100] [--batch 100]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.vector_store import VectorStore
+
+
+def chunk_text(i: int) -> str:
+    return f"[{i}] The court considered the s 60CC factors for child {i}. " * 40
+
+
+def legacy_write(path: str, count: int, vectors: np.ndarray) -> float:
+    """The parse_pdf loop before the vector store: load, add one chunk, dump everything."""
+    started = time.perf_counter()
+    for i in range(count):
+        if os.path.exists(path):
+            with open(path, 'r') as infile:
+                result = json.load(infile)
+        else:
+            result = dict()
+        result[chunk_text(i)] = {'embedding': vectors[i].tolist(), 'case_name': f"Case {i // 20}"}
+        with open(path, 'w') as outfile:
+            json.dump(result, outfile, indent=2)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vector store against final_data.json')
+    parser.add_argument('--chunks', type=int, default=100000, help='Chunks written to the store (default: 100000)')
+    parser.add_argument('--dim', type=int, default=1536, help='Vector size (default: 1536)')
+    parser.add_argument('--legacy-chunks', type=int, default=100,
+                        help='Chunks written the legacy way before extrapolating (default: 100)')
+    parser.add_argument('--batch', type=int, default=100, help='Rows per store append (default: 100)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(16)
+    workdir = tempfile.mkdtemp(prefix="vector_store_bench_")
+    try:
+        # Information: Vectors are generated per batch so memory stays flat at 100k x 1536
+        store = VectorStore(os.path.join(workdir, "store"), dim=args.dim)
+        write_seconds = 0.0
+        for start in range(0, args.chunks, args.batch):
+            count = min(args.batch, args.chunks - start)
+            vectors = rng.standard_normal((count, args.dim), dtype=np.float32)
+            items = [(chunk_text(start + i), vectors[i], f"Case {(start + i) // 20}") for i in range(count)]
+            started = time.perf_counter()
+            store.append(items)
+            write_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        reopened = VectorStore(os.path.join(workdir, "store"))
+        matrix = reopened.vectors()
+        load_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        norms = np.linalg.norm(matrix, axis=1)
+        scan_seconds = time.perf_counter() - started
+
+        # Information: Spot-check the round trip against the regenerated last batch
+        last = reopened.entry(len(reopened) - 1)
+        ok = (len(reopened) == args.chunks and norms.shape == (args.chunks,)
+              and last["text"] == chunk_text(args.chunks - 1)
+              and np.array_equal(matrix[-count:], vectors))
+        store_bytes = sum(os.path.getsize(os.path.join(workdir, "store", name))
+                          for name in os.listdir(os.path.join(workdir, "store")))
+
+        legacy_path = os.path.join(workdir, "final_data.json")
+        legacy_vectors = rng.standard_normal((args.legacy_chunks, args.dim), dtype=np.float32)
+        legacy_seconds = legacy_write(legacy_path, args.legacy_chunks, legacy_vectors)
+        started = time.perf_counter()
+        with open(legacy_path, 'r') as f:
+            json.load(f)
+        legacy_load = time.perf_counter() - started
+        legacy_bytes = os.path.getsize(legacy_path)
+        scale = args.chunks / args.legacy_chunks
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"📊 {args.chunks} chunks x {args.dim} dims")
+    print(f"  {'':>22}  {'write s':>10}  {'load s':>8}  {'size MB':>9}")
+    print(f"  {'vector store':>22}  {write_seconds:>10.2f}  {load_seconds:>8.3f}  {store_bytes / 1e6:>9.0f}")
+    print(f"  {'final_data.json (est.)':>22}  {legacy_seconds * scale ** 2:>10.0f}  {legacy_load * scale:>8.1f}  "
+          f"{legacy_bytes * scale / 1e6:>9.0f}")
+    print(f"  (legacy measured at {args.legacy_chunks} chunks: write {legacy_seconds:.2f}s, load {legacy_load:.3f}s; "
+          f"full scan of the memory map {scan_seconds:.2f}s)")
+    if not ok:
+        print("❌ Store did not round-trip the data")
+        sys.exit(1)
+    print("✅ Store round-trips vectors and texts")
+
+
+if __name__ == '__main__':
+    main()
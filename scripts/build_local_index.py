@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Export a Weaviate class with its vectors and build a local index (flast/local_index.py).
+
+Objects are paged in id order with the GraphQL ``after`` cursor and appended
+to a vector store in OUTPUT (``data`` as the row text, every other schema
+property and the object ``id`` as row properties), so memory stays flat
+whatever the class size. Re-running skips chunks already exported. The IVF
+index and BM25 statistics are then built over the whole store.
+
+Usage:
+    python scripts/build_local_index.py [--output local_index] [--class-name AI_v1] [--weaviate-url URL]
+        [--page-size 500] [--nlist N] [--skip-export]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Information: Make the repository root importable when run as `python scripts/build_local_index.py`
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flast.local_index import build
+from flast.vector_store import VectorStore
+from flast.weaviate_graphql import iter_objects
+
+SCHEMA_PATH = ROOT / 'schema' / 'ai_v1_schema.json'
+
+
+def schema_properties() -> list:
+    with open(SCHEMA_PATH, 'r') as f:
+        return [prop['name'] for prop in json.load(f)['properties']]
+
+
+async def export(weaviate_url: str, class_name: str, output: str, page_size: int) -> dict:
+    stats = {"objects": 0, "written": 0, "skipped": 0}
+    store = None
+    async with httpx.AsyncClient(base_url=weaviate_url, timeout=120.0) as http:
+        async for page in iter_objects(http, class_name, schema_properties(), page_size):
+            items = []
+            for obj in page:
+                extra = obj.pop('_additional')
+                if not extra.get('vector'):
+                    stats["skipped"] += 1
+                    continue
+                text, case_name = obj.pop('data') or "", obj.pop('case_name') or ""
+                items.append((text, extra['vector'], case_name, {**obj, "id": extra['id']}))
+            if items and store is None:
+                store = VectorStore(output, dim=len(items[0][1]))
+            stats["objects"] += len(page)
+            stats["written"] += store.append(items) if items else 0
+            print(f"  {stats['objects']} objects exported", end="\r", flush=True)
+    print()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a Weaviate class and build a local index')
+    parser.add_argument('--output', default='local_index', help='Index directory (default: local_index)')
+    parser.add_argument('--class-name', default='AI_v1', help='Weaviate class (default: AI_v1)')
+    parser.add_argument('--weaviate-url', default='http://localhost:8080', help='Weaviate instance URL')
+    parser.add_argument('--page-size', type=int, default=500, help='Objects per cursor page (default: 500)')
+    parser.add_argument('--nlist', type=int, default=None,
+                        help='IVF lists; 0 for brute force only (default: sqrt(rows) from 20000 rows)')
+    parser.add_argument('--skip-export', action='store_true', help='Only rebuild the index over OUTPUT')
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        print(f"🔌 Exporting {args.class_name} from {args.weaviate_url}")
+        started = time.perf_counter()
+        try:
+            stats = asyncio.run(export(args.weaviate_url, args.class_name, args.output, args.page_size))
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"❌ Export failed: {e}")
+            sys.exit(1)
+        print(f"✅ {stats['objects']} objects, {stats['written']} new rows, {stats['skipped']} without a vector "
+              f"({time.perf_counter() - started:.1f}s)")
+
+    if not Path(args.output, 'store.json').exists():
+        print(f"❌ {args.output} holds no exported objects")
+        sys.exit(1)
+    started = time.perf_counter()
+    stats = build(args.output, nlist=args.nlist)
+    kind = f"IVF with {stats['nlist']} lists" if stats['nlist'] else "brute force"
+    print(f"✅ Indexed {stats['rows']} rows ({kind}, {stats['terms']} terms) in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
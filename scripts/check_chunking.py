@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Check that chunks of a judgment start on its paragraph markers.
+
+Chunks a synthetic judgment of numbered paragraphs with the token counter
+ingestion uses (tiktoken when the vocabulary is available) and with the
+approximate backend, at several budgets with and without paragraph overlap,
+and checks that every chunk after the first starts with ``[n]`` and that the
+chunks without overlap rebuild the document. Exits 1 on any failure.
+
+Usage:
+    python scripts/check_chunking.py [--paragraphs 200]
+"""
+
+import argparse
+import random
+import sys
+
+import bench_stubs  # noqa: F401  (puts the repository root on sys.path)
+from flast.chunking import PARAGRAPH_MARKER, chunk_document
+from flast.ingestion import EMBEDDING_MODEL
+from flast.tokens import ApproximateBackend, TokenCounter, counter_for_model
+
+SENTENCES = (
+    "The court considered the evidence at length.",
+    "The mother seeks orders permitting relocation of the child to Perth.",
+    "The father opposes the application and relies on the child's relationship with the paternal family.",
+    "Having regard to the s60CC considerations, the benefit of a meaningful relationship weighs heavily.",
+    "See Smith & Jones [2024] FamCA 123 at [45].",
+)
+# Information: (target tokens, overlap tokens); paragraphs (at most ~50 tokens) fit in half of each budget and in
+# each overlap, so every cut and every overlap can land on a paragraph boundary
+SETTINGS = ((250, 0), (500, 0), (250, 80), (500, 150))
+
+
+def synthetic_judgment(paragraphs: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    return " ".join(
+        f"[{n}] " + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 2)))
+        for n in range(1, paragraphs + 1)
+    )
+
+
+def check(name: str, text: str, counter: TokenCounter) -> list:
+    failures = []
+    offsets = counter.offsets(text)
+    for target, overlap in SETTINGS:
+        chunks = chunk_document(text, offsets, target, overlap)
+        for position, chunk in enumerate(chunks[1:], 2):
+            if not PARAGRAPH_MARKER.match(chunk.text):
+                failures.append(f"{name} target={target} overlap={overlap}: chunk {position} starts {chunk.text[:20]!r}")
+        if not overlap and " ".join(chunk.text for chunk in chunks) != text:
+            failures.append(f"{name} target={target}: chunks do not rebuild the document")
+        print(f"  {name:<12} target={target:<4} overlap={overlap:<4} chunks={len(chunks)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check paragraph-boundary chunking')
+    parser.add_argument('--paragraphs', type=int, default=200, help='Paragraphs in the synthetic judgment (default: 200)')
+    args = parser.parse_args()
+
+    text = synthetic_judgment(args.paragraphs)
+    counters = {"approximate": TokenCounter(ApproximateBackend())}
+    ingestion_counter = counter_for_model(EMBEDDING_MODEL)
+    if ingestion_counter.name != "approximate":
+        counters[ingestion_counter.name] = ingestion_counter
+    failures = []
+    for name, counter in counters.items():
+        failures.extend(check(name, text, counter))
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Every chunk after the first starts on a paragraph marker")
+
+
+if __name__ == '__main__':
+    main()
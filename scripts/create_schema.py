@@ -6,7 +6,8 @@ Usage:
     python scripts/create_schema.py [--force] [--weaviate-url URL]
 
 Options:
-    --force           Delete existing class and recreate (WARNING: deletes all data)
+    --force           Delete existing class and recreate (WARNING: deletes all data;
+                      back it up first with scripts/export_data.py)
     --weaviate-url    Weaviate instance URL (default: http://localhost:8080)
 """
 
@@ -49,7 +50,7 @@ def create_class(client: weaviate.WeaviateClient, schema: dict, force: bool = Fa
                 sys.exit(1)
         else:
             print(f"ℹ️  Class '{class_name}' already exists. Use --force to recreate.")
-            print("   (WARNING: --force will delete all existing data)")
+            print("   (WARNING: --force will delete all existing data; back it up first with scripts/export_data.py)")
             sys.exit(0)
     
     # Create the class
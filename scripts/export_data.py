@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Export a Weaviate class, objects and vectors, to a snapshot file (flast/snapshot.py).
+
+Pages through the class with the GraphQL ``after`` cursor and streams
+gzip-compressed JSON lines, so memory stays flat whatever the class size.
+Reload with scripts/import_data.py; nothing is re-embedded.
+
+Usage:
+    python scripts/export_data.py [--output backup.jsonl.gz] [--class-name AI_v1] [--weaviate-url URL] [--page-size 500]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Information: Make the repository root importable when run as `python scripts/export_data.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.snapshot import connect, export_class
+
+
+async def run(args) -> dict:
+    async with connect(args.weaviate_url) as http:
+        return await export_class(
+            http, args.class_name, args.output, args.page_size,
+            progress=lambda count: print(f"  {count} objects exported", end="\r", flush=True),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a Weaviate class with its vectors to a snapshot file')
+    parser.add_argument('--output', default='backup.jsonl.gz', help='Snapshot file (default: backup.jsonl.gz)')
+    parser.add_argument('--class-name', default='AI_v1', help='Weaviate class (default: AI_v1)')
+    parser.add_argument('--weaviate-url', default='http://localhost:8080', help='Weaviate instance URL')
+    parser.add_argument('--page-size', type=int, default=500, help='Objects per cursor page (default: 500)')
+    args = parser.parse_args()
+
+    print(f"🔌 Exporting {args.class_name} from {args.weaviate_url}")
+    started = time.perf_counter()
+    try:
+        stats = asyncio.run(run(args))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"\n❌ Export failed: {e}")
+        sys.exit(1)
+    seconds = time.perf_counter() - started
+    print(f"\n✅ {stats['objects']} objects written to {args.output} "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB, {seconds:.1f}s, {stats['objects'] / max(seconds, 1e-9):.0f} objects/s)")
+    if stats['without_vector']:
+        print(f"⚠️  {stats['without_vector']} objects had no vector; Weaviate will vectorize them on import")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Download the BPE vocabularies used by flast/tokens.py into tokenizers/.
+
+Each file is checked against the SHA-256 pinned in ``flast.tokens.ENCODINGS``
+before it is written, so the app never loads a vocabulary it did not expect.
+Run once per deployment (or bake the directory into the image); the API and
+ingestion only read the local files.
+
+Usage:
+    python scripts/fetch_tokenizers.py [--dir tokenizers] [--encoding o200k_base --encoding cl100k_base] [--force]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import requests
+
+# Information: Make the repository root importable when run as `python scripts/fetch_tokenizers.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.tokens import ENCODINGS, TOKENIZER_DIR, vocabulary_path
+
+
+def fetch(name: str, directory: str, force: bool = False) -> bool:
+    """Download one vocabulary; returns False if the download does not match its checksum."""
+    spec = ENCODINGS[name]
+    path = vocabulary_path(name, directory)
+    if not force and os.path.exists(path):
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() == spec.sha256:
+                print(f"✓ {name} already present")
+                return True
+
+    try:
+        response = requests.get(spec.url, timeout=60)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ {name}: download from {spec.url} failed ({type(e).__name__}); "
+              "token counts stay approximate until it is fetched")
+        return False
+    if hashlib.sha256(response.content).hexdigest() != spec.sha256:
+        print(f"❌ {name}: checksum mismatch, not written")
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+    # Information: Write then rename so a half-written file is never picked up
+    with open(path + ".tmp", 'wb') as f:
+        f.write(response.content)
+    os.replace(path + ".tmp", path)
+    print(f"✅ {name} → {path} ({len(response.content) / 1e6:.1f} MB)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download the tiktoken vocabularies used for token counting')
+    parser.add_argument('--dir', default=TOKENIZER_DIR, help=f'Target directory (default: {TOKENIZER_DIR})')
+    parser.add_argument('--encoding', action='append', choices=sorted(ENCODINGS),
+                        help='Encoding to fetch; repeat for several (default: all)')
+    parser.add_argument('--force', action='store_true', help='Download even if a valid file exists')
+    args = parser.parse_args()
+
+    ok = all([fetch(name, args.dir, args.force) for name in args.encoding or sorted(ENCODINGS)])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Import a snapshot written by scripts/export_data.py into Weaviate.
+
+Objects are sent with their ids and vectors in parallel ``/v1/batch/objects``
+requests, so nothing is re-embedded and re-running an import overwrites
+instead of duplicating. Use ``--class-name`` to load into another class
+(e.g. a new schema version) and ``--create-class`` to create it from the
+snapshot's schema first.
+
+Usage:
+    python scripts/import_data.py [--input backup.jsonl.gz] [--class-name NAME] [--weaviate-url URL]
+        [--batch-size 200] [--concurrency 4] [--create-class]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Information: Make the repository root importable when run as `python scripts/import_data.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.snapshot import SnapshotError, connect, import_snapshot
+
+
+async def run(args) -> dict:
+    async with connect(args.weaviate_url) as http:
+        return await import_snapshot(
+            http, args.input, args.class_name, args.batch_size, args.concurrency, create=args.create_class,
+            progress=lambda count: print(f"  {count} objects sent", end="\r", flush=True),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import a snapshot file into Weaviate')
+    parser.add_argument('--input', default='backup.jsonl.gz', help='Snapshot file (default: backup.jsonl.gz)')
+    parser.add_argument('--class-name', help='Target class (default: the class the snapshot was exported from)')
+    parser.add_argument('--weaviate-url', default='http://localhost:8080', help='Weaviate instance URL')
+    parser.add_argument('--batch-size', type=int, default=200, help='Objects per batch request (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Batch requests in flight (default: 4)')
+    parser.add_argument('--create-class', action='store_true', help="Create the class from the snapshot's schema")
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"❌ {args.input} not found")
+        sys.exit(1)
+    print(f"🔌 Importing {args.input} into {args.weaviate_url}")
+    started = time.perf_counter()
+    try:
+        stats = asyncio.run(run(args))
+    except (httpx.HTTPError, SnapshotError) as e:
+        print(f"\n❌ Import failed: {e}")
+        sys.exit(1)
+    seconds = time.perf_counter() - started
+    print(f"\n✅ {stats['objects'] - stats['failed']} of {stats['objects']} objects imported "
+          f"({seconds:.1f}s, {stats['objects'] / max(seconds, 1e-9):.0f} objects/s)")
+    if stats['failed']:
+        print(f"❌ {stats['failed']} objects failed:")
+        for error in stats['errors']:
+            print(f"   - {error}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
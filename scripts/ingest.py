@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Bulk-ingest a directory of judgment .txt files into Weaviate.
+
+Files are cleaned and chunked in a process pool (flast/ingestion.py, the same
+code the Upload Data page uses) while the main process streams the chunks to
+Weaviate in batches. A file is checkpointed to the manifest only once all of
+its chunks were written without errors, so after a crash the next run skips
+finished files and resumes with the rest. Edited files (size or mtime
+changed) are ingested again.
+
+Chunk IDs are content hashes (flast/chunk_hashes.py): chunks already recorded
+in the local hash index are not sent again, and ``--mode upsert`` also
+deletes the chunks of a re-ingested case that no longer exist. Those are
+looked up in Weaviate by case name, so chunks the local index never saw
+(random-UUID chunks from older ingests, writes from another machine) go too.
+
+Chunk vectors come from the local embedding cache (flast/embedding_cache.py)
+or OpenAI and are sent with the objects, so re-ingesting text that was
+embedded before never calls the embedding API; ``--vectors weaviate`` leaves
+vectorization to Weaviate's module instead.
+
+Usage:
+    python scripts/ingest.py DATA_DIR [--pattern "**/*.txt"] [--workers N] [--batch-size 100]
+        [--manifest PATH] [--class-name NAME] [--weaviate-url URL] [--token-limit 500] [--overlap 50]
+        [--mode insert|upsert] [--hash-index PATH] [--vectors client|weaviate] [--embedding-cache PATH]
+        [--restart] [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Information: Make the repository root importable when run as `python scripts/ingest.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.active_class import DEFAULT_CLASS_FILE, ActiveClass
+from flast.chunk_hashes import DEFAULT_INDEX_PATH, ChunkHashIndex
+from flast.embedding_cache import DEFAULT_CACHE_PATH, EmbeddingCache
+from flast.ingestion import (
+    DEFAULT_OVERLAP_TOKENS,
+    DEFAULT_TOKEN_LIMIT,
+    chunk_objects,
+    chunk_vectors,
+    delete_chunks,
+    openai_embedder,
+    prepare_document,
+    stored_case_ids,
+)
+
+MANIFEST_NAME = ".ingest_manifest.jsonl"
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Manifest:
+    """
+    Append-only JSONL record of fully ingested files.
+
+    Each line is ``{"path", "size", "mtime_ns", "chunks", "ingested_at"}``; the
+    last line for a path wins.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Information: A crash can leave a torn last line; that file is simply redone
+                        continue
+                    self.entries[entry["path"]] = entry
+
+    def is_done(self, rel_path: str, signature: Tuple[int, int]) -> bool:
+        entry = self.entries.get(rel_path)
+        return entry is not None and (entry["size"], entry["mtime_ns"]) == signature
+
+    def record(self, entries: List[dict]):
+        if not entries:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+                self.entries[entry["path"]] = entry
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def prepare_file(task: Tuple[str, str, Tuple[int, int], int, int]) -> dict:
+    """Worker: read, clean and chunk one file."""
+    path, rel_path, signature, token_limit, overlap_tokens = task
+    entry = {"path": rel_path, "size": signature[0], "mtime_ns": signature[1]}
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            metadata, chunks = prepare_document(f.read(), token_limit, overlap_tokens, source_uri=rel_path)
+    except Exception as e:
+        return {**entry, "error": f"{type(e).__name__}: {e}"}
+    return {**entry, "case_name": metadata["case_name"], "objects": chunk_objects(metadata, chunks)}
+
+
+def prepared_documents(tasks: list, workers: int) -> Iterator[dict]:
+    """Yield prepared documents as workers finish them, keeping a bounded number in flight."""
+    if workers <= 1:
+        yield from map(prepare_file, tasks)
+        return
+    pending_tasks = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Information: Bound the queue so prepared chunks never pile up faster than Weaviate absorbs them
+        in_flight = set()
+        for task in pending_tasks:
+            in_flight.add(executor.submit(prepare_file, task))
+            if len(in_flight) >= workers * 4:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                task = next(pending_tasks, None)
+                if task is not None:
+                    in_flight.add(executor.submit(prepare_file, task))
+
+
+class BatchWriter:
+    """
+    Stream chunk objects into Weaviate ``batch_size`` at a time and report which
+    files are complete.
+
+    A file counts as complete once every one of its chunks was flushed and none
+    came back with an error; files that straddle a flush stay pending until
+    their last chunk is written.
+    """
+
+    def __init__(self, client, class_name: str, batch_size: int):
+        self.client = client
+        self.class_name = class_name
+        self.batch_size = batch_size
+        self._batch_paths: List[str] = []
+        self._remaining: Dict[str, int] = {}
+        self._entries: Dict[str, dict] = {}
+        self._failed: Dict[str, str] = {}
+
+    def add(self, entry: dict, objects: List[Tuple[str, dict]],
+            vectors: Optional[List[List[float]]] = None) -> Tuple[List[dict], List[dict]]:
+        """Queue one file's chunks (with their vectors, if given); return (completed, failed) entries from any flushes."""
+        path = entry["path"]
+        if not objects:
+            return [entry], []
+        self._entries[path] = entry
+        self._remaining[path] = len(objects)
+        completed, failed = [], []
+        for (chunk_id, properties), vector in zip(objects, vectors or [None] * len(objects)):
+            self.client.batch.add_data_object(properties, self.class_name, uuid=chunk_id, vector=vector)
+            self._batch_paths.append(path)
+            if len(self._batch_paths) >= self.batch_size:
+                done, errors = self.flush()
+                completed += done
+                failed += errors
+        return completed, failed
+
+    def flush(self) -> Tuple[List[dict], List[dict]]:
+        """Write the buffered objects; return (completed, failed) entries."""
+        if not self._batch_paths:
+            return [], []
+        results = self.client.batch.create_objects()
+        paths, self._batch_paths = self._batch_paths, []
+        for path, result in zip(paths, results):
+            errors = ((result.get("result") or {}).get("errors") or {}).get("error")
+            if errors:
+                self._failed.setdefault(path, errors[0].get("message", str(errors[0])))
+        completed, failed = [], []
+        for path in paths:
+            self._remaining[path] -= 1
+            if self._remaining[path]:
+                continue
+            entry = self._entries.pop(path)
+            del self._remaining[path]
+            if path in self._failed:
+                failed.append({**entry, "error": self._failed.pop(path)})
+            else:
+                completed.append(entry)
+        return completed, failed
+
+
+def connect(weaviate_url: str):
+    """weaviate-client v3 in manual batching mode (we decide when to flush)."""
+    import weaviate
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    warnings.filterwarnings("ignore", message="Dep002")
+    headers = {"X-OpenAI-Api-Key": os.getenv("OPENAI_API_KEY")} if os.getenv("OPENAI_API_KEY") else None
+    client = weaviate.Client(url=weaviate_url, additional_headers=headers)
+    client.batch.configure(batch_size=None, timeout_retries=3, connection_error_retries=3, callback=None)
+    return client
+
+
+def ingest(args) -> dict:
+    root = Path(args.data_dir).resolve()
+    manifest_path = Path(args.manifest) if args.manifest else root / MANIFEST_NAME
+    if args.restart and manifest_path.exists() and not args.dry_run:
+        manifest_path.unlink()
+    # Information: A dry run never writes the manifest; with --restart it also ignores it
+    manifest = Manifest(manifest_path if not (args.restart and args.dry_run) else Path(os.devnull))
+
+    tasks, skipped = [], 0
+    for path in sorted(root.glob(args.pattern)):
+        if not path.is_file():
+            continue
+        rel_path = path.relative_to(root).as_posix()
+        signature = file_signature(path)
+        if manifest.is_done(rel_path, signature):
+            skipped += 1
+            continue
+        tasks.append((str(path), rel_path, signature, args.token_limit, args.overlap))
+
+    print(f"📂 {len(tasks)} files to ingest, {skipped} already in {manifest_path}")
+    writer: Optional[BatchWriter] = None
+    hash_index: Optional[ChunkHashIndex] = None
+    embedding_cache, embed_fn = None, None
+    if not args.dry_run and tasks:
+        writer = BatchWriter(connect(args.weaviate_url), args.class_name, args.batch_size)
+        hash_index = ChunkHashIndex(args.hash_index)
+        if args.vectors == "client":
+            from openai import OpenAI
+
+            embedding_cache = EmbeddingCache(args.embedding_cache)
+            embed_fn = openai_embedder(OpenAI(max_retries=5))
+
+    stats = {"docs": 0, "chunks": 0, "unchanged": 0, "deleted": 0, "skipped": skipped, "failed": 0}
+    started = time.perf_counter()
+    # Information: Per in-flight file: (case name, all chunk IDs, stale IDs to delete once the file is written)
+    pending_cases: Dict[str, Tuple[str, List[str], set]] = {}
+
+    def checkpoint(completed: List[dict], failed: List[dict]):
+        for entry in failed:
+            pending_cases.pop(entry["path"], None)
+        for entry in completed:
+            case_name, ids, stale = pending_cases.pop(entry["path"])
+            if args.mode == "upsert":
+                try:
+                    stale = stale | (stored_case_ids(writer.client, args.class_name, case_name) - set(ids))
+                except Exception as e:
+                    print(f"  ⚠️ Could not list the stored chunks of {case_name!r} ({e}); "
+                          f"deleting only the stale chunks in the hash index")
+            # Information: Stale chunks go only after their replacements are stored; undeleted ones stay indexed for a retry
+            deleted = delete_chunks(writer.client, args.class_name, stale) if stale else set()
+            stats["deleted"] += len(deleted)
+            hash_index.replace_case(args.class_name, case_name, ids + sorted(stale - deleted))
+        now = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        manifest.record([{**entry, "ingested_at": now} for entry in completed])
+        stats["docs"] += len(completed)
+        stats["chunks"] += sum(entry["chunks"] for entry in completed)
+        stats["failed"] += len(failed)
+        for entry in failed:
+            print(f"  ❌ {entry['path']}: {entry['error']}")
+
+    for processed, prepared in enumerate(prepared_documents(tasks, args.workers), 1):
+        objects = prepared.pop("objects", None)
+        if "error" in prepared:
+            checkpoint([], [prepared])
+            continue
+        case_name = prepared.pop("case_name")
+        if writer is None:
+            # Information: Dry run measures cleaning/chunking throughput without checkpointing
+            stats["docs"] += 1
+            stats["chunks"] += len(objects)
+        else:
+            ids = [chunk_id for chunk_id, _ in objects]
+            new_ids, stale = hash_index.diff(args.class_name, case_name, ids)
+            if args.mode == "insert":
+                # Information: Keep whatever else is stored for the case; only avoid re-sending identical chunks
+                ids, stale = ids + sorted(stale), set()
+            to_send = [obj for obj in objects if obj[0] in new_ids]
+            stats["unchanged"] += len(objects) - len(to_send)
+            prepared["chunks"] = len(to_send)
+            vectors = None
+            if embedding_cache is not None and to_send:
+                try:
+                    vectors = chunk_vectors(embedding_cache, embed_fn, to_send)
+                except Exception as e:
+                    checkpoint([], [{**prepared, "error": f"embedding failed: {type(e).__name__}: {e}"}])
+                    continue
+            pending_cases[prepared["path"]] = (case_name, ids, stale)
+            checkpoint(*writer.add(prepared, to_send, vectors))
+        if processed % args.progress_every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"  {processed}/{len(tasks)} files  {stats['docs'] / elapsed:.1f} docs/s  "
+                  f"{stats['chunks'] / elapsed:.1f} chunks/s")
+
+    if writer is not None:
+        checkpoint(*writer.flush())
+    if embedding_cache is not None:
+        stats["embeddings"] = {"hits": embedding_cache.hits, "misses": embedding_cache.misses}
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-ingest judgment text files into Weaviate')
+    parser.add_argument('data_dir', help='Directory holding the judgment files')
+    parser.add_argument('--pattern', default='**/*.txt', help='Glob relative to data_dir (default: **/*.txt)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Cleaning/chunking processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Objects per Weaviate batch (default: 100)')
+    parser.add_argument('--manifest', help=f'Checkpoint file (default: DATA_DIR/{MANIFEST_NAME})')
+    parser.add_argument('--class-name', help='Weaviate class (default: the class the API reads, see WEAVIATE_CLASS_FILE)')
+    parser.add_argument('--weaviate-url', default='http://localhost:8080', help='Weaviate instance URL')
+    parser.add_argument('--token-limit', type=int, default=DEFAULT_TOKEN_LIMIT,
+                        help=f'Embedding-model (cl100k_base) tokens per chunk (default: {DEFAULT_TOKEN_LIMIT})')
+    parser.add_argument('--overlap', type=int, default=DEFAULT_OVERLAP_TOKENS,
+                        help=f'Tokens shared by consecutive chunks (default: {DEFAULT_OVERLAP_TOKENS})')
+    parser.add_argument('--progress-every', type=int, default=100, help='Report progress every N files')
+    parser.add_argument('--mode', choices=('insert', 'upsert'), default='insert',
+                        help='insert: add new/changed chunks; upsert: also delete chunks a re-ingested case '
+                             'no longer has (default: insert)')
+    parser.add_argument('--hash-index', default=DEFAULT_INDEX_PATH,
+                        help='SQLite index of chunk IDs already in Weaviate (default: cache_dir/chunk_hashes.sqlite)')
+    parser.add_argument('--vectors', choices=('client', 'weaviate'), default='client',
+                        help='client: send cached or OpenAI-computed vectors with each chunk; weaviate: let the '
+                             'text2vec-openai module vectorize (default: client)')
+    parser.add_argument('--embedding-cache', default=DEFAULT_CACHE_PATH,
+                        help='SQLite embedding cache (default: cache_dir/embeddings.sqlite)')
+    parser.add_argument('--restart', action='store_true', help='Ignore the manifest and ingest every file again')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Clean and chunk only; no Weaviate writes and no checkpoints')
+    args = parser.parse_args()
+    args.class_name = args.class_name or ActiveClass(
+        os.getenv("WEAVIATE_CLASS_FILE", DEFAULT_CLASS_FILE), default=os.getenv("WEAVIATE_CLASS", "AI_v1")
+    ).get()
+
+    stats = ingest(args)
+    if stats.get("embeddings"):
+        print(f"🧮 Embeddings: {stats['embeddings']['hits']} from cache, {stats['embeddings']['misses']} computed")
+    seconds = max(stats["seconds"], 1e-9)
+    print(f"\n📊 {stats['docs']} docs, {stats['chunks']} chunks in {seconds:.1f}s "
+          f"({stats['docs'] / seconds:.1f} docs/s, {stats['chunks'] / seconds:.1f} chunks/s); "
+          f"{stats['unchanged']} unchanged chunks not resent, {stats['deleted']} stale chunks deleted; "
+          f"{stats['skipped']} files skipped, {stats['failed']} failed")
+    if stats["failed"]:
+        print("⚠️  Failed files were not checkpointed; re-run to retry them")
+        sys.exit(1)
+    print("✅ Ingestion complete")
+
+
+if __name__ == '__main__':
+    main()
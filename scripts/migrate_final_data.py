@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Migrate a legacy ``final_data.json`` embedding index into a vector store.
+
+``final_data.json`` maps chunk text to ``{"embedding": [...], "case_name": ...}``.
+Its entries are appended, in file order, to an append-only store
+(flast/vector_store.py); texts already in the store are skipped, so the
+migration can be re-run safely. The JSON file is left in place.
+
+Usage:
+    python scripts/migrate_final_data.py [--input final_data.json] [--output pdf_vectors] [--batch-size 1000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Information: Make the repository root importable when run as `python scripts/migrate_final_data.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.vector_store import VectorStore
+
+
+def migrate(input_path: str, output_dir: str, batch_size: int = 1000) -> dict:
+    started = time.perf_counter()
+    with open(input_path, 'r', encoding='utf-8') as f:
+        legacy = json.load(f)
+    if not legacy:
+        return {"entries": 0, "written": 0, "seconds": time.perf_counter() - started}
+
+    first = next(iter(legacy.values()))
+    store = VectorStore(output_dir, dim=len(first["embedding"]))
+    items = [(text, value["embedding"], value.get("case_name", "")) for text, value in legacy.items()]
+    written = 0
+    for start in range(0, len(items), batch_size):
+        written += store.append(items[start:start + batch_size])
+    return {"entries": len(items), "written": written, "rows": len(store), "seconds": time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate final_data.json into an append-only vector store')
+    parser.add_argument('--input', default='final_data.json', help='Legacy JSON index (default: final_data.json)')
+    parser.add_argument('--output', default='pdf_vectors', help='Vector store directory (default: pdf_vectors)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per append (default: 1000)')
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"❌ {args.input} not found")
+        sys.exit(1)
+    stats = migrate(args.input, args.output, args.batch_size)
+    print(f"✅ {stats['written']} of {stats['entries']} entries written to {args.output} "
+          f"({stats.get('rows', 0)} rows in the store) in {stats['seconds']:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Migrate the data to a new schema version without downtime.
+
+1. Create TARGET (e.g. AI_v1_2) from schema/ai_v1_schema.json, the class renamed.
+2. Backfill: page through SOURCE with the GraphQL ``after`` cursor and write
+   every object into TARGET with its id and vector in parallel batches,
+   copying the properties both classes define. Nothing is re-embedded unless
+   ``--revectorize`` is given. The chunk hash index learns the ids under
+   TARGET, so later uploads only send changed chunks.
+3. Verify that both classes hold the same number of objects.
+4. With ``--switch``, write TARGET to the class file (flast/active_class.py).
+   API workers and the Upload Data page pick it up within
+   ``WEAVIATE_CLASS_CHECK_INTERVAL`` seconds, without a restart.
+
+SOURCE is never modified. Roll back with ``--switch-only --target SOURCE``.
+Writes are by id, so an interrupted or outdated backfill (e.g. SOURCE received
+new chunks meanwhile) is completed by re-running with ``--resume``.
+
+Usage:
+    python scripts/migrate_schema.py --target AI_v1_2 [--source CLASS] [--weaviate-url URL] [--schema PATH]
+        [--page-size 500] [--batch-size 200] [--concurrency 4] [--revectorize] [--resume]
+        [--switch | --switch-only] [--class-file weaviate_class.txt] [--hash-index PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Information: Make the repository root importable when run as `python scripts/migrate_schema.py`
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from flast.active_class import CLASS_NAME, DEFAULT_CLASS_FILE, ActiveClass, write_active_class
+from flast.chunk_hashes import DEFAULT_INDEX_PATH, ChunkHashIndex
+from flast.snapshot import ObjectWriter, connect, create_class, fetch_class_schema
+from flast.weaviate_graphql import count_objects, iter_objects
+
+
+async def class_exists(http: httpx.AsyncClient, class_name: str) -> bool:
+    try:
+        await fetch_class_schema(http, class_name)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return False
+        raise
+    return True
+
+
+async def backfill(http: httpx.AsyncClient, args, target_properties: set) -> dict:
+    source_properties = [prop["name"] for prop in (await fetch_class_schema(http, args.source)).get("properties", [])]
+    copied = [name for name in source_properties if name in target_properties]
+    hash_index = ChunkHashIndex(args.hash_index) if args.hash_index else None
+    writer = ObjectWriter(http, args.target, args.batch_size, args.concurrency,
+                          progress=lambda count: print(f"  {count} objects copied", end="\r", flush=True))
+    additional = ("id",) if args.revectorize else ("id", "vector")
+    try:
+        async for page in iter_objects(http, args.source, copied, args.page_size, additional):
+            cases = {}
+            for obj in page:
+                extra = obj.pop("_additional")
+                record = {"id": extra["id"], "properties": {k: v for k, v in obj.items() if v is not None}}
+                if extra.get("vector"):
+                    record["vector"] = extra["vector"]
+                await writer.add(record)
+                cases.setdefault(obj.get("case_name") or "", []).append(extra["id"])
+            if hash_index is not None:
+                for case_name, ids in cases.items():
+                    hash_index.add(args.target, case_name, ids)
+    finally:
+        stats = await writer.close()
+        print()
+    # Information: Never let the hash index claim chunks that did not make it into TARGET
+    if hash_index is not None and stats["failed"]:
+        hash_index.clear(args.target)
+    stats["dropped"] = [name for name in source_properties if name not in target_properties]
+    return stats
+
+
+async def migrate(args) -> int:
+    headers = {"X-OpenAI-Api-Key": os.environ["OPENAI_API_KEY"]} if os.getenv("OPENAI_API_KEY") else None
+    async with connect(args.weaviate_url, headers=headers) as http:
+        if args.switch_only:
+            if not await class_exists(http, args.target):
+                print(f"❌ Class '{args.target}' does not exist")
+                return 1
+        else:
+            with open(args.schema, 'r') as f:
+                schema = {**json.load(f), "class": args.target}
+            if await class_exists(http, args.target):
+                if not args.resume:
+                    print(f"ℹ️  Class '{args.target}' already exists. Use --resume to continue backfilling it.")
+                    return 1
+                print(f"↪️  Resuming into existing class '{args.target}'")
+            else:
+                await create_class(http, schema)
+                print(f"✅ Created class '{args.target}' ({len(schema.get('properties', []))} properties)")
+
+            print(f"📦 Backfilling {args.source} -> {args.target}")
+            started = time.perf_counter()
+            stats = await backfill(http, args, {prop["name"] for prop in schema.get("properties", [])})
+            seconds = time.perf_counter() - started
+            print(f"✅ {stats['objects'] - stats['failed']} of {stats['objects']} objects copied in {seconds:.1f}s "
+                  f"({stats['objects'] / max(seconds, 1e-9):.0f} objects/s)")
+            if stats["dropped"]:
+                print(f"⚠️  Not in the target schema, not copied: {', '.join(stats['dropped'])}")
+            if stats["failed"]:
+                print(f"❌ {stats['failed']} objects failed:")
+                for error in stats["errors"]:
+                    print(f"   - {error}")
+                return 1
+
+            source_count, target_count = await count_objects(http, args.source), await count_objects(http, args.target)
+            if source_count != target_count:
+                print(f"❌ Count mismatch: {args.source} has {source_count} objects, {args.target} has {target_count}; "
+                      f"re-run with --resume (and pause ingestion) before switching")
+                return 1
+            print(f"✅ Verified: {target_count} objects in both classes")
+            if not args.switch:
+                print(f"ℹ️  Switch the API over with: python scripts/migrate_schema.py --switch-only --target {args.target}")
+                return 0
+
+    write_active_class(args.class_file, args.target)
+    print(f"🔀 {args.class_file} now points at '{args.target}'; running workers follow without a restart")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migrate to a versioned class and switch the API over')
+    parser.add_argument('--target', required=True, help='New class, e.g. AI_v1_2')
+    parser.add_argument('--source', help='Class to copy from (default: the class the class file points at)')
+    parser.add_argument('--weaviate-url', default='http://localhost:8080', help='Weaviate instance URL')
+    parser.add_argument('--schema', default=str(ROOT / 'schema' / 'ai_v1_schema.json'),
+                        help='Class definition for TARGET (default: schema/ai_v1_schema.json)')
+    parser.add_argument('--page-size', type=int, default=500, help='Objects per cursor page (default: 500)')
+    parser.add_argument('--batch-size', type=int, default=200, help='Objects per batch request (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Batch requests in flight (default: 4)')
+    parser.add_argument('--revectorize', action='store_true',
+                        help="Let TARGET's vectorizer embed every object instead of copying vectors")
+    parser.add_argument('--resume', action='store_true', help='Backfill into an existing TARGET')
+    parser.add_argument('--switch', action='store_true', help='Point the class file at TARGET once verified')
+    parser.add_argument('--switch-only', action='store_true', help='Only point the class file at TARGET')
+    parser.add_argument('--class-file', default=os.getenv("WEAVIATE_CLASS_FILE", DEFAULT_CLASS_FILE),
+                        help=f'Class file the API watches (default: WEAVIATE_CLASS_FILE or {DEFAULT_CLASS_FILE})')
+    parser.add_argument('--hash-index', default=DEFAULT_INDEX_PATH,
+                        help=f'Chunk hash index to record TARGET ids in; empty to skip (default: {DEFAULT_INDEX_PATH})')
+    args = parser.parse_args()
+
+    args.source = args.source or ActiveClass(args.class_file, os.getenv("WEAVIATE_CLASS", "AI_v1")).get()
+    for name in (args.source, args.target):
+        if not CLASS_NAME.match(name):
+            print(f"❌ Invalid class name: {name!r}")
+            sys.exit(1)
+    if args.source == args.target and not args.switch_only:
+        print("❌ --source and --target must differ")
+        sys.exit(1)
+
+    try:
+        sys.exit(asyncio.run(migrate(args)))
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
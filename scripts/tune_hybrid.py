@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tune the hybrid search parameters on a labelled question set.
+
+Every combination of ``--alpha``, ``--fusion``, ``--limit`` and
+``--properties`` is run against Weaviate's hybrid search for each question,
+the way the API sends it (flast/search_params.py). The report gives
+recall@k, MRR and p50/p95 latency per setting, best recall first, so
+``HYBRID_*`` defaults (or per-request overrides) can be chosen knowing what
+they cost.
+
+Question file (JSON lines):
+    {"question": "How is relocation assessed?", "relevant": ["Smith & Jones [2024] FamCA 123"]}
+
+``relevant`` lists case names (``--match id``: chunk ids); recall@k is the
+share of them found among the top-k hits, MRR uses the first one found.
+
+Questions are embedded once up front (OpenAI, through the embedding cache),
+so every setting ranks the same vectors and latency is the search alone;
+``--no-vectors`` lets Weaviate vectorize each query instead. ``--record``
+saves every response; ``--replay`` scores a recording offline (e.g. with a
+different ``--k``) without Weaviate.
+
+Usage:
+    python scripts/tune_hybrid.py QUESTIONS --weaviate-url http://localhost:8080 [--alpha 0.25,0.5,0.75]
+        [--fusion ranked,relative_score] [--limit 5,10] [--properties data "case_name^2,data"]
+        [--class-name NAME] [--record runs.jsonl] [--no-vectors] [--k K] [--match case_name|id]
+    python scripts/tune_hybrid.py QUESTIONS --replay runs.jsonl [--k K] [--match case_name|id]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+# Information: Make the repository root importable when run as `python scripts/tune_hybrid.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from flast.active_class import DEFAULT_CLASS_FILE, ActiveClass
+from flast.embedding_cache import DEFAULT_CACHE_PATH, EmbeddingCache
+from flast.search_params import FUSION_TYPES, SearchParamError, SearchParams
+from flast.weaviate_graphql import hybrid_search
+
+PROPERTIES = ["case_name", "chunk_index"]
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def load_questions(path: str) -> List[dict]:
+    questions = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not isinstance(item.get("question"), str) or not isinstance(item.get("relevant"), list):
+                raise ValueError(f"{path}:{number}: expected {{\"question\": str, \"relevant\": [str]}}")
+            questions.append(item)
+    return questions
+
+
+def grid(args) -> List[SearchParams]:
+    """Every combination of the requested values, validated like API requests."""
+    alphas = [float(a) for a in args.alpha.split(",")] if args.alpha else [None]
+    fusions = args.fusion.split(",") if args.fusion else [None]
+    limits = [int(n) for n in args.limit.split(",")]
+    properties = [[p.strip() for p in group.split(",")] for group in args.properties] if args.properties else [None]
+    return [
+        SearchParams().merge({"alpha": a, "fusion_type": f, "limit": n, "query_properties": p})
+        for a, f, n, p in itertools.product(alphas, fusions, limits, properties)
+    ]
+
+
+def embed_questions(texts: List[str], cache_path: str) -> List[List[float]]:
+    from openai import OpenAI
+
+    from flast.ingestion import openai_embedder
+
+    return EmbeddingCache(cache_path).embed(EMBEDDING_MODEL, texts, openai_embedder(OpenAI(max_retries=5)))
+
+
+async def run_live(args, questions: List[dict], settings: List[SearchParams]) -> List[dict]:
+    texts = [item["question"] for item in questions]
+    vectors = [None] * len(texts) if args.no_vectors else embed_questions(texts, args.embedding_cache)
+    runs = []
+    async with httpx.AsyncClient(base_url=args.weaviate_url, timeout=60.0) as http:
+        for params in settings:
+            fields = {"properties": PROPERTIES, "limit": params.limit, "additional": ("id", "score"),
+                      **params.hybrid_arguments()}
+            # Information: One unmeasured query per setting warms connections and Weaviate's caches
+            await hybrid_search(http, args.class_name, texts[0].replace('"', "'"), vector=vectors[0], **fields)
+            for text, vector in zip(texts, vectors):
+                started = time.perf_counter()
+                hits = await hybrid_search(http, args.class_name, text.replace('"', "'"), vector=vector, **fields)
+                runs.append({
+                    "config": params.key(),
+                    "question": text,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "hits": [{"case_name": hit.get("case_name"), "id": hit["_additional"].get("id")} for hit in hits],
+                })
+            print(f"  {params.key()}", flush=True)
+    return runs
+
+
+def score(runs: List[dict], questions: List[dict], match: str, k: Optional[int]) -> List[dict]:
+    """recall@k, MRR and latency per setting, best recall (then fastest p50) first."""
+    relevant = {item["question"]: set(item["relevant"]) for item in questions}
+    by_config: Dict[str, List[dict]] = {}
+    for run in runs:
+        if relevant.get(run["question"]):
+            by_config.setdefault(run["config"], []).append(run)
+
+    rows = []
+    for config, config_runs in by_config.items():
+        recalls, reciprocal_ranks, latencies = [], [], []
+        for run in config_runs:
+            wanted = relevant[run["question"]]
+            # Information: Several chunks of one case count once, at the rank of the first
+            found = list(dict.fromkeys(hit[match] for hit in run["hits"][:k]))
+            recalls.append(len(wanted & set(found)) / len(wanted))
+            reciprocal_ranks.append(next((1 / rank for rank, value in enumerate(found, 1) if value in wanted), 0.0))
+            latencies.append(run["latency_ms"])
+        latencies.sort()
+        rows.append({
+            "config": config,
+            "questions": len(config_runs),
+            "recall": statistics.mean(recalls),
+            "mrr": statistics.mean(reciprocal_ranks),
+            "p50_ms": latencies[len(latencies) // 2],
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        })
+    rows.sort(key=lambda row: (-row["recall"], row["p50_ms"]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure recall@k and latency of hybrid search settings')
+    parser.add_argument('questions', help='Labelled questions (JSON lines: question, relevant)')
+    parser.add_argument('--weaviate-url', help='Weaviate instance to query')
+    parser.add_argument('--replay', help='Score a file written by --record instead of querying Weaviate')
+    parser.add_argument('--record', help='Save every response to this file (JSON lines)')
+    parser.add_argument('--class-name', help='Weaviate class (default: the class the API reads, see WEAVIATE_CLASS_FILE)')
+    parser.add_argument('--alpha', help='Comma-separated alphas (default: Weaviate default)')
+    parser.add_argument('--fusion', help=f"Comma-separated fusion types: {', '.join(FUSION_TYPES)} (default: Weaviate default)")
+    parser.add_argument('--limit', default='5', help='Comma-separated limits (default: 5)')
+    parser.add_argument('--properties', nargs='+', help='BM25 property sets, each comma-separated (e.g. data "case_name^2,data")')
+    parser.add_argument('--k', type=int, help='Score the top K hits (default: each setting\'s limit)')
+    parser.add_argument('--match', choices=('case_name', 'id'), default='case_name', help='What "relevant" lists (default: case_name)')
+    parser.add_argument('--no-vectors', action='store_true', help='Let Weaviate vectorize each query')
+    parser.add_argument('--embedding-cache', default=DEFAULT_CACHE_PATH, help=f'Embedding cache (default: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if bool(args.weaviate_url) == bool(args.replay):
+        parser.error("pass exactly one of --weaviate-url or --replay")
+    try:
+        questions = load_questions(args.questions)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.replay:
+        with open(args.replay, 'r', encoding='utf-8') as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    else:
+        try:
+            settings = grid(args)
+        except (SearchParamError, ValueError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        args.class_name = args.class_name or ActiveClass(
+            os.getenv("WEAVIATE_CLASS_FILE", DEFAULT_CLASS_FILE), default=os.getenv("WEAVIATE_CLASS", "AI_v1")
+        ).get()
+        print(f"🔎 {len(questions)} questions x {len(settings)} settings against {args.class_name}")
+        try:
+            runs = asyncio.run(run_live(args, questions, settings))
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"❌ Weaviate query failed: {e}")
+            sys.exit(1)
+        if args.record:
+            with open(args.record, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(run) + "\n" for run in runs)
+
+    rows = score(runs, questions, args.match, args.k)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"📊 recall@{args.k or 'limit'} by {args.match}")
+    print(f"  {'recall':>6}  {'mrr':>5}  {'p50 ms':>7}  {'p95 ms':>7}  setting")
+    for row in rows:
+        print(f"  {row['recall']:>6.3f}  {row['mrr']:>5.3f}  {row['p50_ms']:>7.1f}  {row['p95_ms']:>7.1f}  {row['config']}")
+
+
+if __name__ == '__main__':
+    main()
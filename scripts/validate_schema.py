@@ -61,7 +61,7 @@ def validate_schema(client: weaviate.WeaviateClient, expected_schema: dict):
             deployed_prop = deployed_props[prop_name]
             
             # Check data type
-            if deployed_prop.get('dataType') \!= expected_prop.get('dataType'):
+            if deployed_prop.get('dataType') != expected_prop.get('dataType'):
                 print(f"  ❌ {prop_name}: dataType mismatch")
                 print(f"     Expected: {expected_prop.get('dataType')}")
                 print(f"     Deployed: {deployed_prop.get('dataType')}")